@@ -242,7 +242,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "openwiden.users.authentication.JWTAuthentication",
     ),
     "EXCEPTION_HANDLER": "openwiden.views.exception_handler",
 }
@@ -278,6 +278,25 @@ AUTHLIB_OAUTH_CLIENTS = {
     },
 }
 
+# VCS clients HTTP connections pool (per process and per VCS)
+VCS_CLIENTS_HTTP_POOL_SIZE = env.int("VCS_CLIENTS_HTTP_POOL_SIZE", default=10)
+VCS_CLIENTS_HTTP_KEEP_ALIVE = env.bool("VCS_CLIENTS_HTTP_KEEP_ALIVE", default=True)
+# Threads per process, that make the requests of the asyncio VCS clients concurrently
+VCS_CLIENTS_ASYNC_MAX_WORKERS = env.int("VCS_CLIENTS_ASYNC_MAX_WORKERS", default=4)
+# VCS API rate limit: requests kept in reserve per token and max seconds to wait for a reset before deferring
+VCS_CLIENTS_RATE_LIMIT_RESERVE = env.int("VCS_CLIENTS_RATE_LIMIT_RESERVE", default=10)
+VCS_CLIENTS_RATE_LIMIT_MAX_WAIT = env.int("VCS_CLIENTS_RATE_LIMIT_MAX_WAIT", default=5)
+# VCS API conditional requests cache: TTL in seconds and max size in bytes per token
+VCS_CLIENTS_RESPONSE_CACHE_ENABLED = env.bool("VCS_CLIENTS_RESPONSE_CACHE_ENABLED", default=False)
+VCS_CLIENTS_RESPONSE_CACHE_TTL = env.int("VCS_CLIENTS_RESPONSE_CACHE_TTL", default=60 * 60 * 24)
+VCS_CLIENTS_RESPONSE_CACHE_MAX_SIZE = env.int("VCS_CLIENTS_RESPONSE_CACHE_MAX_SIZE", default=1024 * 1024)
+# GitHub GraphQL API: fetch user repositories with languages and organizations in batches of repositories per query
+# and the added repository with its open issues by one query
+VCS_CLIENTS_GITHUB_GRAPHQL_ENABLED = env.bool("VCS_CLIENTS_GITHUB_GRAPHQL_ENABLED", default=False)
+VCS_CLIENTS_GITHUB_GRAPHQL_BATCH_SIZE = env.int("VCS_CLIENTS_GITHUB_GRAPHQL_BATCH_SIZE", default=50)
+# Open issues fetched with the repository on add, issues are synced by the REST API, if there are more of them
+VCS_CLIENTS_GITHUB_GRAPHQL_ISSUES_COUNT = env.int("VCS_CLIENTS_GITHUB_GRAPHQL_ISSUES_COUNT", default=100)
+
 # JWT
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=1),
@@ -319,3 +338,23 @@ DJANGO_GITHUB_WEBHOOKS = {
 DJANGO_GITLAB_WEBHOOKS = {
     "ALLOWED_EVENTS": ("Issue Hook",),
 }
+
+# Webhook secrets cache TTL in seconds of the known and unknown webhook ids
+WEBHOOKS_SECRET_CACHE_TTL = env.int("WEBHOOKS_SECRET_CACHE_TTL", default=60 * 60 * 24)
+WEBHOOKS_SECRET_CACHE_MISSING_TTL = env.int("WEBHOOKS_SECRET_CACHE_MISSING_TTL", default=60)
+# Webhook events processing by the task queue instead of the request: partitions limit the concurrency,
+# events of a repository are always processed in order by one of them
+WEBHOOKS_ASYNC_ENABLED = env.bool("WEBHOOKS_ASYNC_ENABLED", default=False)
+WEBHOOKS_ASYNC_PARTITIONS = env.int("WEBHOOKS_ASYNC_PARTITIONS", default=4)
+WEBHOOKS_ASYNC_BATCH_SIZE = env.int("WEBHOOKS_ASYNC_BATCH_SIZE", default=100)
+# Seconds to wait for the later events of the same repository or issue, so only the latest of them is applied
+WEBHOOKS_ASYNC_COALESCE_WINDOW = env.int("WEBHOOKS_ASYNC_COALESCE_WINDOW", default=5)
+# Seconds to remember webhook delivery ids, so redeliveries are not processed again
+WEBHOOKS_DELIVERY_DEDUP_TTL = env.int("WEBHOOKS_DELIVERY_DEDUP_TTL", default=60 * 60 * 24 * 3)
+
+# Websocket notifications stream per user to replay missed notifications on reconnect: max length and age in seconds
+WEBSOCKET_NOTIFICATIONS_MAX_LENGTH = env.int("WEBSOCKET_NOTIFICATIONS_MAX_LENGTH", default=100)
+WEBSOCKET_NOTIFICATIONS_MAX_AGE = env.int("WEBSOCKET_NOTIFICATIONS_MAX_AGE", default=60 * 60 * 24)
+
+# Users active status cache TTL in seconds for the websocket and API authentication
+USERS_ACTIVE_STATUS_CACHE_TTL = env.int("USERS_ACTIVE_STATUS_CACHE_TTL", default=60)
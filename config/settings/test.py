@@ -50,3 +50,8 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 # DRF
 REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = ("rest_framework.renderers.JSONRenderer",)  # noqa F405
+
+# VCS CLIENTS
+# ------------------------------------------------------------------------------
+# Requests of the asyncio clients are made one by one in the order of the calls, so mocked responses are ordered
+VCS_CLIENTS_ASYNC_MAX_WORKERS = 1
@@ -13,6 +13,7 @@ router = routers.DefaultRouter()
 router.register("repositories", repository_views.Repository, basename="repository")
 repository_router = routers.NestedSimpleRouter(router, "repositories", lookup="repository")
 repository_router.register("issues", repository_views.Issue, basename="repository-issue")
+router.register("issues", repository_views.AddedIssue, basename="issue")
 router.register("user/repositories", repository_views.UserRepositories, basename="user-repository")
 
 # Users
@@ -23,6 +24,7 @@ auth_urlpatterns = [
     path("auth/complete/<str:vcs>/", users_views.oauth_complete_view, name="auth-complete"),
     path("auth/refresh_token/", users_views.token_refresh_view, name="auth-refresh_token"),
     path("user/", users_views.user_me_view, name="user-me"),
+    path("vcs_rate_limits/", users_views.vcs_rate_limits_view, name="vcs-rate-limits"),
 ]
 
 urlpatterns = [
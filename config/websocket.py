@@ -1,18 +1,146 @@
 import asyncio
+import json
+from collections import defaultdict
 from logging import getLogger
-from typing import Generator, Optional
+from typing import Generator, Optional, Dict, Set, Tuple, List
+from urllib.parse import parse_qs
 
+import aioredis
+from aioredis.pubsub import Receiver
 from asgiref.sync import sync_to_async
-from django_redis import get_redis_connection
+from django.conf import settings
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken
-from websockets import ConnectionClosedError
-from websockets.protocol import State
 
-from openwiden.users.models import User
+from openwiden.users import active_status_cache
+from openwiden.users import selectors as users_selectors
+from openwiden.users import services as users_services
 
 log = getLogger(__name__)
 
+# Put to the queues of the connections, when the pubsub connection is lost, since its subscriptions are lost as well
+PUBSUB_CONNECTION_LOST = None
+
+
+class PubSubMultiplexer:
+    """
+    Shares one asyncio redis pubsub connection between all websocket connections of the process.
+
+    User channels are subscribed by the first connection of the user and unsubscribed by the last one,
+    received messages are put to the queues of the user connections.
+    Messages are awaited by the reader task, so there is no polling while connections are idle.
+    When the pubsub connection is lost, user connections are notified to close,
+    so the clients reconnect and the channels are subscribed again with the new pubsub connection.
+    """
+
+    def __init__(self) -> None:
+        self._redis: Optional[aioredis.Redis] = None
+        # Pubsub connection could not run other commands
+        self._commands_redis: Optional[aioredis.Redis] = None
+        self._receiver: Optional[Receiver] = None
+        self._queues: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._reader: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _is_connected(self) -> bool:
+        if self._redis is None or self._reader is None or self._reader.done() or self._redis.closed:
+            return False
+        return self._reader.get_loop() is asyncio.get_event_loop()
+
+    async def _connect(self) -> None:
+        if self._is_connected():
+            return
+
+        # Connections of the previous pubsub connection are closed by its reader
+        if self._redis is not None:
+            self._redis.close()
+            self._commands_redis.close()
+
+        self._redis = await self._create_redis()
+        self._commands_redis = await self._create_redis()
+        self._receiver = Receiver()
+        self._queues = defaultdict(set)
+        self._reader = asyncio.ensure_future(self._read(self._receiver, self._queues))
+
+    async def _create_redis(self) -> aioredis.Redis:
+        return await aioredis.create_redis(settings.CACHES["default"]["LOCATION"])
+
+    async def _read(self, receiver: Receiver, queues_by_channel: Dict[str, Set[asyncio.Queue]]) -> None:
+        try:
+            async for channel, message in receiver.iter():
+                queues = queues_by_channel.get(channel.name.decode(), ())
+                log.info(f"[Websocket] received pubsub message for {len(queues)} connections")
+
+                for queue in queues:
+                    queue.put_nowait(message)
+        finally:
+            connections_count = sum(len(queues) for queues in queues_by_channel.values())
+            if connections_count:
+                log.error(f"[Websocket] pubsub connection is closed, closing {connections_count} connections")
+
+            for queues in queues_by_channel.values():
+                for queue in queues:
+                    queue.put_nowait(PUBSUB_CONNECTION_LOST)
+            queues_by_channel.clear()
+
+    async def _ensure_connected(self) -> None:
+        loop = asyncio.get_event_loop()
+
+        if self._loop is not loop:
+            self._loop, self._lock = loop, asyncio.Lock()
+
+        async with self._lock:
+            await self._connect()
+
+    async def subscribe(self, channel: str) -> asyncio.Queue:
+        await self._ensure_connected()
+
+        queue = asyncio.Queue()
+        is_first = not self._queues[channel]
+        self._queues[channel].add(queue)
+
+        if is_first:
+            await self._redis.subscribe(self._receiver.channel(channel))
+
+        return queue
+
+    async def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        queues = self._queues.get(channel)
+
+        if queues is None or queue not in queues:
+            return
+
+        queues.discard(queue)
+
+        if not queues:
+            del self._queues[channel]
+
+            # Channels are unsubscribed anyway, if the connection is closed
+            if not self._redis.closed:
+                await self._redis.unsubscribe(channel)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        await self._ensure_connected()
+        return await self._commands_redis.get(key)
+
+    async def get_stream(self, key: str, start: str) -> List[Tuple[bytes, Dict[bytes, bytes]]]:
+        return await self._commands_redis.xrange(key, start=start)
+
+    async def close(self) -> None:
+        if self._redis is None:
+            return
+
+        self._receiver.stop()
+        for redis in (self._redis, self._commands_redis):
+            redis.close()
+            await redis.wait_closed()
+        self._queues.clear()
+        self._redis = self._commands_redis = self._receiver = self._reader = None
+
+
+pubsub_multiplexer = PubSubMultiplexer()
+
 
 class WebsocketApplication:
     def __init__(self, scope, receive, send) -> None:
@@ -36,42 +164,50 @@ class WebsocketApplication:
         else:
             log.error(f"[Websocket] received not handled event with type {event_type} " f"and scope {self._scope}")
 
-    async def _handle_and_send_pubsub_messages(self, pubsub):
+    async def _handle_and_send_pubsub_messages(
+        self, queue: asyncio.Queue, replayed_until: Optional[Tuple[int, int]] = None
+    ):
         """
-        Listens redis pubsub and sends message on receive.
+        Awaits user's messages and client events at the same time,
+        sends messages on receive and stops on the client disconnect.
+        Connection is closed, if the pubsub connection is lost, so the client reconnects.
+        Messages already sent by the replay are skipped.
         """
-        while True:
-
-            # Check redis for a message
-            message = pubsub.get_message()
-
-            # Perform message if exist
-            if message:
-                log.info(f"[Websocket] received pubsub message {message}")
-
-                # If message type is message, then send it to the client
-                if message.get("type") == "message":
-                    log.info(f"[Websocket] sending websocket message '{message['data']}'")
-                    await self._send({"type": "websocket.send", "bytes": message["data"]})
-            else:
-                log.info(f"[Websocket] no message, checking connection...")
-
-                # If connection is OPEN, then check it and close it if it's not
-                if self._send.__self__.state == State.OPEN:
-                    try:
-                        log.info(f"[Websocket] ensure open")
-                        await self._send.__self__.ensure_open()
-                    except ConnectionClosedError:
-                        log.info(f"[Websocket] closing opened connection...")
+        receive_task = asyncio.ensure_future(self._receive())
+        message_task = asyncio.ensure_future(queue.get())
+
+        try:
+            while True:
+                done, _ = await asyncio.wait((receive_task, message_task), return_when=asyncio.FIRST_COMPLETED)
+
+                if message_task in done:
+                    message = message_task.result()
+
+                    if message is PUBSUB_CONNECTION_LOST:
+                        await self._send({"type": "websocket.close"})
                         break
 
-                # Close connection manually if it's already closed
-                elif self._send.__self__.state == State.CLOSED:
-                    log.info(f"[Websocket] closing connection...")
-                    break
+                    message_task = asyncio.ensure_future(queue.get())
+
+                    if replayed_until is not None:
+                        if self._is_replayed(message, replayed_until):
+                            continue
+                        replayed_until = None
 
-                # Wait for a message for a while
-                await asyncio.sleep(0.2)
+                    log.info(f"[Websocket] sending websocket message '{message}'")
+                    await self._send({"type": "websocket.send", "bytes": message})
+
+                if receive_task in done:
+                    event = receive_task.result()
+
+                    if event["type"] == "websocket.disconnect":
+                        log.info("[Websocket] client is disconnected")
+                        break
+
+                    receive_task = asyncio.ensure_future(self._receive())
+        finally:
+            receive_task.cancel()
+            message_task.cancel()
 
     async def _handle_connect_event(self):
         user_id = await self._get_user_id()
@@ -79,18 +215,67 @@ class WebsocketApplication:
         if not user_id:
             return
 
-        redis = get_redis_connection()
-        pubsub = redis.pubsub()
-        pubsub.subscribe(str(user_id))
+        channel = str(user_id)
+        queue = await pubsub_multiplexer.subscribe(channel)
+
+        try:
+            await self._send({"type": "websocket.accept"})
+            replayed_until = await self._replay_notifications(channel)
+            await self._handle_and_send_pubsub_messages(queue, replayed_until)
+        finally:
+            await pubsub_multiplexer.unsubscribe(channel, queue)
+
+    def _get_query_param(self, name: str) -> str:
+        return parse_qs(self._scope.get("query_string").decode())[name][0]
+
+    def _get_access_token(self) -> str:
+        try:
+            return self._get_query_param("access_token")
+        except KeyError:
+            # Clients, that pass the token with another param name, are still supported
+            return self._scope.get("query_string").decode().split("=")[-1]
+
+    @staticmethod
+    def _is_replayed(message: bytes, replayed_until: Tuple[int, int]) -> bool:
+        try:
+            return users_services.parse_notification_id(json.loads(message)["id"]) <= replayed_until
+        except (TypeError, KeyError, ValueError):
+            return False
+
+    async def _replay_notifications(self, user_id: str) -> Optional[Tuple[int, int]]:
+        """
+        Sends notifications after the last seen id from the query string
+        and returns id of the last sent (or seen) notification.
+        """
+        try:
+            last_id = self._get_query_param("last_id")
+            last_seen = users_services.parse_notification_id(last_id)
+        except (KeyError, ValueError):
+            return None
+
+        key = users_services.get_notifications_key(user_id=user_id)
+        start = users_services.get_notifications_replay_start(last_id=last_id)
+
+        for notification_id, fields in await pubsub_multiplexer.get_stream(key, start):
+            notification_id = notification_id.decode()
+            parsed_id = users_services.parse_notification_id(notification_id)
+
+            if parsed_id <= last_seen:
+                continue
 
-        await self._send({"type": "websocket.accept"})
-        await self._handle_and_send_pubsub_messages(pubsub)
+            message = users_services.add_notification_id(
+                message=fields[b"message"].decode(), notification_id=notification_id
+            )
+            await self._send({"type": "websocket.send", "bytes": message.encode()})
+            last_seen = parsed_id
+
+        return last_seen
 
     async def _get_user_id(self) -> Optional[str]:
         # Parse access token
         try:
-            access_token = self._scope.get("query_string").decode().split("=")[-1]
-        except (TypeError, KeyError, ValueError, AttributeError) as e:
+            access_token = self._get_access_token()
+        except (TypeError, KeyError, ValueError, AttributeError, IndexError) as e:
             log.error(f"[Websocket] Access token is not found. Original error: {e}")
             await self._send({"type": "websocket.close"})
             return None
@@ -105,23 +290,31 @@ class WebsocketApplication:
 
         # Get user_id from the validated token
         try:
-            print(validated_token)
             user_id = validated_token["user_id"]
         except KeyError:
             log.error("[Websocket] Token contained no recognizable user identification.")
             await self._send({"type": "websocket.close"})
             return None
 
-        # Get user from the DB with async operation
+        # Get cached user active status without the thread switch, database is used on the cache miss
         try:
-            user = await sync_to_async(User.objects.get)(id=user_id)
-        except User.DoesNotExist:
+            cached = await pubsub_multiplexer.get(active_status_cache.get_key(user_id))
+        except (aioredis.RedisError, OSError) as e:
+            log.error(f"[Websocket] User active status cache is not available: {e}")
+            cached = None
+
+        if cached is None:
+            is_active = await sync_to_async(users_selectors.is_user_active)(user_id=user_id)
+        else:
+            is_active = active_status_cache.decode(cached)
+
+        if is_active is None:
             log.error("[Websocket] User not found.")
             await self._send({"type": "websocket.close"})
             return None
 
         # Check that user is active
-        if not user.is_active:
+        if not is_active:
             log.error("[Websocket] User is inactive.")
             await self._send({"type": "websocket.close"})
             return None
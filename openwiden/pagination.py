@@ -0,0 +1,182 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, F, Func, Model, QuerySet, Value
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class RowValueComparison(Func):
+    """
+    Compares fields with values as row values, for example: (field_1, field_2) < (value_1, value_2).
+    The whole comparison is used as the range condition of the composite index with the same fields.
+    """
+
+    output_field = BooleanField()
+
+    def __init__(self, fields: List[str], operator: str, values: List[Value]) -> None:
+        self.operator = operator
+        self.size = len(fields)
+        super().__init__(*(F(field) for field in fields), *values)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sqls, params = [], []
+
+        for expression in self.get_source_expressions():
+            sql, expression_params = compiler.compile(expression)
+            sqls.append(sql)
+            params.extend(expression_params)
+
+        return f"({', '.join(sqls[:self.size])}) {self.operator} ({', '.join(sqls[self.size:])})", params
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination by the unique ordering.
+
+    Opaque cursor contains ordering fields values of the first or the last item on the page,
+    so the next (previous) page is the range of rows after (before) them,
+    that could be fetched by the composite index range scan instead of OFFSET scan.
+    Total count is returned, unless it's skipped with the skip_count query param.
+
+    All ordering fields must have the same direction and the last one must be unique.
+    """
+
+    skip_count_query_param = "skip_count"
+    skip_count_query_description = "Skip total count of the results."
+    # Results are ordered by relevance instead, if queryset is annotated with the search rank
+    search_rank_annotation = "search_rank"
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> Optional[List[Model]]:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.annotations = queryset.query.annotations
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.fields = [field.lstrip("-") for field in self.ordering]
+        self.page_size = self.get_page_size(request)
+
+        if not self.page_size:
+            return None
+
+        values, is_reversed = self.decode_cursor(request)
+        self.count = None if self.is_count_skipped(request) else queryset.count()
+
+        # Previous page is fetched in the reversed ordering
+        is_descending = self.ordering[0].startswith("-")
+        ordering = [self.reverse_ordering(field) for field in self.ordering] if is_reversed else self.ordering
+
+        if values is not None:
+            operator = "<" if is_descending != is_reversed else ">"
+            queryset = queryset.filter(RowValueComparison(self.fields, operator, self.get_values(values)))
+
+        results = list(queryset.order_by(*ordering)[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if is_reversed:
+            self.page.reverse()
+            self.has_next, self.has_previous = values is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        if (self.has_next or self.has_previous) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_ordering(self, request: Request, queryset: QuerySet, view) -> Tuple[str, ...]:
+        if self.search_rank_annotation in queryset.query.annotations:
+            return f"-{self.search_rank_annotation}", "-id"
+        return type(self).ordering
+
+    def get_field(self, name: str):
+        if name in self.annotations:
+            return self.annotations[name].output_field
+        return self.model._meta.get_field(name)
+
+    @staticmethod
+    def reverse_ordering(field: str) -> str:
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    def is_count_skipped(self, request: Request) -> bool:
+        return request.query_params.get(self.skip_count_query_param, "").lower() in ("1", "true")
+
+    def get_values(self, values: List[str]) -> List[Value]:
+        try:
+            return [
+                Value(field.to_python(value), output_field=field)
+                for field, value in zip((self.get_field(name) for name in self.fields), values)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def decode_cursor(self, request: Request) -> Tuple[Optional[List[str]], bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+
+        if encoded is None:
+            return None, False
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode()).decode())
+            values, is_reversed = cursor["v"], bool(cursor["r"])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+
+        return values, is_reversed
+
+    def encode_cursor(self, obj: Model, is_reversed: bool) -> str:
+        values = [
+            getattr(obj, name) if name in self.annotations else self.get_field(name).value_to_string(obj)
+            for name in self.fields
+        ]
+        encoded = urlsafe_b64encode(json.dumps(dict(v=values, r=int(is_reversed))).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], is_reversed=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], is_reversed=True)
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        count_schema = {"type": "integer", "nullable": True}
+        response_schema["properties"] = {"count": count_schema, **response_schema["properties"]}
+        return response_schema
+
+    def get_schema_operation_parameters(self, view) -> list:
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.skip_count_query_param,
+                "required": False,
+                "in": "query",
+                "description": self.skip_count_query_description,
+                "schema": {"type": "boolean"},
+            }
+        ]
@@ -24,3 +24,9 @@ class IssueInline(admin.StackedInline):
 @admin.register(models.Repository)
 class RepositoryAdmin(DisabledAddModelAdmin):
     inlines = (IssueInline, webhook_admin.RepositoryWebhookInline)
+
+
+@admin.register(models.ProgrammingLanguage)
+class ProgrammingLanguageAdmin(DisabledAddModelAdmin):
+    list_display = ("name", "repositories_count")
+    readonly_fields = ("name", "repositories_count")
@@ -1,16 +1,97 @@
-from django.db.models import QuerySet
+from typing import List, Tuple
+
+from django.contrib.postgres.fields.hstore import KeyTransform
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import QuerySet, FloatField, F
+from django.db.models.functions import Cast
 from django_filters import rest_framework as filters
 from django_filters.constants import EMPTY_VALUES
+from rest_framework.exceptions import ValidationError
 
-from openwiden.repositories import models
+from openwiden.repositories import models, enums as repo_enums
 from openwiden import enums
 
 
 class ProgrammingLanguagesFilter(filters.Filter):
+    """
+    Filters repositories by comma separated programming languages.
+
+    Plain names match repositories with any of them (key lookup by the GIN index),
+    while names with a minimum share, such as Python>=40, match repositories where
+    the language makes up at least the given percentage and all of them should match.
+    """
+
+    share_separator = ">="
+
     def filter(self, qs: "QuerySet[models.Repository]", value: str) -> "QuerySet[models.Repository]":
         if value in EMPTY_VALUES:
             return qs
-        return qs.filter(**{f"{self.field_name}__keys__overlap": value.split(",")}).order_by("-open_issues_count")
+
+        names, shares = self.parse(value)
+
+        if names:
+            qs = qs.filter(**{f"{self.field_name}__has_any_keys": names})
+
+        for i, (name, share) in enumerate(shares):
+            annotation = f"{self.field_name.replace('__', '_')}_share_{i}"
+            qs = qs.filter(**{f"{self.field_name}__has_key": name}).annotate(
+                **{annotation: Cast(KeyTransform(name, self.field_name), FloatField())}
+            )
+            qs = qs.filter(**{f"{annotation}__gte": share})
+
+        return qs
+
+    def parse(self, value: str) -> Tuple[List[str], List[Tuple[str, float]]]:
+        names, shares = [], []
+
+        for item in value.split(","):
+            name, separator, share = item.partition(self.share_separator)
+
+            if not separator:
+                names.append(name)
+                continue
+
+            try:
+                shares.append((name, float(share)))
+            except ValueError:
+                raise ValidationError({self.field_name: [f"invalid programming language share: {item}"]})
+
+        return names, shares
+
+
+class LabelsFilter(filters.BaseCSVFilter, filters.CharFilter):
+    """
+    Filters issues by comma separated labels with the array lookup (contains or overlap) served by the GIN index.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("field_name", "labels")
+        super().__init__(*args, **kwargs)
+
+
+class SearchFilter(filters.CharFilter):
+    """
+    Full-text search by the stored search vector (GIN index).
+
+    Matches are annotated with the search rank, so they are ordered by relevance by the keyset pagination.
+    """
+
+    config = "english"
+    rank_annotation = "search_rank"
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("field_name", "search_vector")
+        super().__init__(*args, **kwargs)
+
+    def filter(self, qs: QuerySet, value: str) -> QuerySet:
+        if value in EMPTY_VALUES:
+            return qs
+
+        query = SearchQuery(value, config=self.config)
+        qs = qs.filter(**{self.field_name: query}).annotate(
+            **{self.rank_annotation: Cast(SearchRank(F(self.field_name), query), FloatField())}
+        )
+        return qs.order_by(f"-{self.rank_annotation}", "-id")
 
 
 class Repository(filters.FilterSet):
@@ -25,6 +106,8 @@ class Repository(filters.FilterSet):
 
     programming_languages = ProgrammingLanguagesFilter()
 
+    search = SearchFilter()
+
     class Meta:
         model = models.Repository
         fields = (
@@ -35,4 +118,42 @@ class Repository(filters.FilterSet):
             "created_at",
             "updated_at",
             "programming_languages",
+            "search",
+        )
+
+
+class Issue(filters.FilterSet):
+    state = filters.ChoiceFilter(choices=repo_enums.IssueState.choices)
+
+    labels = LabelsFilter(lookup_expr="contains", help_text="Issues with all of the comma separated labels.")
+    labels_any = LabelsFilter(lookup_expr="overlap", help_text="Issues with any of the comma separated labels.")
+
+    created_at = filters.DateFromToRangeFilter()
+    updated_at = filters.DateFromToRangeFilter()
+    closed_at = filters.DateFromToRangeFilter()
+
+    search = SearchFilter()
+
+    class Meta:
+        model = models.Issue
+        fields = (
+            "state",
+            "labels",
+            "labels_any",
+            "created_at",
+            "updated_at",
+            "closed_at",
+            "search",
         )
+
+
+class AddedIssue(Issue):
+    """
+    Issues across the added repositories.
+    """
+
+    vcs = filters.ChoiceFilter(field_name="repository__vcs", choices=enums.VersionControlService.choices)
+    programming_languages = ProgrammingLanguagesFilter(field_name="repository__programming_languages")
+
+    class Meta(Issue.Meta):
+        fields = Issue.Meta.fields + ("vcs", "programming_languages")
@@ -8,3 +8,9 @@ REPOSITORY_DOES_NOT_EXIST = _("Repository with id {id} does not exist.")
 
 REPOSITORY_IS_ADDED = _("Repository {name} is added.")
 REPOSITORY_IS_REMOVED = _("Repository {name} is removed.")
+REPOSITORY_ADD_IS_RATE_LIMITED = _(
+    "Repository {name} cannot be added due to the VCS API rate limit, please try again after {reset_at}."
+)
+REPOSITORY_REMOVE_IS_RATE_LIMITED = _(
+    "Repository {name} cannot be removed due to the VCS API rate limit, please try again after {reset_at}."
+)
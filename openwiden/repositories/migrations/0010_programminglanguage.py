@@ -0,0 +1,75 @@
+# Generated by Django 3.0.11 on 2026-10-18 20:07
+
+from django.db import migrations, models
+
+# Repositories count of the added repositories is updated on every repository insert, delete
+# and update of the state or programming languages keys, so the catalogue is up to date
+# regardless of how repositories are written (ORM, bulk upserts).
+CREATE_TRIGGER_SQL = """
+CREATE FUNCTION repositories_programming_languages_sync() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.state = 'added' AND OLD.programming_languages IS NOT NULL THEN
+        UPDATE repositories_programminglanguage
+        SET repositories_count = repositories_count - 1
+        WHERE name = ANY(akeys(OLD.programming_languages));
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.state = 'added' AND NEW.programming_languages IS NOT NULL THEN
+        INSERT INTO repositories_programminglanguage (name, repositories_count)
+        SELECT unnest(akeys(NEW.programming_languages)), 1
+        ON CONFLICT (name) DO UPDATE
+        SET repositories_count = repositories_programminglanguage.repositories_count + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER repositories_programming_languages_insert_delete
+AFTER INSERT OR DELETE ON repositories_repository
+FOR EACH ROW EXECUTE PROCEDURE repositories_programming_languages_sync();
+
+CREATE TRIGGER repositories_programming_languages_update
+AFTER UPDATE OF state, programming_languages ON repositories_repository
+FOR EACH ROW
+WHEN (
+    OLD.state IS DISTINCT FROM NEW.state
+    OR akeys(OLD.programming_languages) IS DISTINCT FROM akeys(NEW.programming_languages)
+)
+EXECUTE PROCEDURE repositories_programming_languages_sync();
+
+INSERT INTO repositories_programminglanguage (name, repositories_count)
+SELECT language.name, COUNT(*)
+FROM repositories_repository, skeys(programming_languages) AS language (name)
+WHERE state = 'added'
+GROUP BY language.name;
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER repositories_programming_languages_update ON repositories_repository;
+DROP TRIGGER repositories_programming_languages_insert_delete ON repositories_repository;
+DROP FUNCTION repositories_programming_languages_sync();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0009_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgrammingLanguage',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='name')),
+                ('repositories_count', models.PositiveIntegerField(default=0, verbose_name='repositories count')),
+            ],
+            options={
+                'verbose_name': 'programming language',
+                'verbose_name_plural': 'programming languages',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.RunSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.0.11 on 2026-10-18 20:08
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0010_programminglanguage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='repository',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(state='added'), fields=['programming_languages'], name='added_repository_languages_idx'),
+        ),
+    ]
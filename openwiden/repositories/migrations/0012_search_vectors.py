@@ -0,0 +1,96 @@
+# Generated by Django 3.0.11 on 2026-10-18 20:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Search vectors are updated before every insert and update of the searched fields,
+# so they are up to date regardless of how repositories and issues are written (ORM, bulk upserts).
+CREATE_TRIGGERS_SQL = """
+CREATE FUNCTION repositories_repository_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.search_vector IS NOT NULL
+            AND NEW.name IS NOT DISTINCT FROM OLD.name
+            AND NEW.description IS NOT DISTINCT FROM OLD.description
+        THEN
+            RETURN NEW;
+        END IF;
+    END IF;
+
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.name, '')), 'A')
+        || setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'B');
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER repositories_repository_search_vector
+BEFORE INSERT OR UPDATE ON repositories_repository
+FOR EACH ROW EXECUTE PROCEDURE repositories_repository_search_vector_update();
+
+CREATE FUNCTION repositories_issue_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.search_vector IS NOT NULL
+            AND NEW.title IS NOT DISTINCT FROM OLD.title
+            AND NEW.labels IS NOT DISTINCT FROM OLD.labels
+            AND NEW.description IS NOT DISTINCT FROM OLD.description
+        THEN
+            RETURN NEW;
+        END IF;
+    END IF;
+
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A')
+        || setweight(to_tsvector('pg_catalog.english', coalesce(array_to_string(NEW.labels, ' '), '')), 'B')
+        || setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'C');
+
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER repositories_issue_search_vector
+BEFORE INSERT OR UPDATE ON repositories_issue
+FOR EACH ROW EXECUTE PROCEDURE repositories_issue_search_vector_update();
+
+UPDATE repositories_repository SET search_vector = NULL;
+UPDATE repositories_issue SET search_vector = NULL;
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER repositories_issue_search_vector ON repositories_issue;
+DROP FUNCTION repositories_issue_search_vector_update();
+DROP TRIGGER repositories_repository_search_vector ON repositories_repository;
+DROP FUNCTION repositories_repository_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0011_repository_languages_gin_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='search vector'),
+        ),
+        migrations.AddField(
+            model_name='repository',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='search vector'),
+        ),
+        migrations.RunSQL(CREATE_TRIGGERS_SQL, DROP_TRIGGERS_SQL),
+        migrations.AddIndex(
+            model_name='issue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='issue_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repository',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='repository_search_vector_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.0.11 on 2026-10-18 20:12
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0012_search_vectors'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(state='open'), fields=['-created_at', '-id'], name='open_issue_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['labels'], name='issue_labels_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+SCHEDULE_NAME = "sync_added_repositories_issues"
+
+
+def create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.update_or_create(
+        name=SCHEDULE_NAME,
+        defaults=dict(
+            func="openwiden.repositories.tasks.sync_added_repositories_issues",
+            schedule_type="H",  # Schedule.HOURLY
+            repeats=-1,
+        ),
+    )
+
+
+def delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('repositories', '0013_issue_filters_indexes'),
+        ('django_q', '0013_task_attempt_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_schedule, delete_schedule),
+    ]
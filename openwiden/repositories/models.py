@@ -1,5 +1,8 @@
 from django.contrib.postgres.fields import ArrayField, HStoreField
+from django.contrib.postgres.search import SearchVectorField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models import Q
 from model_utils.models import UUIDModel
 from django.utils.translation import gettext_lazy as _
 
@@ -38,6 +41,11 @@ class Repository(UUIDModel):
 
     programming_languages = HStoreField(verbose_name=_("programming languages"), blank=True, null=True)
 
+    issues_synced_at = models.DateTimeField(_("issues synced at"), blank=True, null=True)
+
+    # Weighted name and description, updated by the database trigger
+    search_vector = SearchVectorField(_("search vector"), editable=False, null=True)
+
     state = models.CharField(
         max_length=13,
         choices=repo_enums.RepositoryState.choices,
@@ -50,6 +58,21 @@ class Repository(UUIDModel):
         verbose_name = _("repository")
         verbose_name_plural = _("repositories")
         constraints = (models.UniqueConstraint(fields=("vcs", "remote_id",), name="unique_repository",),)
+        indexes = (
+            # Keyset pagination of the added repositories
+            models.Index(
+                fields=("-open_issues_count", "-id"),
+                condition=Q(state=repo_enums.RepositoryState.ADDED),
+                name="added_repository_keyset_idx",
+            ),
+            # Programming languages filters
+            GinIndex(
+                fields=("programming_languages",),
+                condition=Q(state=repo_enums.RepositoryState.ADDED),
+                name="added_repository_languages_idx",
+            ),
+            GinIndex(fields=("search_vector",), name="repository_search_vector_idx"),
+        )
 
     def __str__(self):
         return self.name
@@ -82,11 +105,44 @@ class Issue(UUIDModel):
     closed_at = models.DateTimeField(_("closed at"), blank=True, null=True)
     updated_at = models.DateTimeField(_("updated at"))
 
+    # Weighted title, labels and description, updated by the database trigger
+    search_vector = SearchVectorField(_("search vector"), editable=False, null=True)
+
     class Meta:
         ordering = ("-created_at",)
         verbose_name = _("issue")
         verbose_name_plural = _("issues")
         constraints = (models.UniqueConstraint(fields=["repository", "remote_id"], name="unique_issue"),)
+        indexes = (
+            # Keyset pagination of the repository issues
+            models.Index(fields=("repository", "-created_at", "-id"), name="issue_repository_keyset_idx"),
+            # Keyset pagination of the open issues across repositories
+            models.Index(
+                fields=("-created_at", "-id"),
+                name="open_issue_keyset_idx",
+                condition=Q(state=repo_enums.IssueState.OPEN),
+            ),
+            GinIndex(fields=("labels",), name="issue_labels_idx"),
+            GinIndex(fields=("search_vector",), name="issue_search_vector_idx"),
+        )
 
     def __str__(self):
         return self.title
+
+
+class ProgrammingLanguage(models.Model):
+    """
+    Catalogue of the programming languages of the added repositories.
+    Repositories count is maintained by the database trigger on repository state and programming languages changes.
+    """
+
+    name = models.CharField(_("name"), max_length=255, primary_key=True)
+    repositories_count = models.PositiveIntegerField(_("repositories count"), default=0)
+
+    class Meta:
+        ordering = ("name",)
+        verbose_name = _("programming language")
+        verbose_name_plural = _("programming languages")
+
+    def __str__(self):
+        return self.name
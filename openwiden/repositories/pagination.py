@@ -0,0 +1,9 @@
+from openwiden.pagination import KeysetPagination
+
+
+class RepositoryPagination(KeysetPagination):
+    ordering = ("-open_issues_count", "-id")
+
+
+class IssuePagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
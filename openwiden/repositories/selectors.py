@@ -1,18 +1,43 @@
-from typing import Set
+from typing import Optional
 
-from django.db.models import Func, QuerySet, Q
+from django.db.models import QuerySet, Q, Case, When, Value, F, CharField, UUIDField
 
-from openwiden.users.models import User
+from openwiden.enums import OwnerType
+from openwiden.users.models import User, VCSAccount
 
 from . import models, enums, exceptions
 
 
-class HStoreSetKeys(Func):
-    function = "skeys"
+def annotate_owner(queryset: "QuerySet[models.Repository]") -> "QuerySet[models.Repository]":
+    """
+    Annotates repositories with the owner type, id and name from the joined owner's VCS account or organization,
+    so the owner could be serialized without loading related objects.
+    """
+    return queryset.annotate(
+        owner_data_type=Case(
+            When(owner__isnull=False, then=Value(OwnerType.USER)),
+            When(organization__isnull=False, then=Value(OwnerType.ORGANIZATION)),
+            output_field=CharField(),
+        ),
+        owner_data_id=Case(
+            When(owner__isnull=False, then=F("owner__user_id")),
+            When(organization__isnull=False, then=F("organization_id")),
+            output_field=UUIDField(),
+        ),
+        owner_data_name=Case(
+            When(owner__isnull=False, then=F("owner__login")),
+            When(organization__isnull=False, then=F("organization__name")),
+            output_field=CharField(),
+        ),
+    )
 
 
 def get_added_repositories() -> "QuerySet[models.Repository]":
-    return models.Repository.objects.filter(state=enums.RepositoryState.ADDED).select_related("owner", "organization")
+    return annotate_owner(models.Repository.objects.filter(state=enums.RepositoryState.ADDED))
+
+
+def get_added_repositories_issues() -> "QuerySet[models.Issue]":
+    return models.Issue.objects.filter(repository__state=enums.RepositoryState.ADDED)
 
 
 def get_repository(*, id: str) -> models.Repository:
@@ -27,17 +52,24 @@ def get_user_repositories(*, user: User) -> "QuerySet[models.Repository]":
     Returns user's repos filters by owner or organization membership.
     """
     query = Q(owner__user=user) | Q(organization__member__vcs_account__user=user)
-    return models.Repository.objects.filter(query).select_related("owner", "organization")
+    return annotate_owner(models.Repository.objects.filter(query))
 
 
-def get_programming_languages() -> Set[str]:
+def find_repository_vcs_account(*, repository: models.Repository) -> Optional[VCSAccount]:
     """
-    Returns set of the unique programming languages names from the all added repositories.
+    Returns repository owner's VCS account or VCS account of any organization member,
+    if repository is owned by organization.
     """
-    return (
-        models.Repository.objects.filter(state=enums.RepositoryState.ADDED)
-        .annotate(names=HStoreSetKeys("programming_languages"))
-        .order_by("names")
-        .distinct()
-        .values_list("names", flat=True)
-    )
+    if repository.owner:
+        return repository.owner
+    elif repository.organization:
+        return VCSAccount.objects.filter(org_membership__organization=repository.organization).first()
+    else:
+        return None
+
+
+def get_programming_languages() -> "QuerySet[models.ProgrammingLanguage]":
+    """
+    Returns programming languages of the added repositories with repositories count.
+    """
+    return models.ProgrammingLanguage.objects.filter(repositories_count__gt=0).order_by("name")
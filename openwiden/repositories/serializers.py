@@ -38,10 +38,17 @@ class Repository(serializers.ModelSerializer):
 
     @swagger_serializer_method(OwnerSerializer)
     def get_owner(self, obj: models.Repository) -> dict:
-        if obj.owner:
+        # Owner is projected by selectors.annotate_owner for lists, so related objects are not loaded
+        if getattr(obj, "owner_data_type", None):
+            data = {
+                "type": obj.owner_data_type,
+                "id": obj.owner_data_id,
+                "name": obj.owner_data_name,
+            }
+        elif obj.owner:
             data = {
                 "type": OwnerType.USER,
-                "id": obj.owner.user.id,
+                "id": obj.owner.user_id,
                 "name": obj.owner.login,
             }
         elif obj.organization:
@@ -72,6 +79,17 @@ class Issue(serializers.ModelSerializer):
         )
 
 
+class AddedIssue(Issue):
+    class Meta(Issue.Meta):
+        fields = Issue.Meta.fields + ("repository",)
+
+
 class UserRepository(Repository):
     class Meta(Repository.Meta):
         fields = Repository.Meta.fields + ("state",)
+
+
+class ProgrammingLanguage(serializers.ModelSerializer):
+    class Meta:
+        model = models.ProgrammingLanguage
+        fields = ("name", "repositories_count")
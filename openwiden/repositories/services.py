@@ -1,4 +1,14 @@
-from typing import Tuple
+import asyncio
+from itertools import islice
+from typing import Tuple, Iterable, Union, Callable, Awaitable, Optional, Dict
+from urllib.parse import urlparse
+from uuid import uuid4
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from psycopg2.extras import execute_values
 
 from openwiden import enums, vcs_clients
 from openwiden.repositories import models, enums as repository_enums, exceptions
@@ -9,13 +19,158 @@ from openwiden.vcs_clients.github.models import OwnerType
 from openwiden.vcs_clients.gitlab.models.repository import NamespaceKind
 from openwiden.webhooks import services as webhooks_services
 
+ISSUES_BULK_SYNC_BATCH_SIZE = 500
+
+_ISSUE_SYNC_FIELDS = ("title", "description", "state", "labels", "url", "created_at", "updated_at", "closed_at")
+
+_ISSUES_UPSERT_SQL = """
+    INSERT INTO {table} (id, repository_id, remote_id, {fields})
+    VALUES %s
+    ON CONFLICT ON CONSTRAINT unique_issue DO UPDATE SET {updates}
+    RETURNING (xmax = 0)
+""".format(
+    table=models.Issue._meta.db_table,
+    fields=", ".join(_ISSUE_SYNC_FIELDS),
+    updates=", ".join(f"{field} = EXCLUDED.{field}" for field in _ISSUE_SYNC_FIELDS),
+)
+
+
+_REPOSITORIES_UPSERT_SQL = """
+    INSERT INTO {table} (id, vcs, remote_id, state, {columns})
+    VALUES %s
+    ON CONFLICT ON CONSTRAINT unique_repository DO UPDATE SET {updates}
+    RETURNING (xmax = 0)
+"""
+
+# Organization fields are updated, so ids of the existing organizations are returned too
+_ORGANIZATIONS_UPSERT_SQL = """
+    INSERT INTO {table} (id, vcs, remote_id, {columns})
+    VALUES %s
+    ON CONFLICT ON CONSTRAINT unique_org DO UPDATE SET {updates}
+    RETURNING remote_id, id
+"""
+
+# Members are ordered with respect to organization, so the order is set as Model.save() does
+_MEMBERS_INSERT_SQL = """
+    INSERT INTO {table} (id, organization_id, vcs_account_id, is_admin, _order)
+    SELECT v.id, v.organization_id, v.vcs_account_id, FALSE, (
+        SELECT COUNT(*) FROM {table} m WHERE m.organization_id = v.organization_id
+    )
+    FROM (VALUES %s) AS v (id, organization_id, vcs_account_id)
+    ON CONFLICT ON CONSTRAINT unique_member DO NOTHING
+""".format(
+    table=organizations_models.Member._meta.db_table,
+)
+
+
+async def _fetch_repository_data(
+    repository: Awaitable,
+    programming_languages: Awaitable,
+    organization: Awaitable = None,
+    membership: Awaitable = None,
+) -> tuple:
+    """
+    Awaits independent VCS requests of the repository add concurrently.
+    Returns results in the order of arguments, organization and membership are None if they are not requested.
+    """
+    requests = [repository, programming_languages]
 
-def _add_github_repository(*, repository: models.Repository, vcs_account: users_models.VCSAccount,) -> None:
+    if organization is not None:
+        requests += [organization, membership]
+
+    repository_data, programming_languages_data, *organization_results = await asyncio.gather(*requests)
+    organization_data, membership_type = organization_results or (None, None)
+
+    return repository_data, programming_languages_data, organization_data, membership_type
+
+
+def _get_organization_remote_id(repository: models.Repository) -> Optional[int]:
+    return repository.organization.remote_id if repository.organization else None
+
+
+def _get_github_repository_full_name(repository: models.Repository) -> Tuple[str, str]:
+    """
+    Returns owner login and name of the repository from its url.
+    """
+    owner, name = urlparse(repository.url).path.strip("/").split("/")[-2:]
+    return owner, name
+
+
+def _add_github_repository_by_graphql(
+    *, repository: models.Repository, vcs_account: users_models.VCSAccount,
+) -> None:
+    """
+    Adds repository with programming languages, organization and open issues fetched by the single GraphQL query,
+    issues are synced by the REST API, if they were synced before or there are more of them than fetched.
+    """
     github_client = vcs_clients.GitHubClient(vcs_account)
+    owner, name = _get_github_repository_full_name(repository)
+    is_first_issues_sync = repository.issues_synced_at is None
+    sync_started_at = timezone.now()
+
+    repository_details = github_client.get_repository_details(
+        owner=owner,
+        name=name,
+        issues_count=settings.VCS_CLIENTS_GITHUB_GRAPHQL_ISSUES_COUNT if is_first_issues_sync else 0,
+    )
+
+    if repository_details.repository.repository_id != repository.remote_id:
+        raise ValueError(f"repository {owner}/{name} is not the repository with id {repository.remote_id}")
+
+    # Sync repository
+    repository, _ = sync_github_repository(
+        repository=repository_details.repository,
+        vcs_account=vcs_account,
+        extra_defaults=dict(programming_languages=repository_details.programming_languages),
+    )
+
+    # Sync organization and membership if owner is organization
+    if repository.organization:
+        organization, _ = organizations_services.sync_github_organization(
+            organization=repository_details.organization,
+        )
+        membership_type = github_client.check_organization_membership(organization_id=organization.remote_id)
+        organizations_services.sync_organization_membership(
+            organization=organization, vcs_account=vcs_account, membership_type=membership_type,
+        )
+
+    # Sync issues
+    if is_first_issues_sync and not repository_details.has_more_issues:
+        bulk_sync_repository_issues(repository=repository, issues=repository_details.issues)
+        repository.issues_synced_at = sync_started_at
+        repository.save(update_fields=("issues_synced_at",))
+    else:
+        sync_repository_issues(repository=repository, vcs_account=vcs_account)
+
+    # Create webhook
+    webhooks_services.create_repository_webhook(
+        repository=repository, vcs_account=vcs_account,
+    )
+
+    # Update repository state
+    update_repository_state(repository=repository, state=repository_enums.RepositoryState.ADDED)
+
+
+def _add_github_repository(*, repository: models.Repository, vcs_account: users_models.VCSAccount,) -> None:
+    if settings.VCS_CLIENTS_GITHUB_GRAPHQL_ENABLED:
+        _add_github_repository_by_graphql(repository=repository, vcs_account=vcs_account)
+        return
+
+    # DB reads are made here, before the requests are fanned out to the threads
+    github_client = vcs_clients.AsyncGitHubClient(vcs_account)
+    organization_id = _get_organization_remote_id(repository)
+
+    # Fetch repository, programming languages and organization (if known) concurrently
+    repository_data, programming_languages, organization_data, membership_type = async_to_sync(
+        _fetch_repository_data
+    )(
+        github_client.get_repository(repository.remote_id),
+        github_client.get_repository_languages(repository.remote_id),
+        github_client.get_organization(organization_id) if organization_id else None,
+        github_client.check_organization_membership(organization_id=organization_id) if organization_id else None,
+    )
 
     # Sync repository
-    repository_data = github_client.get_repository(repository.remote_id)
-    programming_languages = github_client.get_repository_languages(repository.remote_id)
     repository, _ = sync_github_repository(
         repository=repository_data,
         vcs_account=vcs_account,
@@ -24,19 +179,22 @@ def _add_github_repository(*, repository: models.Repository, vcs_account: users_
 
     # Sync organization if owner is organization
     if repository.organization:
-        organization_data = github_client.get_organization(repository.organization.remote_id,)
+        # Organization is fetched now if it was unknown or changed since the last repository sync
+        if repository.organization.remote_id != organization_id:
+            organization_data = github_client.sync_client.get_organization(repository.organization.remote_id)
+            membership_type = github_client.sync_client.check_organization_membership(
+                organization_id=repository.organization.remote_id,
+            )
+
         organization, _ = organizations_services.sync_github_organization(organization=organization_data,)
 
         # Sync membership
-        membership_type = github_client.check_organization_membership(organization_id=organization.remote_id,)
         organizations_services.sync_organization_membership(
             organization=organization, vcs_account=vcs_account, membership_type=membership_type,
         )
 
     # Sync issues
-    repository_issues = github_client.get_repository_issues(repository.remote_id)
-    for issue in repository_issues:
-        sync_github_repository_issue(issue=issue, repository=repository)
+    sync_repository_issues(repository=repository, vcs_account=vcs_account)
 
     # Create webhook
     webhooks_services.create_repository_webhook(
@@ -48,11 +206,21 @@ def _add_github_repository(*, repository: models.Repository, vcs_account: users_
 
 
 def _add_gitlab_repository(*, repository: models.Repository, vcs_account: users_models.VCSAccount,) -> None:
-    gitlab_client = vcs_clients.GitlabClient(vcs_account)
+    # DB reads are made here, before the requests are fanned out to the threads
+    gitlab_client = vcs_clients.AsyncGitlabClient(vcs_account)
+    organization_id = _get_organization_remote_id(repository)
+
+    # Fetch repository, programming languages and organization (if known) concurrently
+    repository_data, programming_languages, organization_data, membership_type = async_to_sync(
+        _fetch_repository_data
+    )(
+        gitlab_client.get_repository(repository_id=repository.remote_id),
+        gitlab_client.get_repository_programming_languages(repository.remote_id),
+        gitlab_client.get_organization(organization_id) if organization_id else None,
+        gitlab_client.check_organization_membership(organization_id=organization_id) if organization_id else None,
+    )
 
     # Sync repository
-    repository_data = gitlab_client.get_repository(repository_id=repository.remote_id)
-    programming_languages = gitlab_client.get_repository_programming_languages(repository.remote_id)
     repository, _ = sync_gitlab_repository(
         repository=repository_data,
         vcs_account=vcs_account,
@@ -61,19 +229,22 @@ def _add_gitlab_repository(*, repository: models.Repository, vcs_account: users_
 
     # Sync organization if owner is organization
     if repository.organization:
-        organization_data = gitlab_client.get_organization(repository.organization.remote_id,)
+        # Organization is fetched now if it was unknown or changed since the last repository sync
+        if repository.organization.remote_id != organization_id:
+            organization_data = gitlab_client.sync_client.get_organization(repository.organization.remote_id)
+            membership_type = gitlab_client.sync_client.check_organization_membership(
+                organization_id=repository.organization.remote_id,
+            )
+
         organization, _ = organizations_services.sync_gitlab_organization(organization=organization_data,)
 
         # Sync organization membership
-        membership_type = gitlab_client.check_organization_membership(organization_id=organization.remote_id,)
         organizations_services.sync_organization_membership(
             organization=organization, vcs_account=vcs_account, membership_type=membership_type,
         )
 
     # Sync issues
-    issues = gitlab_client.get_repository_issues(repository.remote_id)
-    for issue in issues:
-        sync_gitlab_repository_issue(issue=issue, repository=repository)
+    sync_repository_issues(repository=repository, vcs_account=vcs_account)
 
     # Create webhook
     webhooks_services.create_repository_webhook(
@@ -142,25 +313,174 @@ def remove_repository(*, repository: models.Repository, user: users_models.User,
 def sync_user_repositories(*, vcs_account: users_models.VCSAccount) -> None:
     if vcs_account.vcs == enums.VersionControlService.GITHUB:
         github_client = vcs_clients.GitHubClient(vcs_account)
-        user_repositories = github_client.get_user_repositories()
-        for repository in user_repositories:
-            sync_github_repository(repository=repository, vcs_account=vcs_account)
+        if settings.VCS_CLIENTS_GITHUB_GRAPHQL_ENABLED:
+            _sync_github_user_repositories_details(
+                repositories_details=github_client.get_user_repositories_details(), vcs_account=vcs_account,
+            )
+        else:
+            bulk_sync_user_repositories(repositories=github_client.get_user_repositories(), vcs_account=vcs_account)
     elif vcs_account.vcs == enums.VersionControlService.GITLAB:
         gitlab_client = vcs_clients.GitlabClient(vcs_account)
-        repositories = gitlab_client.get_user_repositories()
-        for repository in repositories:
-            sync_gitlab_repository(repository=repository, vcs_account=vcs_account)
+        bulk_sync_user_repositories(repositories=gitlab_client.get_user_repositories(), vcs_account=vcs_account)
     else:
         raise ValueError(f"vcs {vcs_account.vcs} is not implemented!")
 
 
-def sync_github_repository(
+def _sync_github_user_repositories_details(
     *,
-    repository: vcs_clients.github.models.Repository,
-    vcs_account: users_models.VCSAccount = None,
-    extra_defaults: dict = None,
-) -> Tuple[models.Repository, bool]:
-    defaults = dict(
+    repositories_details: Iterable[vcs_clients.github.models.RepositoryDetails],
+    vcs_account: users_models.VCSAccount,
+) -> None:
+    """
+    Syncs user repositories fetched by the GraphQL API with programming languages and owner organizations,
+    so they are up to date without the separate requests per repository.
+    """
+    repositories, programming_languages, organizations = [], {}, {}
+
+    for repository_details in repositories_details:
+        repository_id = repository_details.repository.repository_id
+        repositories.append(repository_details.repository)
+        programming_languages[repository_id] = dict(programming_languages=repository_details.programming_languages)
+
+        if repository_details.organization:
+            organization = repository_details.organization
+            organizations[organization.organization_id] = _get_github_organization_extra_defaults(organization)
+
+    bulk_sync_user_repositories(
+        repositories=repositories,
+        vcs_account=vcs_account,
+        extra_defaults=programming_languages,
+        organizations_extra_defaults=organizations,
+    )
+
+
+def _get_github_organization_extra_defaults(organization: vcs_clients.github.models.Organization) -> dict:
+    return dict(
+        description=organization.description,
+        url=organization.html_url,
+        avatar_url=organization.avatar_url,
+        created_at=organization.created_at,
+    )
+
+
+def bulk_sync_user_repositories(
+    *,
+    repositories: Iterable[Union[vcs_clients.github.models.Repository, vcs_clients.gitlab.models.Repository]],
+    vcs_account: users_models.VCSAccount,
+    extra_defaults: Dict[int, dict] = None,
+    organizations_extra_defaults: Dict[int, dict] = None,
+) -> Tuple[int, int]:
+    """
+    Creates or updates user repositories with their owner organizations and memberships.
+    Distinct organizations are upserted first, then memberships and repositories,
+    with a fixed number of queries regardless of the repositories count.
+    Extra defaults could be specified per repository (organization) remote id,
+    with the same fields for every repository (organization).
+    Returns created and updated repositories count.
+    """
+    get_repository_defaults, get_repository_organization = _get_repository_sync_getters(vcs_account.vcs)
+    extra_defaults = extra_defaults or {}
+    organizations_extra_defaults = organizations_extra_defaults or {}
+
+    # The same repository can't be upserted twice by one statement, so only the last occurrence is kept
+    repositories = {
+        repository.repository_id: (
+            {**get_repository_defaults(repository), **extra_defaults.get(repository.repository_id, {})},
+            get_repository_organization(repository),
+        )
+        for repository in repositories
+    }
+
+    if not repositories:
+        return 0, 0
+
+    organizations_names = dict(organization for _, organization in repositories.values() if organization)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        organizations_ids = {}
+
+        if organizations_names:
+            organizations_defaults = {
+                remote_id: dict(name=name, **organizations_extra_defaults.get(remote_id, {}))
+                for remote_id, name in organizations_names.items()
+            }
+            organizations_fields = tuple(next(iter(organizations_defaults.values())).keys())
+            organizations_ids = dict(
+                execute_values(
+                    cursor,
+                    _get_organizations_upsert_sql(organizations_fields),
+                    [
+                        (
+                            uuid4(),
+                            vcs_account.vcs,
+                            remote_id,
+                            *_get_db_values(organizations_models.Organization, defaults, organizations_fields),
+                        )
+                        for remote_id, defaults in organizations_defaults.items()
+                    ],
+                    page_size=len(organizations_defaults),
+                    fetch=True,
+                )
+            )
+            execute_values(
+                cursor,
+                _MEMBERS_INSERT_SQL,
+                [(uuid4(), organization_id, vcs_account.id) for organization_id in organizations_ids.values()],
+                page_size=len(organizations_ids),
+            )
+
+        fields = _get_repository_sync_fields(next(iter(repositories.values()))[0])
+        values = []
+        for remote_id, (defaults, organization) in repositories.items():
+            if organization:
+                defaults.update(owner=None, organization=organizations_ids[organization[0]])
+            else:
+                defaults.update(owner=vcs_account.id, organization=None)
+
+            values.append(
+                (
+                    uuid4(),
+                    vcs_account.vcs,
+                    remote_id,
+                    repository_enums.RepositoryState.INITIAL,
+                    *_get_db_values(models.Repository, defaults, fields),
+                )
+            )
+
+        rows = execute_values(cursor, _get_repositories_upsert_sql(fields), values, page_size=len(values), fetch=True)
+
+    created_count = sum(1 for (is_created,) in rows if is_created)
+    return created_count, len(rows) - created_count
+
+
+def _get_db_values(model, defaults: dict, fields: Tuple[str, ...]) -> tuple:
+    return tuple(model._meta.get_field(field).get_db_prep_save(defaults[field], connection) for field in fields)
+
+
+def _get_organizations_upsert_sql(fields: Tuple[str, ...]) -> str:
+    columns = [organizations_models.Organization._meta.get_field(field).column for field in fields]
+    return _ORGANIZATIONS_UPSERT_SQL.format(
+        table=organizations_models.Organization._meta.db_table,
+        columns=", ".join(columns),
+        updates=", ".join(f"{column} = EXCLUDED.{column}" for column in columns),
+    )
+
+
+def _get_repository_sync_fields(defaults: dict) -> Tuple[str, ...]:
+    return (*defaults.keys(), "owner", "organization")
+
+
+def _get_repositories_upsert_sql(fields: Tuple[str, ...]) -> str:
+    columns = [models.Repository._meta.get_field(field).column for field in fields]
+    return _REPOSITORIES_UPSERT_SQL.format(
+        table=models.Repository._meta.db_table,
+        columns=", ".join(columns),
+        updates=", ".join(f"{column} = EXCLUDED.{column}" for column in columns),
+    )
+
+
+def _get_github_repository_defaults(repository: vcs_clients.github.models.Repository) -> dict:
+    return dict(
         name=repository.name,
         description=repository.description,
         url=repository.html_url,
@@ -171,15 +491,63 @@ def sync_github_repository(
         updated_at=repository.updated_at,
     )
 
+
+def _get_github_repository_organization(repository: vcs_clients.github.models.Repository) -> Optional[Tuple[int, str]]:
+    """
+    Returns owner organization remote id and name if repository is owned by organization.
+    """
+    if repository.owner.owner_type == OwnerType.ORGANIZATION:
+        return repository.owner.owner_id, repository.owner.login
+    return None
+
+
+def _get_gitlab_repository_defaults(repository: vcs_clients.gitlab.models.Repository) -> dict:
+    return dict(
+        name=repository.name,
+        description=repository.description,
+        url=repository.web_url,
+        stars_count=repository.star_count,
+        open_issues_count=repository.open_issues_count,
+        forks_count=repository.forks_count,
+        created_at=repository.created_at,
+        updated_at=repository.last_activity_at,
+    )
+
+
+def _get_gitlab_repository_organization(repository: vcs_clients.gitlab.models.Repository) -> Optional[Tuple[int, str]]:
+    """
+    Returns namespace organization remote id and name if repository is owned by organization.
+    """
+    if repository.namespace.kind == NamespaceKind.ORGANIZATION:
+        return repository.namespace.namespace_id, repository.namespace.name
+    return None
+
+
+def _get_repository_sync_getters(vcs: str) -> Tuple[Callable[..., dict], Callable[..., Optional[Tuple[int, str]]]]:
+    if vcs == enums.VersionControlService.GITHUB:
+        return _get_github_repository_defaults, _get_github_repository_organization
+    elif vcs == enums.VersionControlService.GITLAB:
+        return _get_gitlab_repository_defaults, _get_gitlab_repository_organization
+    else:
+        raise ValueError(f"vcs {vcs} is not implemented!")
+
+
+def sync_github_repository(
+    *,
+    repository: vcs_clients.github.models.Repository,
+    vcs_account: users_models.VCSAccount = None,
+    extra_defaults: dict = None,
+) -> Tuple[models.Repository, bool]:
+    defaults = _get_github_repository_defaults(repository)
+
     if extra_defaults:
         defaults.update(extra_defaults)
 
     if vcs_account:
-        if repository.owner.owner_type == OwnerType.ORGANIZATION:
+        organization = _get_github_repository_organization(repository)
+        if organization:
             defaults["organization"], _ = organizations_models.Organization.objects.get_or_create(
-                vcs=enums.VersionControlService.GITHUB,
-                remote_id=repository.owner.owner_id,
-                defaults=dict(name=repository.owner.login),
+                vcs=enums.VersionControlService.GITHUB, remote_id=organization[0], defaults=dict(name=organization[1]),
             )
             organizations_models.Member.objects.get_or_create(
                 organization=defaults["organization"], vcs_account=vcs_account,
@@ -203,18 +571,7 @@ def sync_github_repository_issue(
         )
 
     return models.Issue.objects.update_or_create(
-        repository=repository,
-        remote_id=issue.issue_id,
-        defaults=dict(
-            title=issue.title,
-            description=issue.body,
-            state=issue.state,
-            labels=issue.labels,
-            url=issue.html_url,
-            created_at=issue.created_at,
-            updated_at=issue.updated_at,
-            closed_at=issue.closed_at,
-        ),
+        repository=repository, remote_id=issue.issue_id, defaults=_get_github_issue_defaults(issue),
     )
 
 
@@ -224,26 +581,16 @@ def sync_gitlab_repository(
     vcs_account: users_models.VCSAccount,
     extra_defaults: dict = None,
 ) -> Tuple[models.Repository, bool]:
-    defaults = dict(
-        name=repository.name,
-        description=repository.description,
-        url=repository.web_url,
-        stars_count=repository.star_count,
-        open_issues_count=repository.open_issues_count,
-        forks_count=repository.forks_count,
-        created_at=repository.created_at,
-        updated_at=repository.last_activity_at,
-    )
+    defaults = _get_gitlab_repository_defaults(repository)
 
     if extra_defaults:
         defaults.update(extra_defaults)
 
     # Add ownership
-    if repository.namespace.kind == NamespaceKind.ORGANIZATION:
+    organization = _get_gitlab_repository_organization(repository)
+    if organization:
         defaults["organization"], _ = organizations_models.Organization.objects.get_or_create(
-            vcs=enums.VersionControlService.GITLAB,
-            remote_id=repository.namespace.namespace_id,
-            defaults=dict(name=repository.namespace.name),
+            vcs=enums.VersionControlService.GITLAB, remote_id=organization[0], defaults=dict(name=organization[1]),
         )
         organizations_models.Member.objects.get_or_create(
             organization=defaults["organization"], vcs_account=vcs_account,
@@ -266,16 +613,107 @@ def sync_gitlab_repository_issue(
         repository = models.Repository.objects.get(vcs=enums.VersionControlService.GITLAB, remote_id=issue.project_id,)
 
     models.Issue.objects.update_or_create(
-        repository=repository,
-        remote_id=issue.issue_id,
-        defaults=dict(
-            title=issue.title,
-            description=issue.description,
-            state=issue.state,
-            labels=issue.labels,
-            url=issue.web_url,
-            created_at=issue.created_at,
-            updated_at=issue.updated_at,
-            closed_at=issue.closed_at,
-        ),
+        repository=repository, remote_id=issue.issue_id, defaults=_get_gitlab_issue_defaults(issue),
+    )
+
+
+def _get_github_issue_defaults(issue: vcs_clients.github.models.Issue) -> dict:
+    return dict(
+        title=issue.title,
+        description=issue.body,
+        state=issue.state,
+        labels=issue.labels,
+        url=issue.html_url,
+        created_at=issue.created_at,
+        updated_at=issue.updated_at,
+        closed_at=issue.closed_at,
+    )
+
+
+def _get_gitlab_issue_defaults(issue: vcs_clients.gitlab.models.Issue) -> dict:
+    return dict(
+        title=issue.title,
+        description=issue.description,
+        state=issue.state,
+        labels=issue.labels,
+        url=issue.web_url,
+        created_at=issue.created_at,
+        updated_at=issue.updated_at,
+        closed_at=issue.closed_at,
     )
+
+
+def _get_issue_defaults_getter(vcs: str) -> Callable[..., dict]:
+    if vcs == enums.VersionControlService.GITHUB:
+        return _get_github_issue_defaults
+    elif vcs == enums.VersionControlService.GITLAB:
+        return _get_gitlab_issue_defaults
+    else:
+        raise ValueError(f"vcs {vcs} is not implemented!")
+
+
+def sync_repository_issues(
+    *, repository: models.Repository, vcs_account: users_models.VCSAccount
+) -> Tuple[int, int]:
+    """
+    Syncs repository issues and saves the sync time as a watermark for the next sync.
+    If issues were synced before, then only issues changed since the last sync are requested
+    (closed issues included), otherwise all opened issues.
+    Returns created and updated issues count.
+    """
+    sync_started_at = timezone.now()
+
+    if repository.vcs == enums.VersionControlService.GITHUB:
+        github_client = vcs_clients.GitHubClient(vcs_account)
+        issues = github_client.get_repository_issues(repository.remote_id, since=repository.issues_synced_at)
+    elif repository.vcs == enums.VersionControlService.GITLAB:
+        gitlab_client = vcs_clients.GitlabClient(vcs_account)
+        issues = gitlab_client.get_repository_issues(repository.remote_id, updated_after=repository.issues_synced_at)
+    else:
+        raise ValueError(f"vcs {repository.vcs} is not implemented!")
+
+    counts = bulk_sync_repository_issues(repository=repository, issues=issues)
+
+    repository.issues_synced_at = sync_started_at
+    repository.save(update_fields=("issues_synced_at",))
+
+    return counts
+
+
+def bulk_sync_repository_issues(
+    *,
+    repository: models.Repository,
+    issues: Iterable[Union[vcs_clients.github.models.Issue, vcs_clients.gitlab.models.Issue]],
+    batch_size: int = ISSUES_BULK_SYNC_BATCH_SIZE,
+) -> Tuple[int, int]:
+    """
+    Creates or updates repository issues in batches with a single
+    INSERT ... ON CONFLICT statement per batch.
+    Returns created and updated issues count.
+    """
+    get_issue_defaults = _get_issue_defaults_getter(repository.vcs)
+    issues = iter(issues)
+    created_count, updated_count = 0, 0
+
+    with connection.cursor() as cursor:
+        while True:
+            # The same issue can't be upserted twice by one statement,
+            # so only the last occurrence of the issue in the batch is kept.
+            batch = {issue.issue_id: issue for issue in islice(issues, batch_size)}
+
+            if not batch:
+                break
+
+            values = []
+            for remote_id, issue in batch.items():
+                defaults = get_issue_defaults(issue)
+                values.append(
+                    (uuid4(), repository.id, remote_id, *(defaults[field] for field in _ISSUE_SYNC_FIELDS))
+                )
+
+            rows = execute_values(cursor.cursor, _ISSUES_UPSERT_SQL, values, page_size=len(values), fetch=True)
+            batch_created_count = sum(1 for (is_created,) in rows if is_created)
+            created_count += batch_created_count
+            updated_count += len(rows) - batch_created_count
+
+    return created_count, updated_count
@@ -1,6 +1,30 @@
+from datetime import datetime, timezone
+from logging import getLogger
+
+from django_q.models import Schedule
+from django_q.tasks import async_task, schedule
+
 from openwiden.users import models as users_models, services as users_services
 from openwiden.exceptions import ServiceException
-from . import services, models, messages, enums
+from openwiden.vcs_clients import RateLimitExceeded
+from . import services, models, messages, enums, selectors
+
+log = getLogger(__name__)
+
+
+def _notify_rate_limited(
+    *, repository: models.Repository, user: users_models.User, message: str, state: str, reset_at: int,
+) -> None:
+    services.update_repository_state(repository=repository, state=state)
+    message = users_services.RepositoryMessage(
+        message=message.format(
+            name=repository.name,
+            reset_at=datetime.fromtimestamp(reset_at, tz=timezone.utc).isoformat(),
+        ),
+        repository_id=str(repository.id),
+        state=state,
+    )
+    users_services.send_notification(user=user, message=message)
 
 
 def add_repository(repository: models.Repository, user: users_models.User):
@@ -11,6 +35,15 @@ def add_repository(repository: models.Repository, user: users_models.User):
             repository=repository, state=enums.RepositoryState.ADD_FAILED,
         )
         users_services.send_notification(user=user, message=e)
+    except RateLimitExceeded as e:
+        log.info(f"[Task] repository {repository.id} add failed: {e}")
+        _notify_rate_limited(
+            repository=repository,
+            user=user,
+            message=messages.REPOSITORY_ADD_IS_RATE_LIMITED,
+            state=enums.RepositoryState.ADD_FAILED,
+            reset_at=e.reset_at,
+        )
     else:
         message = users_services.RepositoryMessage(
             message=messages.REPOSITORY_IS_ADDED.format(name=repository.name),
@@ -28,6 +61,15 @@ def remove_repository(repository: models.Repository, user: users_models.User):
             repository=repository, state=enums.RepositoryState.REMOVE_FAILED,
         )
         users_services.send_notification(user=user, message=e)
+    except RateLimitExceeded as e:
+        log.info(f"[Task] repository {repository.id} remove failed: {e}")
+        _notify_rate_limited(
+            repository=repository,
+            user=user,
+            message=messages.REPOSITORY_REMOVE_IS_RATE_LIMITED,
+            state=enums.RepositoryState.REMOVE_FAILED,
+            reset_at=e.reset_at,
+        )
     else:
         message = users_services.RepositoryMessage(
             message=messages.REPOSITORY_IS_REMOVED.format(name=repository.name),
@@ -35,3 +77,33 @@ def remove_repository(repository: models.Repository, user: users_models.User):
             state=enums.RepositoryState.REMOVED,
         )
         users_services.send_notification(user=user, message=message)
+
+
+def sync_repository_issues(repository_id: str):
+    repository = selectors.get_repository(id=repository_id)
+    vcs_account = selectors.find_repository_vcs_account(repository=repository)
+
+    if vcs_account is None:
+        log.warning(f"[Task] skip issues sync for repository {repository.id}, no VCS account found")
+        return
+
+    try:
+        services.sync_repository_issues(repository=repository, vcs_account=vcs_account)
+    except RateLimitExceeded as e:
+        # Defer the sync until the rate limit budget is reset
+        log.info(f"[Task] issues sync for repository {repository.id} is deferred: {e}")
+        schedule(
+            "openwiden.repositories.tasks.sync_repository_issues",
+            repository_id=str(repository.id),
+            schedule_type=Schedule.ONCE,
+            next_run=datetime.fromtimestamp(e.reset_at, tz=timezone.utc),
+        )
+
+
+def sync_added_repositories_issues():
+    """
+    Catches up issues changes of the added repositories, that could be missed by webhooks.
+    Run hourly by the django-q schedule, that is created by the repositories migration.
+    """
+    for repository in selectors.get_added_repositories():
+        async_task(sync_repository_issues, repository_id=str(repository.id))
@@ -0,0 +1,30 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from openwiden.repositories.enums import RepositoryState, IssueState
+
+
+@pytest.mark.functional
+@pytest.mark.django_db
+def test_run(create_api_client, create_repository, create_issue):
+    api_client = create_api_client()
+    python_repository = create_repository(state=RepositoryState.ADDED, programming_languages={"Python": 100})
+    vue_repository = create_repository(state=RepositoryState.ADDED, programming_languages={"Vue": 100})
+    removed_repository = create_repository(state=RepositoryState.REMOVED, programming_languages={"Python": 100})
+
+    expected = create_issue(repository=python_repository, state=IssueState.OPEN, labels=["good first issue"])
+    create_issue(repository=python_repository, state=IssueState.CLOSED, labels=["good first issue"])
+    create_issue(repository=python_repository, state=IssueState.OPEN, labels=["bug"])
+    create_issue(repository=vue_repository, state=IssueState.OPEN, labels=["good first issue"])
+    create_issue(repository=removed_repository, state=IssueState.OPEN, labels=["good first issue"])
+
+    response = api_client.get(
+        reverse("api-v1:issue-list"),
+        {"state": IssueState.OPEN, "labels": "good first issue", "programming_languages": "Python"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [(issue["id"], issue["repository"]) for issue in response.json()["results"]] == [
+        (str(expected.id), str(python_repository.id))
+    ]
@@ -0,0 +1,44 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from openwiden.repositories import pagination
+from openwiden.repositories.enums import RepositoryState
+
+
+@pytest.mark.functional
+@pytest.mark.django_db
+def test_run(create_api_client, create_repository, create_issue, monkeypatch):
+    monkeypatch.setattr(pagination.IssuePagination, "page_size", 2)
+    api_client = create_api_client()
+    repository = create_repository(state=RepositoryState.ADDED)
+    created_at = timezone.now()
+
+    # Issues with the same creation time are ordered by id
+    issues = [create_issue(repository=repository, created_at=created_at) for _ in range(3)]
+    day_ago = created_at - timezone.timedelta(days=1)
+    issues += [create_issue(repository=repository, created_at=day_ago) for _ in range(2)]
+    expected_ids = [str(issue.id) for issue in sorted(issues, key=lambda issue: (issue.created_at, issue.id))][::-1]
+
+    # Walk through the pages by next links
+    list_url = reverse("api-v1:repository-issue-list", kwargs={"repository_id": str(repository.id)})
+    pages, url = [], list_url
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.json())
+        url = pages[-1]["next"]
+
+    assert [issue["id"] for page in pages for issue in page["results"]] == expected_ids
+    assert [page["count"] for page in pages] == [len(issues)] * 3
+    assert pages[0]["previous"] is None
+
+    # Previous link of the last page leads to the second page
+    response = api_client.get(f'{pages[-1]["previous"]}&skip_count=true')
+    assert response.json()["results"] == pages[1]["results"]
+    assert response.json()["count"] is None
+
+    # Invalid cursor
+    response = api_client.get(list_url, {"cursor": "invalid"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
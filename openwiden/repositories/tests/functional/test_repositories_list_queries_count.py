@@ -0,0 +1,40 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from openwiden.enums import OwnerType
+from openwiden.repositories.enums import RepositoryState
+
+
+def create_repositories(create_repository, org, count: int) -> None:
+    for i in range(count):
+        if i % 2:
+            create_repository(state=RepositoryState.ADDED, organization=None)
+        else:
+            create_repository(state=RepositoryState.ADDED, owner=None, organization=org)
+
+
+@pytest.mark.functional
+@pytest.mark.django_db
+def test_run(create_api_client, create_repository, org):
+    api_client = create_api_client()
+    url = reverse("api-v1:repository-list")
+
+    create_repositories(create_repository, org, 2)
+    with CaptureQueriesContext(connection) as few_repositories_queries:
+        response = api_client.get(url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {repository["owner"]["type"] for repository in response.json()["results"]} == {
+        OwnerType.USER,
+        OwnerType.ORGANIZATION,
+    }
+
+    create_repositories(create_repository, org, 8)
+    with CaptureQueriesContext(connection) as many_repositories_queries:
+        response = api_client.get(url)
+
+    assert len(response.json()["results"]) == 10
+    assert len(many_repositories_queries) == len(few_repositories_queries)
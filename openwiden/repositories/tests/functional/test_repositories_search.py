@@ -0,0 +1,30 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from openwiden.repositories import pagination
+from openwiden.repositories.enums import RepositoryState
+
+
+@pytest.mark.functional
+@pytest.mark.django_db
+def test_run(create_api_client, create_repository, monkeypatch):
+    monkeypatch.setattr(pagination.RepositoryPagination, "page_size", 1)
+    api_client = create_api_client()
+    by_name = create_repository(state=RepositoryState.ADDED, name="python", description="")
+    by_description = create_repository(state=RepositoryState.ADDED, name="django", description="Python web framework")
+    create_repository(state=RepositoryState.ADDED, name="vue", description="JavaScript framework")
+
+    # Walk through the relevance ranked pages by next links
+    pages, url = [], f'{reverse("api-v1:repository-list")}?search=python'
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.json())
+        url = pages[-1]["next"]
+
+    assert [repository["id"] for page in pages for repository in page["results"]] == [
+        str(by_name.id),
+        str(by_description.id),
+    ]
+    assert pages[0]["count"] == 2
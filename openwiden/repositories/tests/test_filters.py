@@ -1,6 +1,7 @@
 import pytest
 
 from openwiden.repositories import models, filters
+from openwiden.repositories.enums import IssueState
 from openwiden import enums
 
 pytestmark = pytest.mark.django_db
@@ -65,3 +66,98 @@ class TestRepositoryFilter:
 
         assert f.qs.count() == 1
         assert f.qs.first().id == expected.id
+
+    def test_programming_languages_filter(self, create_repository):
+        python_repository = create_repository(programming_languages={"Python": 80, "Docker": 20})
+        docker_repository = create_repository(programming_languages={"Python": 30, "Docker": 70})
+        create_repository(programming_languages={"Vue": 100})
+        query = {"programming_languages": "Python,Go"}
+
+        f = filters.Repository(query, models.Repository.objects.all())
+
+        assert set(f.qs.values_list("id", flat=True)) == {python_repository.id, docker_repository.id}
+
+    def test_programming_languages_share_filter(self, create_repository):
+        expected = create_repository(programming_languages={"Python": 80, "Docker": 20})
+        create_repository(programming_languages={"Python": 30, "Docker": 70})
+        create_repository(programming_languages={"Vue": 100})
+        query = {"programming_languages": "Python>=40,Docker>=10.5"}
+
+        f = filters.Repository(query, models.Repository.objects.all())
+
+        assert f.qs.count() == 1
+        assert f.qs.first().id == expected.id
+
+    def test_search_filter(self, create_repository):
+        create_repository(name="django-rest-framework", description="Web APIs for Python")
+        expected = create_repository(name="python", description="The Python programming language")
+        create_repository(name="vue", description="JavaScript framework")
+        query = {"search": "python"}
+
+        f = filters.Repository(query, models.Repository.objects.all())
+
+        assert f.qs.count() == 2
+        # Name matches are ranked higher than description matches
+        assert f.qs.first().id == expected.id
+
+
+class TestIssueFilter:
+    def test_state_filter(self, create_issue):
+        expected = create_issue(state=IssueState.OPEN)
+        create_issue(state=IssueState.CLOSED)
+        query = {"state": IssueState.OPEN}
+
+        f = filters.Issue(query, models.Issue.objects.all())
+
+        assert f.qs.get().id == expected.id
+
+    def test_labels_filters(self, create_issue):
+        bug = create_issue(labels=["bug", "good first issue"])
+        docs = create_issue(labels=["documentation", "good first issue"])
+        create_issue(labels=["enhancement"])
+
+        f = filters.Issue({"labels": "good first issue,bug"}, models.Issue.objects.all())
+        assert f.qs.get().id == bug.id
+
+        f = filters.Issue({"labels_any": "bug,documentation"}, models.Issue.objects.all())
+        assert set(f.qs.values_list("id", flat=True)) == {bug.id, docs.id}
+
+    def test_closed_at_filter(self, create_issue):
+        expected = create_issue(closed_at="2020-05-01T00:00:00Z")
+        create_issue(closed_at=None)
+        query = {"closed_at_after": "2020-01-01", "closed_at_before": "2020-06-01"}
+
+        f = filters.Issue(query, models.Issue.objects.all())
+
+        assert f.qs.get().id == expected.id
+
+    def test_search_filter(self, create_issue):
+        expected = create_issue(title="Crash on startup", labels=["bug"], description="")
+        create_issue(title="Improve docs", labels=["documentation"], description="Describe the startup crash")
+        create_issue(title="Add dark theme", labels=["enhancement"], description="")
+        query = {"search": "crashes"}
+
+        f = filters.Issue(query, models.Issue.objects.all())
+
+        assert list(f.qs.values_list("id", flat=True))[0] == expected.id
+        assert f.qs.count() == 2
+
+    def test_search_vector_is_updated(self, create_issue):
+        issue = create_issue(title="Crash on startup", labels=[], description="")
+        issue.labels = ["good first issue"]
+        issue.save()
+
+        f = filters.Issue({"search": "good first"}, models.Issue.objects.all())
+
+        assert f.qs.get().id == issue.id
+
+
+class TestAddedIssueFilter:
+    def test_programming_languages_filter(self, create_repository, create_issue):
+        expected = create_issue(repository=create_repository(programming_languages={"Python": 80, "HTML": 20}))
+        create_issue(repository=create_repository(programming_languages={"Python": 20, "HTML": 80}))
+        query = {"programming_languages": "Python>=50"}
+
+        f = filters.AddedIssue(query, models.Issue.objects.all())
+
+        assert f.qs.get().id == expected.id
@@ -1,6 +1,6 @@
 import pytest
 
-from openwiden.repositories import selectors, models
+from openwiden.repositories import selectors, models, enums
 
 pytestmark = pytest.mark.django_db
 
@@ -17,3 +17,24 @@ def test_get_user_repositories(create_repository, user, org, create_member, crea
 
     assert qs.count() == len(user_repos)
     assert models.Repository.objects.count() == len(user_repos) + 1
+
+
+def test_get_programming_languages(create_repository):
+    python_repository = create_repository(
+        programming_languages={"Python": 90, "Docker": 10}, state=enums.RepositoryState.ADDED
+    )
+    create_repository(programming_languages={"Vue": 90, "Docker": 10}, state=enums.RepositoryState.ADDED)
+    create_repository(programming_languages={"Go": 100}, state=enums.RepositoryState.INITIAL)
+
+    assert list(selectors.get_programming_languages().values_list("name", "repositories_count")) == [
+        ("Docker", 2),
+        ("Python", 1),
+        ("Vue", 1),
+    ]
+
+    # Catalogue is updated with repository programming languages and state
+    python_repository.programming_languages = {"Python": 100}
+    python_repository.save()
+    models.Repository.objects.filter(programming_languages__has_key="Vue").update(state=enums.RepositoryState.REMOVED)
+
+    assert list(selectors.get_programming_languages().values_list("name", "repositories_count")) == [("Python", 1)]
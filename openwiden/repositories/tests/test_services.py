@@ -0,0 +1,174 @@
+import asyncio
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from openwiden import enums, vcs_clients
+from openwiden.organizations import models as organizations_models
+from openwiden.repositories import services, models
+from openwiden.vcs_clients.github.models import (
+    Issue as GithubIssue,
+    Repository as GithubRepository,
+    RepositoryDetails as GithubRepositoryDetails,
+    Organization as GithubOrganization,
+    Owner,
+    OwnerType,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+def create_github_issue(issue_id: int, title: str) -> GithubIssue:
+    return GithubIssue(
+        issue_id=issue_id,
+        title=title,
+        html_url=f"https://github.com/test/test/issues/{issue_id}",
+        body="",
+        state="open",
+        labels=["bug"],
+        created_at="2020-05-10T15:22:26Z",
+        updated_at="2020-05-10T15:22:26Z",
+        closed_at=None,
+    )
+
+
+def create_github_repository(repository_id: int, organization_id: int = None) -> GithubRepository:
+    if organization_id:
+        owner = Owner(login=f"org-{organization_id}", owner_id=organization_id, owner_type=OwnerType.ORGANIZATION)
+    else:
+        owner = Owner(login="user", owner_id=1, owner_type=OwnerType.USER)
+
+    return GithubRepository(
+        repository_id=repository_id,
+        name=f"repository-{repository_id}",
+        description="",
+        html_url=f"https://github.com/test/repository-{repository_id}",
+        stargazers_count=1,
+        open_issues_count=1,
+        forks_count=1,
+        created_at="2020-05-10T15:22:26Z",
+        updated_at="2020-05-10T15:22:26Z",
+        private=False,
+        owner=owner,
+    )
+
+
+def create_github_repository_details(repository_id: int, organization_id: int) -> GithubRepositoryDetails:
+    return GithubRepositoryDetails(
+        repository=create_github_repository(repository_id, organization_id=organization_id),
+        programming_languages={"Python": 100.0},
+        organization=GithubOrganization(
+            login=f"org-{organization_id}",
+            organization_id=organization_id,
+            html_url=f"https://github.com/org-{organization_id}",
+            avatar_url=f"https://avatars.githubusercontent.com/u/{organization_id}",
+            description="Organization",
+            created_at="2020-01-01T00:00:00Z",
+        ),
+    )
+
+
+def test_bulk_sync_user_repositories(create_repository, create_vcs_account):
+    vcs_account = create_vcs_account(vcs=enums.VersionControlService.GITHUB)
+    existing_repository = create_repository(vcs=enums.VersionControlService.GITHUB, remote_id=1, name="old")
+
+    with CaptureQueriesContext(connection) as few_repositories_queries:
+        created_count, updated_count = services.bulk_sync_user_repositories(
+            repositories=[create_github_repository(1), create_github_repository(2, organization_id=10)],
+            vcs_account=vcs_account,
+        )
+
+    existing_repository.refresh_from_db()
+    assert (created_count, updated_count) == (1, 1)
+    assert existing_repository.name == "repository-1"
+    assert existing_repository.owner == vcs_account
+    organization_repository = models.Repository.objects.get(vcs=enums.VersionControlService.GITHUB, remote_id=2)
+    assert organization_repository.organization.remote_id == 10
+    assert organizations_models.Member.objects.filter(
+        organization=organization_repository.organization, vcs_account=vcs_account,
+    ).exists()
+
+    # Queries count doesn't depend on the repositories count
+    repositories = [create_github_repository(i, organization_id=i % 5 + 10) for i in range(1, 50)]
+    with CaptureQueriesContext(connection) as many_repositories_queries:
+        services.bulk_sync_user_repositories(repositories=repositories, vcs_account=vcs_account)
+
+    assert len(many_repositories_queries) == len(few_repositories_queries)
+    assert models.Repository.objects.filter(organization__remote_id__in=range(10, 15)).count() == len(repositories)
+
+
+def test_bulk_sync_repository_issues(create_repository, create_issue):
+    repository = create_repository(vcs=enums.VersionControlService.GITHUB)
+    existing_issue = create_issue(repository=repository, remote_id=1)
+    issues = [create_github_issue(1, "updated"), create_github_issue(2, "new"), create_github_issue(3, "new")]
+
+    created_count, updated_count = services.bulk_sync_repository_issues(
+        repository=repository, issues=iter(issues), batch_size=2,
+    )
+
+    existing_issue.refresh_from_db()
+    assert (created_count, updated_count) == (2, 1)
+    assert existing_issue.title == "updated"
+    assert models.Issue.objects.filter(repository=repository).count() == len(issues)
+
+
+@mock.patch.object(vcs_clients.GitHubClient, "get_repository_issues")
+def test_sync_repository_issues_since_last_sync(patched_get_repository_issues, create_repository, vcs_account):
+    issues_synced_at = timezone.now() - timezone.timedelta(hours=1)
+    repository = create_repository(vcs=enums.VersionControlService.GITHUB, issues_synced_at=issues_synced_at)
+    patched_get_repository_issues.return_value = iter([create_github_issue(1, "closed")])
+
+    services.sync_repository_issues(repository=repository, vcs_account=vcs_account)
+
+    repository.refresh_from_db()
+    patched_get_repository_issues.assert_called_once_with(repository.remote_id, since=issues_synced_at)
+    assert repository.issues_synced_at > issues_synced_at
+
+
+@pytest.mark.parametrize("with_organization", [True, False])
+def test_fetch_repository_data(with_organization: bool):
+    async def request(value: str, delay: float) -> str:
+        await asyncio.sleep(delay)
+        return value
+
+    requests = [request("repository", 0.03), request("languages", 0.02)]
+
+    if with_organization:
+        requests += [request("organization", 0.01), request("membership", 0)]
+
+    result = asyncio.run(services._fetch_repository_data(*requests))
+
+    if with_organization:
+        assert result == ("repository", "languages", "organization", "membership")
+    else:
+        assert result == ("repository", "languages", None, None)
+
+
+def test_sync_github_user_repositories_details(create_vcs_account):
+    vcs_account = create_vcs_account(vcs=enums.VersionControlService.GITHUB)
+
+    with CaptureQueriesContext(connection) as few_repositories_queries:
+        services._sync_github_user_repositories_details(
+            repositories_details=[create_github_repository_details(1, organization_id=10)], vcs_account=vcs_account,
+        )
+
+    organization = organizations_models.Organization.objects.get(remote_id=10)
+    assert (organization.name, organization.description, organization.url) == (
+        "org-10",
+        "Organization",
+        "https://github.com/org-10",
+    )
+    assert "Python" in models.Repository.objects.get(remote_id=1).programming_languages
+
+    # Organizations are upserted in bulk too
+    repositories_details = [create_github_repository_details(i, organization_id=i % 5 + 10) for i in range(1, 50)]
+    with CaptureQueriesContext(connection) as many_repositories_queries:
+        services._sync_github_user_repositories_details(
+            repositories_details=repositories_details, vcs_account=vcs_account,
+        )
+
+    assert len(many_repositories_queries) == len(few_repositories_queries)
+    assert organizations_models.Organization.objects.filter(remote_id__in=range(10, 15)).count() == 5
@@ -0,0 +1,37 @@
+from unittest import mock
+
+import pytest
+from django_q.models import Schedule
+
+from openwiden.repositories import tasks, enums
+from openwiden.vcs_clients import RateLimitExceeded
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    "task, service, state",
+    [
+        pytest.param(tasks.add_repository, "add_repository", enums.RepositoryState.ADD_FAILED, id="add"),
+        pytest.param(tasks.remove_repository, "remove_repository", enums.RepositoryState.REMOVE_FAILED, id="remove"),
+    ],
+)
+@mock.patch("openwiden.repositories.tasks.users_services.send_notification")
+def test_rate_limit_exceeded(patched_send_notification, create_repository, user, task, service: str, state: str):
+    repository = create_repository(state=enums.RepositoryState.INITIAL)
+
+    with mock.patch(f"openwiden.repositories.tasks.services.{service}", side_effect=RateLimitExceeded(reset_at=0)):
+        task(repository=repository, user=user)
+
+    repository.refresh_from_db()
+    assert repository.state == state
+    message = patched_send_notification.call_args[1]["message"]
+    assert message.object_.state == state
+    assert "1970-01-01T00:00:00+00:00" in message.message
+
+
+def test_sync_added_repositories_issues_is_scheduled():
+    schedule = Schedule.objects.get(name="sync_added_repositories_issues")
+
+    assert schedule.func == "openwiden.repositories.tasks.sync_added_repositories_issues"
+    assert schedule.schedule_type == Schedule.HOURLY
@@ -3,7 +3,7 @@ from unittest import mock
 import pytest
 from rest_framework import permissions
 
-from openwiden.repositories import views, serializers, filters, models, selectors
+from openwiden.repositories import views, serializers, filters, models, selectors, pagination
 
 pytestmark = pytest.mark.django_db
 
@@ -14,6 +14,7 @@ class TestRepositoryViewSet:
 
         assert view.serializer_class == serializers.Repository
         assert view.filterset_class == filters.Repository
+        assert view.pagination_class == pagination.RepositoryPagination
         assert view.permission_classes == (permissions.AllowAny,)
         assert view.lookup_field == "id"
 
@@ -23,6 +24,19 @@ class TestIssueViewSet:
 
     def test_attrs(self):
         assert self.view_cls.serializer_class == serializers.Issue
+        assert self.view_cls.filterset_class == filters.Issue
+        assert self.view_cls.pagination_class == pagination.IssuePagination
+        assert self.view_cls.permission_classes == (permissions.AllowAny,)
+        assert self.view_cls.lookup_field == "id"
+
+
+class TestAddedIssueViewSet:
+    view_cls = views.AddedIssue
+
+    def test_attrs(self):
+        assert self.view_cls.serializer_class == serializers.AddedIssue
+        assert self.view_cls.filterset_class == filters.AddedIssue
+        assert self.view_cls.pagination_class == pagination.IssuePagination
         assert self.view_cls.permission_classes == (permissions.AllowAny,)
         assert self.view_cls.lookup_field == "id"
 
@@ -9,7 +9,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from . import serializers, filters, selectors, tasks
+from . import serializers, filters, selectors, tasks, pagination
 
 
 @method_decorator(
@@ -20,6 +20,7 @@ class Repository(viewsets.ReadOnlyModelViewSet):
     serializer_class = serializers.Repository
     queryset = selectors.get_added_repositories()
     filterset_class = filters.Repository
+    pagination_class = pagination.RepositoryPagination
     permission_classes = (permissions.AllowAny,)
     lookup_field = "id"
 
@@ -28,6 +29,8 @@ class Repository(viewsets.ReadOnlyModelViewSet):
 @method_decorator(name="retrieve", decorator=swagger_auto_schema(operation_summary="Get repository issue by id"))
 class Issue(viewsets.ReadOnlyModelViewSet):
     serializer_class = serializers.Issue
+    filterset_class = filters.Issue
+    pagination_class = pagination.IssuePagination
     permission_classes = (permissions.AllowAny,)
     lookup_field = "id"
 
@@ -36,6 +39,19 @@ class Issue(viewsets.ReadOnlyModelViewSet):
         return repository.issues.all()
 
 
+@method_decorator(
+    name="list", decorator=swagger_auto_schema(operation_summary="Get issues list of all added repositories"),
+)
+@method_decorator(name="retrieve", decorator=swagger_auto_schema(operation_summary="Get issue by id"))
+class AddedIssue(viewsets.ReadOnlyModelViewSet):
+    serializer_class = serializers.AddedIssue
+    queryset = selectors.get_added_repositories_issues()
+    filterset_class = filters.AddedIssue
+    pagination_class = pagination.IssuePagination
+    permission_classes = (permissions.AllowAny,)
+    lookup_field = "id"
+
+
 @method_decorator(name="list", decorator=swagger_auto_schema(operation_summary="Get user repositories list"))
 @method_decorator(name="retrieve", decorator=swagger_auto_schema(operation_summary="Get user repository by id"))
 @method_decorator(
@@ -77,16 +93,43 @@ class UserRepositories(viewsets.ReadOnlyModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+PROGRAMMING_LANGUAGE_NAME_SCHEMA = openapi.Schema(type=openapi.TYPE_STRING, example="Python")
+PROGRAMMING_LANGUAGE_WITH_COUNT_SCHEMA = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "name": openapi.Schema(type=openapi.TYPE_STRING, example="Python"),
+        "repositories_count": openapi.Schema(type=openapi.TYPE_INTEGER, example=10),
+    },
+)
+
+
 @method_decorator(name="get", decorator=cache_page(60))
 @method_decorator(
     name="get",
     decorator=swagger_auto_schema(
         operation_summary="Get a list of all programming languages from the added repositories",
+        operation_description="Languages are returned with repositories count, if with_counts is true.",
+        manual_parameters=[
+            openapi.Parameter(
+                "with_counts",
+                openapi.IN_QUERY,
+                description="Return repositories count for each programming language",
+                type=openapi.TYPE_BOOLEAN,
+            ),
+        ],
         responses={
-            status.HTTP_200_OK: openapi.Schema(
-                type=openapi.TYPE_ARRAY,
-                items=openapi.Schema(type=openapi.TYPE_STRING, example="Python"),
-                example=["Python", "Vue"],
+            status.HTTP_200_OK: openapi.Response(
+                description="Programming languages names. If with_counts is true, programming languages "
+                "with repositories count are returned instead, as described by x-withCounts.",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=PROGRAMMING_LANGUAGE_NAME_SCHEMA, example=["Python", "Vue"],
+                ),
+                # Swagger 2.0 has no oneOf, so the second response shape is added as the vendor extension
+                x_with_counts=openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=PROGRAMMING_LANGUAGE_WITH_COUNT_SCHEMA,
+                    example=[{"name": "Python", "repositories_count": 10}, {"name": "Vue", "repositories_count": 2}],
+                ),
             ),
         },
     ),
@@ -95,7 +138,12 @@ class ProgrammingLanguagesView(APIView):
     permission_classes = (permissions.AllowAny,)
 
     def get(self, request: Request) -> Response:
-        return Response(selectors.get_programming_languages())
+        programming_languages = selectors.get_programming_languages()
+
+        if request.query_params.get("with_counts", "").lower() in ("1", "true"):
+            return Response(serializers.ProgrammingLanguage(programming_languages, many=True).data)
+
+        return Response(programming_languages.values_list("name", flat=True))
 
 
 programming_languages_view = ProgrammingLanguagesView.as_view()
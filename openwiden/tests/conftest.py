@@ -8,8 +8,16 @@ from django.utils import timezone
 
 @pytest.fixture()
 def create_mock_response():
-    def _create_mock_response(data: Union[list, dict] = None, status_code: int = 200, **kwargs) -> mock.MagicMock:
-        return mock.MagicMock(json=mock.MagicMock(return_value=deepcopy(data)), status_code=status_code, **kwargs)
+    def _create_mock_response(
+        data: Union[list, dict] = None, status_code: int = 200, headers: dict = None, links: dict = None, **kwargs
+    ) -> mock.MagicMock:
+        return mock.MagicMock(
+            json=mock.MagicMock(return_value=deepcopy(data)),
+            status_code=status_code,
+            headers=headers or {},
+            links=links or {},
+            **kwargs,
+        )
 
     return _create_mock_response
 
@@ -5,6 +5,8 @@ from django.urls import reverse
 from rest_framework import status
 
 from openwiden.enums import VersionControlService
+from openwiden.repositories import models as repo_models
+from .test_vcs_clients_github_graphql import create_graphql_repository
 
 
 @pytest.mark.functional
@@ -65,6 +67,54 @@ def test_github(
     assert response.data == {"detail": "ok"}
 
 
+@pytest.mark.functional
+@pytest.mark.django_db
+@mock.patch("requests.sessions.Session.request")
+@pytest.mark.parametrize("is_organization_repository", [True, False])
+def test_github_graphql(
+    mock_request,
+    settings,
+    user,
+    create_api_client,
+    create_vcs_account,
+    create_repository,
+    create_mock_response,
+    github_webhook_create_json,
+    github_user_membership_for_organization_json,
+    is_organization_repository: bool,
+):
+    settings.VCS_CLIENTS_GITHUB_GRAPHQL_ENABLED = True
+    api_client = create_api_client(user=user)
+    vcs_account = create_vcs_account(user=user, vcs=VersionControlService.GITHUB)
+    repository = create_repository(
+        vcs=VersionControlService.GITHUB,
+        owner=vcs_account,
+        organization=None,
+        remote_id=1,
+        url="https://github.com/test/repository-1",
+        issues_synced_at=None,
+    )
+    # Repository, programming languages, organization and open issues are fetched by one query
+    graphql_data = create_graphql_repository(1, is_organization=is_organization_repository)
+    mock_responses = [create_mock_response({"data": {"repository": graphql_data}})]
+
+    if is_organization_repository:
+        mock_responses.append(create_mock_response(github_user_membership_for_organization_json))
+
+    mock_responses.append(create_mock_response(github_webhook_create_json))
+    mock_request.side_effect = mock_responses
+
+    response = api_client.post(reverse("api-v1:user-repository-add", kwargs={"id": str(repository.id)}))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert mock_request.call_count == len(mock_responses)
+    assert mock_request.call_args_list[0][1]["json"]["variables"]["owner"] == "test"
+    repository.refresh_from_db()
+    assert set(repository.programming_languages) == {"Python", "HTML"}
+    assert repository.issues_synced_at is not None
+    assert list(repo_models.Issue.objects.filter(repository=repository).values_list("remote_id", flat=True)) == [10]
+
+
 @pytest.mark.functional
 @pytest.mark.django_db
 @mock.patch("requests.sessions.Session.request")
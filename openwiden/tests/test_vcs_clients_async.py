@@ -0,0 +1,96 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from openwiden import vcs_clients
+from openwiden.enums import VersionControlService
+from openwiden.users import models, services
+from openwiden.vcs_clients import async_client
+
+pytestmark = [pytest.mark.functional, pytest.mark.django_db]
+
+
+@pytest.fixture()
+def concurrent_executor(settings):
+    """
+    Pool with more than one thread, so the requests of the client are really made concurrently.
+    """
+    settings.VCS_CLIENTS_ASYNC_MAX_WORKERS = 2
+
+    with mock.patch.object(async_client, "_executor", None):
+        yield async_client._get_executor()
+        async_client._get_executor().shutdown()
+
+
+def test_token_is_read_on_the_calling_thread(create_vcs_account):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB)
+    github_client = vcs_clients.AsyncGitHubClient(vcs_account)
+    models.VCSAccount.objects.filter(id=vcs_account.id).update(access_token="new")
+    services.invalidate_token_provider(vcs_account_id=vcs_account.id)
+
+    # Pool threads use the token read on the client creation instead of the DB
+    assert github_client.sync_client._get_token() == vcs_account.to_token()
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_expiring_token_is_refreshed_on_the_calling_thread(mock_request, create_vcs_account, create_mock_response):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITLAB, expires_at=int(time.time()) + 10)
+    mock_request.return_value = create_mock_response(
+        dict(access_token="new", refresh_token="new refresh", token_type="Bearer", expires_in=7200)
+    )
+
+    gitlab_client = vcs_clients.AsyncGitlabClient(vcs_account)
+
+    # New token is saved and used by the pool threads, so they do not refresh it again
+    assert mock_request.call_args[0][:2] == ("POST", "https://gitlab.com/oauth/token")
+    vcs_account.refresh_from_db()
+    assert vcs_account.access_token == "new"
+    assert gitlab_client.sync_client._get_token() == vcs_account.to_token()
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_repository_add_requests_are_concurrent(
+    mock_request,
+    concurrent_executor,
+    user,
+    create_api_client,
+    create_vcs_account,
+    create_repository,
+    create_mock_response,
+    github_repository_json,
+    github_repository_languages_json,
+    github_repository_issues_json,
+    github_webhook_create_json,
+):
+    api_client = create_api_client(user=user)
+    vcs_account = create_vcs_account(user=user, vcs=VersionControlService.GITHUB)
+    repository = create_repository(vcs=VersionControlService.GITHUB, owner=vcs_account, organization=None)
+    # Repository and its languages requests wait for each other, so they fail if they are made one by one
+    barrier = threading.Barrier(2, timeout=5)
+    threads = set()
+
+    def request(method, url, **kwargs):
+        if url.endswith("/languages"):
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return create_mock_response(github_repository_languages_json)
+        elif url.endswith("/issues"):
+            return create_mock_response(github_repository_issues_json)
+        elif url.endswith("/hooks"):
+            return create_mock_response(github_webhook_create_json)
+        else:
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return create_mock_response(github_repository_json)
+
+    mock_request.side_effect = request
+
+    response = api_client.post(reverse("api-v1:user-repository-add", kwargs={"id": str(repository.id)}))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(threads) == 2
+    assert mock_request.call_count == 4
@@ -0,0 +1,140 @@
+from unittest import mock
+
+import pytest
+
+from openwiden import vcs_clients
+from openwiden.enums import VersionControlService
+
+pytestmark = [pytest.mark.functional, pytest.mark.django_db]
+
+
+def create_graphql_repository(repository_id: int, is_archived: bool = False, is_organization: bool = False) -> dict:
+    owner = {"__typename": "User", "login": "stefanitsky", "databaseId": 1}
+
+    if is_organization:
+        owner = {
+            "__typename": "Organization",
+            "login": "OpenWiden",
+            "databaseId": 2,
+            "url": "https://github.com/OpenWiden",
+            "avatarUrl": "https://avatars.githubusercontent.com/u/2",
+            "description": "",
+            "createdAt": "2020-01-01T00:00:00Z",
+        }
+
+    return {
+        "databaseId": repository_id,
+        "name": f"repository-{repository_id}",
+        "description": None,
+        "url": f"https://github.com/test/repository-{repository_id}",
+        "stargazerCount": 1,
+        "forkCount": 2,
+        "createdAt": "2020-01-01T00:00:00Z",
+        "updatedAt": "2020-01-02T00:00:00Z",
+        "isPrivate": False,
+        "isArchived": is_archived,
+        "openIssues": {"totalCount": 1},
+        "owner": owner,
+        "languages": {"edges": [{"size": 300, "node": {"name": "Python"}}, {"size": 100, "node": {"name": "HTML"}}]},
+        "issues": {
+            "pageInfo": {"hasNextPage": False},
+            "nodes": [
+                {
+                    "databaseId": 10,
+                    "title": "Bug",
+                    "url": f"https://github.com/test/repository-{repository_id}/issues/1",
+                    "body": "",
+                    "state": "OPEN",
+                    "createdAt": "2020-01-01T00:00:00Z",
+                    "updatedAt": "2020-01-02T00:00:00Z",
+                    "closedAt": None,
+                    "labels": {"nodes": [{"name": "bug"}]},
+                },
+            ],
+        },
+    }
+
+
+def create_graphql_response(create_mock_response, repositories: list, end_cursor: str = None):
+    page_info = {"hasNextPage": end_cursor is not None, "endCursor": end_cursor}
+    data = {"data": {"viewer": {"repositories": {"pageInfo": page_info, "nodes": repositories}}}}
+    return create_mock_response(data)
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_get_user_repositories_details(mock_request, create_vcs_account, create_mock_response):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB, expires_at=None)
+    mock_request.side_effect = [
+        create_graphql_response(
+            create_mock_response,
+            [create_graphql_repository(1), create_graphql_repository(2, is_archived=True)],
+            end_cursor="cursor",
+        ),
+        create_graphql_response(create_mock_response, [create_graphql_repository(3, is_organization=True)]),
+    ]
+
+    repositories_details = list(
+        vcs_clients.GitHubClient(vcs_account).get_user_repositories_details(batch_size=2, issues_count=10)
+    )
+
+    assert mock_request.call_count == 2
+    assert mock_request.call_args_list[0][1]["json"]["variables"] == {
+        "first": 2,
+        "after": None,
+        "withIssues": True,
+        "issuesCount": 10,
+    }
+    assert mock_request.call_args_list[1][1]["json"]["variables"]["after"] == "cursor"
+
+    # Archived repositories are skipped
+    assert [details.repository.repository_id for details in repositories_details] == [1, 3]
+
+    user_repository, organization_repository = repositories_details
+    assert user_repository.programming_languages == {"Python": 75.0, "HTML": 25.0}
+    assert user_repository.organization is None
+    assert organization_repository.organization.organization_id == 2
+    assert organization_repository.repository.owner.owner_type == "Organization"
+    assert [(issue.issue_id, issue.state, issue.labels) for issue in user_repository.issues] == [(10, "open", ["bug"])]
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_get_user_repositories_details_errors(mock_request, create_vcs_account, create_mock_response):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB, expires_at=None)
+    mock_request.return_value = create_mock_response({"errors": [{"message": "Something went wrong"}]})
+
+    with pytest.raises(ValueError):
+        list(vcs_clients.GitHubClient(vcs_account).get_user_repositories_details())
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_get_repository_details(mock_request, create_vcs_account, create_mock_response):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB, expires_at=None)
+    data = create_graphql_repository(1, is_organization=True)
+    data["issues"]["pageInfo"]["hasNextPage"] = True
+    mock_request.return_value = create_mock_response({"data": {"repository": data}})
+
+    repository_details = vcs_clients.GitHubClient(vcs_account).get_repository_details(
+        owner="test", name="repository-1", issues_count=10
+    )
+
+    assert mock_request.call_count == 1
+    assert mock_request.call_args[1]["json"]["variables"] == {
+        "owner": "test",
+        "name": "repository-1",
+        "withIssues": True,
+        "issuesCount": 10,
+    }
+    assert repository_details.repository.repository_id == 1
+    assert repository_details.programming_languages == {"Python": 75.0, "HTML": 25.0}
+    assert repository_details.organization.organization_id == 2
+    assert [issue.issue_id for issue in repository_details.issues] == [10]
+    assert repository_details.has_more_issues is True
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_get_repository_details_not_found(mock_request, create_vcs_account, create_mock_response):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB, expires_at=None)
+    mock_request.return_value = create_mock_response({"data": {"repository": None}})
+
+    with pytest.raises(ValueError):
+        vcs_clients.GitHubClient(vcs_account).get_repository_details(owner="test", name="repository-1")
@@ -0,0 +1,51 @@
+from unittest import mock
+
+import pytest
+
+from openwiden import vcs_clients
+from openwiden.enums import VersionControlService
+
+pytestmark = [pytest.mark.functional, pytest.mark.django_db]
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_github_get_repository_issues(
+    mock_request, create_vcs_account, create_mock_response, github_repository_issues_json,
+):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB, expires_at=None)
+    next_page_url = "https://api.github.com/repositories/1/issues?state=open&per_page=100&page=2"
+    mock_request.side_effect = [
+        create_mock_response(github_repository_issues_json, links={"next": {"url": next_page_url}}),
+        create_mock_response(github_repository_issues_json),
+    ]
+
+    issues = vcs_clients.GitHubClient(vcs_account).get_repository_issues(1)
+
+    # Nothing is requested until issues are consumed
+    assert mock_request.call_count == 0
+
+    issues = list(issues)
+    expected_issues = [issue for issue in github_repository_issues_json if "pull_request" not in issue]
+
+    assert mock_request.call_count == 2
+    assert mock_request.call_args_list[0][1]["params"] == {"state": "open", "per_page": 100}
+    assert mock_request.call_args_list[1][0][1] == next_page_url
+    assert len(issues) == len(expected_issues) * 2
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_gitlab_get_repository_issues(
+    mock_request, create_vcs_account, create_mock_response, gitlab_repository_issues_json,
+):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITLAB, expires_at=None)
+    mock_request.side_effect = [
+        create_mock_response(gitlab_repository_issues_json, headers={"X-Next-Page": "2"}),
+        create_mock_response(gitlab_repository_issues_json, headers={"X-Next-Page": ""}),
+    ]
+
+    issues = list(vcs_clients.GitlabClient(vcs_account).get_repository_issues(1))
+
+    assert mock_request.call_count == 2
+    assert mock_request.call_args_list[0][1]["params"] == {"state": "opened", "per_page": 100}
+    assert mock_request.call_args_list[1][1]["params"] == {"state": "opened", "per_page": 100, "page": "2"}
+    assert len(issues) == len(gitlab_repository_issues_json) * 2
@@ -0,0 +1,70 @@
+import time
+from unittest import mock
+
+import pytest
+
+from openwiden import vcs_clients
+from openwiden.enums import VersionControlService
+from openwiden.vcs_clients import rate_limit
+
+pytestmark = [pytest.mark.functional, pytest.mark.django_db]
+
+
+@pytest.fixture()
+def github_client(create_vcs_account) -> vcs_clients.GitHubClient:
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB, expires_at=None)
+    client = vcs_clients.GitHubClient(vcs_account)
+    client.rate_limit._redis.delete(client.rate_limit.key)
+    return client
+
+
+def create_rate_limit_headers(remaining: int, reset_at: int) -> dict:
+    return {"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset_at)}
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_budget_is_updated_from_response(mock_request, github_client, create_mock_response, github_organization_json):
+    reset_at = int(time.time()) + 3600
+    mock_request.return_value = create_mock_response(
+        github_organization_json, headers=create_rate_limit_headers(4999, reset_at)
+    )
+
+    github_client.get_organization(1)
+
+    budget = github_client.rate_limit.get_budget()
+    assert (budget.limit, budget.remaining, budget.reset_at) == (5000, 4999, reset_at)
+    assert budget.vcs_account_id in [b.vcs_account_id for b in rate_limit.get_budgets()]
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_request_is_deferred_when_budget_is_exhausted(
+    mock_request, github_client, create_mock_response, github_organization_json, settings,
+):
+    reset_at = int(time.time()) + 3600
+    mock_request.return_value = create_mock_response(
+        github_organization_json, headers=create_rate_limit_headers(settings.VCS_CLIENTS_RATE_LIMIT_RESERVE, reset_at)
+    )
+    github_client.get_organization(1)
+
+    with pytest.raises(vcs_clients.RateLimitExceeded) as e:
+        github_client.get_organization(1)
+
+    assert e.value.reset_at == reset_at
+    assert mock_request.call_count == 1
+
+
+def test_acquire_does_not_spend_the_reserve(github_client, settings):
+    reset_at = int(time.time()) + 3600
+    github_client.rate_limit._redis.hset(
+        github_client.rate_limit.key,
+        mapping=dict(limit=5000, remaining=settings.VCS_CLIENTS_RATE_LIMIT_RESERVE + 2, reset_at=reset_at),
+    )
+
+    github_client.rate_limit.acquire()
+    github_client.rate_limit.acquire()
+
+    with pytest.raises(vcs_clients.RateLimitExceeded):
+        github_client.rate_limit.acquire()
+
+    # Rejected request is given back to the budget
+    assert github_client.rate_limit.get_budget().remaining == settings.VCS_CLIENTS_RATE_LIMIT_RESERVE
@@ -0,0 +1,58 @@
+import json
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+
+from openwiden import vcs_clients
+from openwiden.enums import VersionControlService
+from openwiden.vcs_clients.response_cache import ResponseCache, CachedResponse
+
+pytestmark = [pytest.mark.functional, pytest.mark.django_db]
+
+
+@mock.patch("requests.sessions.Session.request")
+def test_not_modified_response_is_served_from_cache(
+    mock_request, create_vcs_account, create_mock_response, github_repository_languages_json, settings,
+):
+    settings.VCS_CLIENTS_RESPONSE_CACHE_ENABLED = True
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITHUB, expires_at=None)
+    github_client = vcs_clients.GitHubClient(vcs_account)
+    github_client.response_cache._redis.delete(github_client.response_cache._get_key("repositories/1/languages"))
+    mock_request.side_effect = [
+        create_mock_response(
+            github_repository_languages_json,
+            headers={"ETag": '"etag"'},
+            text=json.dumps(github_repository_languages_json),
+        ),
+        create_mock_response(status_code=304),
+    ]
+
+    languages = github_client.get_repository_languages(1)
+    cached_languages = github_client.get_repository_languages(1)
+
+    assert cached_languages == languages
+    assert mock_request.call_args_list[0][1]["headers"] == {}
+    assert mock_request.call_args_list[1][1]["headers"] == {"If-None-Match": '"etag"'}
+
+
+def test_least_recently_used_responses_are_evicted(create_mock_response, settings):
+    response = create_mock_response(headers={"ETag": '"etag"'}, text="x" * 100)
+    settings.VCS_CLIENTS_RESPONSE_CACHE_MAX_SIZE = 2 * len(CachedResponse.from_response(response).dumps())
+    response_cache = ResponseCache(scope=f"test:{uuid4()}")
+
+    response_cache.set("first", response)
+    response_cache.set("second", response)
+    # Expired response is not counted in the total size
+    response_cache._redis.delete(response_cache._get_key("second"))
+    response_cache.set("third", response)
+    assert response_cache.get("first") is not None
+
+    response_cache.set("fourth", response)
+
+    assert response_cache.get("first") is not None
+    assert response_cache.get("third") is None
+    assert set(response_cache._redis.hkeys(response_cache._sizes_key)) == {
+        response_cache._get_key("first").encode(),
+        response_cache._get_key("fourth").encode(),
+    }
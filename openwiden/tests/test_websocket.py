@@ -1,4 +1,5 @@
 import asyncio
+import json
 import os
 
 import pytest
@@ -9,6 +10,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from websockets.protocol import State
 
 from config.websocket import WebsocketApplication
+from openwiden.users import services as users_services
 
 
 pytestmark = [pytest.mark.functional, pytest.mark.django_db, pytest.mark.asyncio]
@@ -96,6 +98,18 @@ async def test_parse_access_token_from_query_string(create_websocket_app, query_
     assert await websocket_app.receive_output() == {"type": "websocket.close"}
 
 
+async def test_access_token_with_another_param_name(create_websocket_app, create_user, create_access_token, cache):
+    user = await create_user()
+    access_token = await create_access_token(user)
+    websocket_app = create_websocket_app(f"token={access_token}")
+
+    await websocket_app.send_input({"type": "websocket.connect"})
+    assert await websocket_app.receive_output() == {"type": "websocket.accept"}
+
+    await websocket_app.send_input({"type": "websocket.disconnect", "code": 1000})
+    await websocket_app.wait(timeout=1)
+
+
 async def test_user_not_found(create_websocket_app, create_user, create_access_token):
     user = await create_user()
     access_token = await create_access_token(user)
@@ -119,6 +133,25 @@ async def test_user_is_inactive(create_websocket_app, create_user, create_access
     assert await websocket_app.receive_output() == {"type": "websocket.close"}
 
 
+async def test_user_deactivated_after_connect(create_websocket_app, create_user, create_access_token, cache):
+    user = await create_user()
+    access_token = await create_access_token(user)
+    websocket_app = create_websocket_app(f"access_token={access_token}")
+    await websocket_app.send_input({"type": "websocket.connect"})
+    assert await websocket_app.receive_output() == {"type": "websocket.accept"}
+    await websocket_app.send_input({"type": "websocket.disconnect", "code": 1000})
+    await websocket_app.wait(timeout=1)
+
+    # Cached active status is invalidated on the user save
+    user.is_active = False
+    await sync_to_async(user.save)()
+    websocket_app = create_websocket_app(f"access_token={access_token}")
+
+    await websocket_app.send_input({"type": "websocket.connect"})
+
+    assert await websocket_app.receive_output() == {"type": "websocket.close"}
+
+
 async def test_success(
     create_user, create_access_token, cache, redis, create_websocket_app,
 ):
@@ -139,3 +172,84 @@ async def test_success(
     # Test message receive
     websocket_app.output_queue.state = State.OPEN
     assert await websocket_app.receive_output() == {"bytes": b"test message", "type": "websocket.send"}
+
+
+async def test_connections_share_pubsub_subscription(
+    create_user, create_access_token, cache, redis, create_websocket_app,
+):
+    user = await create_user()
+    access_token = await create_access_token(user)
+    websocket_apps = [create_websocket_app(f"access_token={access_token}") for _ in range(2)]
+
+    for websocket_app in websocket_apps:
+        await websocket_app.send_input({"type": "websocket.connect"})
+        assert await websocket_app.receive_output() == {"type": "websocket.accept"}
+        websocket_app.output_queue.state = State.OPEN
+
+    # One subscription of the process for all user connections
+    assert redis.pubsub_numsub(str(user.id)) == [(str(user.id).encode(), 1)]
+
+    redis.publish(str(user.id), "test message")
+
+    for websocket_app in websocket_apps:
+        assert await websocket_app.receive_output() == {"bytes": b"test message", "type": "websocket.send"}
+
+
+async def test_disconnect(create_user, create_access_token, cache, redis, create_websocket_app):
+    user = await create_user()
+    access_token = await create_access_token(user)
+    websocket_app = create_websocket_app(f"access_token={access_token}")
+    await websocket_app.send_input({"type": "websocket.connect"})
+    assert await websocket_app.receive_output() == {"type": "websocket.accept"}
+
+    await websocket_app.send_input({"type": "websocket.disconnect", "code": 1000})
+
+    # Handler returns without polling and the user channel is unsubscribed
+    await websocket_app.wait(timeout=1)
+    assert redis.pubsub_numsub(str(user.id)) == [(str(user.id).encode(), 0)]
+
+
+async def test_missed_notifications_replay(create_user, create_access_token, cache, redis, create_websocket_app):
+    user = await create_user()
+    access_token = await create_access_token(user)
+    send_notification = sync_to_async(users_services.send_notification)
+
+    for i in range(3):
+        await send_notification(user=user, message=users_services.WebsocketMessage(message=str(i)))
+
+    key = users_services.get_notifications_key(user_id=str(user.id))
+    (last_id, _), *_ = redis.xrange(key)
+    websocket_app = create_websocket_app(f"access_token={access_token}&last_id={last_id.decode()}")
+
+    await websocket_app.send_input({"type": "websocket.connect"})
+    assert await websocket_app.receive_output() == {"type": "websocket.accept"}
+
+    # Only notifications after the last seen are sent
+    replayed = [json.loads((await websocket_app.receive_output())["bytes"]) for _ in range(2)]
+    assert [notification["message"] for notification in replayed] == ["1", "2"]
+    assert await websocket_app.receive_nothing()
+
+
+async def test_connections_are_closed_on_pubsub_connection_loss(
+    create_user, create_access_token, cache, redis, create_websocket_app,
+):
+    user = await create_user()
+    access_token = await create_access_token(user)
+    websocket_app = create_websocket_app(f"access_token={access_token}")
+    await websocket_app.send_input({"type": "websocket.connect"})
+    assert await websocket_app.receive_output() == {"type": "websocket.accept"}
+
+    # Subscriptions are lost with the connection, so the client is asked to reconnect
+    redis.client_kill_filter(_type="pubsub")
+    assert await websocket_app.receive_output() == {"type": "websocket.close"}
+    await websocket_app.wait(timeout=1)
+
+    # Channel is subscribed again by the new connection
+    websocket_app = create_websocket_app(f"access_token={access_token}")
+    await websocket_app.send_input({"type": "websocket.connect"})
+    assert await websocket_app.receive_output() == {"type": "websocket.accept"}
+    websocket_app.output_queue.state = State.OPEN
+
+    redis.publish(str(user.id), "test message")
+
+    assert await websocket_app.receive_output() == {"bytes": b"test message", "type": "websocket.send"}
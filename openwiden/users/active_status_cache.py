@@ -0,0 +1,62 @@
+from logging import getLogger
+from typing import Optional, Callable
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+log = getLogger(__name__)
+
+KEY_PREFIX = "user_is_active"
+# Cached values of the active, inactive and not existing users
+ACTIVE, INACTIVE, MISSING = b"1", b"0", b""
+
+
+def get_key(user_id: str) -> str:
+    return f"{KEY_PREFIX}:{user_id}"
+
+
+def decode(value: bytes) -> Optional[bool]:
+    return None if value == MISSING else value == ACTIVE
+
+
+def encode(is_active: Optional[bool]) -> bytes:
+    if is_active is None:
+        return MISSING
+    return ACTIVE if is_active else INACTIVE
+
+
+def get_is_active(user_id: str, *, load: Callable[[str], Optional[bool]]) -> Optional[bool]:
+    """
+    Read-through cache of the users active status with the short TTL.
+    Returns None for not existing users, database is used directly, if Redis is not available.
+    """
+    key = get_key(user_id)
+    redis = get_redis_connection()
+
+    try:
+        cached = redis.get(key)
+    except RedisError as e:
+        log.error(f"[User active status cache] get skipped for {user_id}: {e}")
+        return load(user_id)
+
+    if cached is not None:
+        return decode(cached)
+
+    is_active = load(user_id)
+    set_is_active(user_id, is_active)
+    return is_active
+
+
+def set_is_active(user_id: str, is_active: Optional[bool]) -> None:
+    try:
+        get_redis_connection().set(get_key(user_id), encode(is_active), ex=settings.USERS_ACTIVE_STATUS_CACHE_TTL)
+    except RedisError as e:
+        log.error(f"[User active status cache] set skipped for {user_id}: {e}")
+
+
+def invalidate(user_id: str) -> None:
+    try:
+        get_redis_connection().delete(get_key(user_id))
+    except RedisError as e:
+        log.error(f"[User active status cache] invalidation failed for {user_id}: {e}")
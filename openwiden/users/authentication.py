@@ -0,0 +1,46 @@
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import authentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from . import models, selectors
+
+
+class LazyUser(SimpleLazyObject):
+    """
+    Authenticated user, that is loaded from the database on the first access to attributes
+    other than the id and the authentication flags.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+
+def get_lazy_user(user_id: str) -> LazyUser:
+    user = LazyUser(lambda: models.User.objects.get(id=user_id))
+    # Set directly, because lazy object sets attributes of the loaded user
+    user.__dict__["id"] = user.__dict__["pk"] = models.User._meta.pk.to_python(user_id)
+    return user
+
+
+class JWTAuthentication(authentication.JWTAuthentication):
+    """
+    JWT authentication by the cached user active status instead of the user lookup on every request.
+    """
+
+    def get_user(self, validated_token) -> LazyUser:
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        is_active = selectors.is_user_active(user_id=user_id)
+
+        if is_active is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return get_lazy_user(user_id)
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import ExitStack
+from typing import Dict, List, Optional
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.websocket import pubsub_multiplexer
+from openwiden.users import models, services, active_status_cache
+
+USERNAME_PREFIX = "websocket-benchmark-"
+
+
+class Connection:
+    """
+    Websocket connection to the ASGI application, that is driven in-process by the ASGI events queues.
+    """
+
+    def __init__(self, application, access_token: str) -> None:
+        self.input_queue = asyncio.Queue()
+        self.output_queue = asyncio.Queue()
+        scope = {"type": "websocket", "query_string": f"access_token={access_token}".encode()}
+        self.task = asyncio.ensure_future(application(scope, self.input_queue.get, self.output_queue.put))
+
+    async def connect(self) -> None:
+        await self.input_queue.put({"type": "websocket.connect"})
+        event = await self.output_queue.get()
+
+        if event["type"] != "websocket.accept":
+            raise CommandError(f"websocket connection is not accepted: {event}")
+
+    async def disconnect(self) -> None:
+        await self.input_queue.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+class Benchmark:
+    def __init__(self, application, users: List[models.User], messages: int, idle_seconds: float) -> None:
+        self.application = application
+        self.users = users
+        self.messages = messages
+        self.idle_seconds = idle_seconds
+        self.connections: List[Connection] = []
+        self.user_connections: Dict[str, List[Connection]] = {str(user.id): [] for user in users}
+        self.access_tokens = {str(user.id): str(AccessToken.for_user(user)) for user in users}
+
+    async def open_connections(self, count: int) -> None:
+        for i in range(len(self.connections), count):
+            user_id = str(self.users[i % len(self.users)].id)
+            connection = Connection(self.application, self.access_tokens[user_id])
+            await connection.connect()
+            self.connections.append(connection)
+            self.user_connections[user_id].append(connection)
+
+    async def close_connections(self) -> None:
+        await asyncio.gather(*(connection.disconnect() for connection in self.connections))
+
+    async def measure_idle_cpu(self) -> float:
+        """
+        Returns CPU time in microseconds per second per idle connection.
+        """
+        started_at = time.process_time()
+        await asyncio.sleep(self.idle_seconds)
+        return (time.process_time() - started_at) / self.idle_seconds / len(self.connections) * 10 ** 6
+
+    async def _receive(self, connection: Connection, sent_at: Dict[int, float], latencies: List[float]) -> None:
+        while True:
+            event = await connection.output_queue.get()
+            message = json.loads(event["bytes"])
+            latencies.append(time.perf_counter() - sent_at[int(message["message"])])
+
+    async def measure_latencies(self, timeout: float = 30) -> List[float]:
+        """
+        Publishes messages to the users round-robin through the notifications service
+        and returns sorted delivery latencies of all connections in milliseconds.
+        """
+        sent_at: Dict[int, float] = {}
+        latencies: List[float] = []
+        expected = 0
+        receivers = [
+            asyncio.ensure_future(self._receive(connection, sent_at, latencies)) for connection in self.connections
+        ]
+        try:
+            for i in range(self.messages):
+                user = self.users[i % len(self.users)]
+                expected += len(self.user_connections[str(user.id)])
+                sent_at[i] = time.perf_counter()
+                services.send_notification(user=user, message=services.WebsocketMessage(message=str(i)))
+                # Let connections receive the published messages, as the other process would publish them
+                await asyncio.sleep(0)
+
+            deadline = time.perf_counter() + timeout
+            while len(latencies) < expected and time.perf_counter() < deadline:
+                await asyncio.sleep(0.01)
+        finally:
+            for receiver in receivers:
+                receiver.cancel()
+
+        if len(latencies) < expected:
+            raise CommandError(f"{expected - len(latencies)} of {expected} messages are not delivered in {timeout}s")
+
+        return sorted(latency * 1000 for latency in latencies)
+
+
+def percentile(values: List[float], percent: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Opens authenticated websocket connections to the ASGI application in steps, publishes notifications "
+        "and reports delivery latency percentiles, memory and idle CPU per connection "
+        "and the maximum connections count within the latency and memory limits."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--connections", type=int, default=100, help="Connections count of the first step.")
+        parser.add_argument("--max-connections", type=int, default=1600, help="Connections count of the last step.")
+        parser.add_argument("--users", type=int, default=100, help="Benchmark users count.")
+        parser.add_argument("--messages", type=int, default=200, help="Notifications count per step.")
+        parser.add_argument("--idle-seconds", type=float, default=5, help="Idle CPU measurement duration.")
+        parser.add_argument("--latency-limit", type=float, default=100, help="Max p99 delivery latency in ms.")
+        parser.add_argument("--memory-limit", type=float, default=512, help="Max connections memory in MB.")
+        parser.add_argument(
+            "--soak-seconds", type=float, default=0, help="Repeat the last passed step measurements for the duration."
+        )
+        parser.add_argument("--redis", action="store_true", help="Use the configured Redis instead of fakeredis.")
+
+    def handle(self, *args, **options) -> None:
+        # Imported here, because ASGI application setup reconfigures logging
+        from config.asgi import application
+
+        with ExitStack() as stack:
+            if not options["redis"]:
+                self._use_fake_redis(stack)
+
+            users = self._create_users(options["users"])
+            stack.callback(self._delete_users)
+
+            asyncio.get_event_loop().run_until_complete(self._run(application, users, options))
+
+    def _use_fake_redis(self, stack: ExitStack) -> None:
+        try:
+            import fakeredis
+            from fakeredis import aioredis as fake_aioredis
+        except ImportError:
+            raise CommandError("fakeredis is required to run without Redis, install local requirements or use --redis")
+
+        # Streams are not supported by fakeredis, so notifications are only published without the replay stream
+        services_log = logging.getLogger(services.__name__)
+        stack.enter_context(mock.patch.object(services_log, "disabled", True))
+
+        # Sync and asyncio clients share the server, so the cached users active status is read on connect
+        server = fakeredis.FakeServer()
+        redis = fakeredis.FakeRedis(server=server)
+        for module in (services, active_status_cache):
+            stack.enter_context(mock.patch.object(module, "get_redis_connection", return_value=redis))
+        stack.enter_context(
+            mock.patch.object(pubsub_multiplexer, "_create_redis", lambda: fake_aioredis.create_redis(server))
+        )
+
+    @staticmethod
+    def _create_users(count: int) -> List[models.User]:
+        return models.User.objects.bulk_create(
+            [models.User(username=f"{USERNAME_PREFIX}{i}", is_active=True) for i in range(count)]
+        )
+
+    @staticmethod
+    def _delete_users() -> None:
+        models.User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+
+    async def _run(self, application, users: List[models.User], options: dict) -> None:
+        benchmark = Benchmark(application, users, options["messages"], options["idle_seconds"])
+        max_connections: Optional[int] = None
+        connections = options["connections"]
+        tracemalloc.start()
+        base_memory = tracemalloc.get_traced_memory()[0]
+
+        try:
+            while connections <= options["max_connections"]:
+                await benchmark.open_connections(connections)
+                result = await self._measure(benchmark, base_memory)
+                self._report(result)
+
+                if result["p99"] > options["latency_limit"] or result["memory"] > options["memory_limit"]:
+                    break
+
+                max_connections = connections
+                connections *= 2
+
+            if max_connections is not None and options["soak_seconds"]:
+                await self._soak(benchmark, max_connections, base_memory, options["soak_seconds"])
+        finally:
+            await benchmark.close_connections()
+            await pubsub_multiplexer.close()
+            tracemalloc.stop()
+
+        self.stdout.write(self.style.SUCCESS(f"Max sustainable connections per worker: {max_connections or 0}"))
+
+    async def _measure(self, benchmark: Benchmark, base_memory: int) -> dict:
+        memory = tracemalloc.get_traced_memory()[0] - base_memory
+        idle_cpu = await benchmark.measure_idle_cpu()
+        latencies = await benchmark.measure_latencies()
+
+        return dict(
+            connections=len(benchmark.connections),
+            p50=percentile(latencies, 50),
+            p90=percentile(latencies, 90),
+            p99=percentile(latencies, 99),
+            max=latencies[-1],
+            memory=memory / 1024 ** 2,
+            memory_per_connection=memory / len(benchmark.connections) / 1024,
+            idle_cpu=idle_cpu,
+        )
+
+    async def _soak(self, benchmark: Benchmark, connections: int, base_memory: int, seconds: float) -> None:
+        self.stdout.write(f"Soak test with {connections} connections for {seconds}s")
+        benchmark.connections, closed = benchmark.connections[:connections], benchmark.connections[connections:]
+        await asyncio.gather(*(connection.disconnect() for connection in closed))
+
+        for user_connections in benchmark.user_connections.values():
+            user_connections[:] = [connection for connection in user_connections if connection not in closed]
+
+        finish_at = time.perf_counter() + seconds
+        while time.perf_counter() < finish_at:
+            self._report(await self._measure(benchmark, base_memory))
+
+    def _report(self, result: dict) -> None:
+        self.stdout.write(
+            "connections={connections} latency ms p50={p50:.2f} p90={p90:.2f} p99={p99:.2f} max={max:.2f} "
+            "memory={memory:.1f}MB ({memory_per_connection:.1f}KB per connection) "
+            "idle CPU={idle_cpu:.2f}us/s per connection".format(**result)
+        )
@@ -1,6 +1,7 @@
 from authlib.integrations.django_client import token_update
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
-from openwiden.users import models
+from openwiden.users import models, services, active_status_cache
 
 
 @receiver(token_update)
@@ -18,3 +19,10 @@ def update_token(name, token, refresh_token=None, access_token=None, **kwargs) -
         vcs_account.refresh_token = token["refresh_token"]
         vcs_account.expires_at = token["expires_at"]
         vcs_account.save(update_fields=("access_token", "refresh_token", "expires_at"))
+        services.invalidate_token_provider(vcs_account_id=vcs_account.id)
+
+
+@receiver(post_save, sender=models.User)
+@receiver(post_delete, sender=models.User)
+def invalidate_user_active_status(instance: models.User, **kwargs) -> None:
+    active_status_cache.invalidate(str(instance.id))
@@ -1,4 +1,6 @@
-from . import models, exceptions
+from typing import Optional
+
+from . import models, exceptions, active_status_cache
 
 
 def find_vcs_account(user: models.User, vcs: str) -> models.VCSAccount:
@@ -11,3 +13,14 @@ def find_vcs_account(user: models.User, vcs: str) -> models.VCSAccount:
         raise exceptions.VCSAccountDoesNotExist(vcs=vcs)
     else:
         return vcs_account
+
+
+def _get_user_is_active(user_id: str) -> Optional[bool]:
+    return models.User.objects.filter(id=user_id).values_list("is_active", flat=True).first()
+
+
+def is_user_active(*, user_id: str) -> Optional[bool]:
+    """
+    Returns cached user active status or None, if user does not exist.
+    """
+    return active_status_cache.get_is_active(str(user_id), load=_get_user_is_active)
@@ -1,19 +1,28 @@
 import json
+import os
+import socket
+import threading
+import time
 from enum import Enum
 from logging import getLogger
-from typing import Optional, Union
+from typing import Optional, Union, Dict, Tuple
 from uuid import uuid4
+from weakref import WeakValueDictionary
 
 import requests
 from authlib.common.errors import AuthlibBaseError
 from authlib.integrations.django_client import OAuth, DjangoRemoteApp
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.core.files.base import ContentFile
 from django_q.tasks import async_task
 from django_redis import get_redis_connection
 from pydantic import BaseModel, Field
+from redis.exceptions import RedisError
 from rest_framework.request import Request
+from requests.adapters import HTTPAdapter
 from rest_framework_simplejwt.tokens import RefreshToken
+from urllib3.connection import HTTPConnection
 
 from openwiden.repositories import (
     services as repositories_services,
@@ -25,6 +34,8 @@ from . import models, serializers, exceptions
 
 log = getLogger(__name__)
 
+NOTIFICATIONS_KEY_PREFIX = "notifications"
+
 
 class WebsocketMessageObjectType(str, Enum):
     REPOSITORY = "repository"
@@ -107,9 +118,187 @@ class Profile:
         return parse_function(data, token)
 
 
+TOKEN_VERSION_KEY_PREFIX = "vcs_account_token_version"
+
+
+def get_token_version_key(*, vcs_account_id: int) -> str:
+    return f"{TOKEN_VERSION_KEY_PREFIX}:{vcs_account_id}"
+
+
+class TokenProvider:
+    """
+    Thread safe in-memory cache of the VCS account OAuth token.
+
+    Token is re-read from the DB only when it's close to the expiration time
+    or it was invalidated after the token update by any process (token version in Redis is changed).
+    Provider keeps its own copy of the token fields, so the VCS account instance of the caller is not shared.
+    """
+
+    token_fields = ("access_token", "token_type", "refresh_token", "expires_at")
+
+    def __init__(self, vcs_account: models.VCSAccount, expiration_leeway: int = 60) -> None:
+        self._vcs_account_id = vcs_account.id
+        self._vcs = vcs_account.vcs
+        self._expiration_leeway = expiration_leeway
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._version: Optional[bytes] = None
+        self._version = self._get_version()
+        self._token = vcs_account.to_token()
+        self._is_invalidated = False
+
+    def _get_version(self) -> Optional[bytes]:
+        try:
+            return get_redis_connection().get(get_token_version_key(vcs_account_id=self._vcs_account_id))
+        except RedisError as e:
+            log.error(f"[Service] token version check skipped for VCS account {self._vcs_account_id}: {e}")
+            return self._version
+
+    def _load_token(self) -> dict:
+        values = models.VCSAccount.objects.values(*self.token_fields).get(id=self._vcs_account_id)
+        return models.VCSAccount(**values).to_token()
+
+    def _is_expiring(self, token: dict) -> bool:
+        expires_at = token.get("expires_at")
+        return expires_at is not None and expires_at - self._expiration_leeway <= time.time()
+
+    def _is_stale(self, version: Optional[bytes]) -> bool:
+        return self._is_invalidated or version != self._version or self._is_expiring(self._token)
+
+    def get_token(self) -> dict:
+        with self._lock:
+            # Version is read before the token, so the token update after it is not missed on the next call
+            version = self._get_version()
+
+            if self._is_stale(version):
+                self._token = self._load_token()
+                self._version = version
+                self._is_invalidated = False
+
+            return dict(self._token)
+
+    def get_active_token(self) -> dict:
+        """
+        Returns the token, that is refreshed first, if it's close to the expiration time,
+        so the token is not refreshed by the requests made with it in other threads.
+        """
+        with self._refresh_lock:
+            token = self.get_token()
+
+            if self._is_expiring(token) and token.get("refresh_token"):
+                # New token is saved and the provider is invalidated by the token update receiver
+                get_client(vcs=self._vcs).refresh_token(token)
+                token = self.get_token()
+
+            return token
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._is_invalidated = True
+
+
+# Token providers are shared by all clients of the same VCS account in the process
+# and live as long as at least one client uses it.
+_token_providers: "WeakValueDictionary[int, TokenProvider]" = WeakValueDictionary()
+_token_providers_lock = threading.Lock()
+
+
+def get_token_provider(*, vcs_account: models.VCSAccount) -> TokenProvider:
+    """
+    Returns shared token provider for the specified VCS account.
+    """
+    with _token_providers_lock:
+        token_provider = _token_providers.get(vcs_account.id)
+
+        if token_provider is None:
+            token_provider = _token_providers[vcs_account.id] = TokenProvider(vcs_account)
+
+        return token_provider
+
+
+def invalidate_token_provider(*, vcs_account_id: int) -> None:
+    """
+    Forces token providers of the specified VCS account in all processes to re-read the token on the next use.
+    """
+    try:
+        get_redis_connection().incr(get_token_version_key(vcs_account_id=vcs_account_id))
+    except RedisError as e:
+        log.error(f"[Service] token version update failed for VCS account {vcs_account_id}: {e}")
+
+    with _token_providers_lock:
+        token_provider = _token_providers.get(vcs_account_id)
+
+    if token_provider is not None:
+        token_provider.invalidate()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter, that could be shared between sessions.
+    Connections pool stays open when a session is closed.
+    """
+
+    def __init__(self, pool_size: int, keep_alive: bool) -> None:
+        self._socket_options = list(HTTPConnection.default_socket_options)
+
+        # Prevents idle pooled connections from being dropped by the network
+        if keep_alive:
+            self._socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+        super().__init__(pool_maxsize=pool_size)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def close(self) -> None:
+        # Authlib closes the session after each request, so pool is not cleared here
+        pass
+
+
+_http_adapters: Dict[Tuple[int, str], PooledHTTPAdapter] = {}
+_http_adapters_lock = threading.Lock()
+
+
+def get_http_adapter(*, vcs: str) -> PooledHTTPAdapter:
+    """
+    Returns HTTP adapter with the connections pool of the current process for specified vcs.
+    """
+    # Process id is a part of the key, so forked workers do not share connections
+    key = (os.getpid(), vcs)
+
+    with _http_adapters_lock:
+        if key not in _http_adapters:
+            _http_adapters[key] = PooledHTTPAdapter(
+                pool_size=settings.VCS_CLIENTS_HTTP_POOL_SIZE, keep_alive=settings.VCS_CLIENTS_HTTP_KEEP_ALIVE,
+            )
+
+        return _http_adapters[key]
+
+
+class PooledDjangoRemoteApp(DjangoRemoteApp):
+    """
+    Authlib client, that sends all requests through the pooled HTTP adapter of the vcs.
+    Token is still specified for each request.
+    """
+
+    def _get_oauth_client(self, **kwargs):
+        session = super()._get_oauth_client(**kwargs)
+        session.mount("https://", get_http_adapter(vcs=self.name))
+        return session
+
+    def refresh_token(self, token: dict) -> None:
+        """
+        Refreshes the token, the new token is sent by the token update signal as on the refresh before a request.
+        """
+        with self._get_oauth_client() as session:
+            session.token = token
+            session.refresh_token(session.metadata["token_endpoint"])
+
+
 oauth_client = OAuth()
-oauth_client.register("github")
-oauth_client.register("gitlab")
+oauth_client.register("github", client_cls=PooledDjangoRemoteApp)
+oauth_client.register("gitlab", client_cls=PooledDjangoRemoteApp)
 
 
 def get_jwt_tokens(user: models.User) -> dict:
@@ -280,5 +469,46 @@ def send_notification(*, user: models.User, message: Union[WebsocketMessage, Ser
 
     log.info(f"[Service] sending notification for user {user} with a message '{message}'")
 
+    # Notification is added to the user's stream first, so it could be replayed to the reconnected client
     redis = get_redis_connection()
+    key = get_notifications_key(user_id=str(user.id))
+
+    try:
+        notification_id = redis.xadd(
+            key, {"message": message}, maxlen=settings.WEBSOCKET_NOTIFICATIONS_MAX_LENGTH, approximate=True
+        ).decode()
+        redis.expire(key, settings.WEBSOCKET_NOTIFICATIONS_MAX_AGE)
+    except RedisError as e:
+        log.error(f"[Service] notification for user {user} is not added to the stream: {e}")
+    else:
+        message = add_notification_id(message=message, notification_id=notification_id)
+
     redis.publish(str(user.id), message)
+
+
+def get_notifications_key(*, user_id: str) -> str:
+    return f"{NOTIFICATIONS_KEY_PREFIX}:{user_id}"
+
+
+def add_notification_id(*, message: str, notification_id: str) -> str:
+    """
+    Adds stream id to the JSON message, so the client could request notifications after the last seen one.
+    """
+    return json.dumps({"id": notification_id, **json.loads(message)})
+
+
+def parse_notification_id(notification_id: str) -> Tuple[int, int]:
+    """
+    Parses stream id (milliseconds timestamp and sequence number) to the comparable tuple.
+    Raises ValueError, if id is invalid.
+    """
+    timestamp, _, sequence = notification_id.partition("-")
+    return int(timestamp), int(sequence or 0)
+
+
+def get_notifications_replay_start(*, last_id: str) -> str:
+    """
+    Returns stream id to replay notifications from: the last seen id, but not older than the notifications max age.
+    """
+    min_id = (int(time.time() * 1000) - settings.WEBSOCKET_NOTIFICATIONS_MAX_AGE * 1000, 0)
+    return "{}-{}".format(*max(parse_notification_id(last_id), min_id))
@@ -1,3 +1,5 @@
+import time
+
 import factory
 from factory import fuzzy
 
@@ -24,7 +26,8 @@ class VCSAccountFactory(factory.django.DjangoModelFactory):
     token_type = factory.Faker("pystr")
     access_token = factory.Faker("pystr")
     refresh_token = factory.Faker("pystr")
-    expires_at = fuzzy.FuzzyInteger(100, 36000)
+    # Not expired token, that is valid for 2 hours as GitLab tokens
+    expires_at = factory.LazyFunction(lambda: int(time.time()) + 7200)
 
     class Meta:
         model = models.VCSAccount
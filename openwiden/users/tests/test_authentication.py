@@ -0,0 +1,42 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from openwiden.users import authentication, active_status_cache
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_user(user):
+    active_status_cache.invalidate(str(user.id))
+    validated_token = AccessToken.for_user(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        lazy_user = authentication.JWTAuthentication().get_user(validated_token)
+        assert lazy_user.is_authenticated and lazy_user.pk == user.pk
+
+    # Only the active status is loaded until the other user attributes are accessed
+    assert len(queries) == 1
+    assert lazy_user == user
+    assert lazy_user.username == user.username
+
+
+@pytest.mark.parametrize(
+    "is_deleted, code", [pytest.param(True, "user_not_found"), pytest.param(False, "user_inactive")],
+)
+def test_get_user_fails(create_user, is_deleted: bool, code: str):
+    user = create_user()
+    validated_token = AccessToken.for_user(user)
+
+    if is_deleted:
+        user.delete()
+    else:
+        user.is_active = False
+        user.save()
+
+    with pytest.raises(AuthenticationFailed) as e:
+        authentication.JWTAuthentication().get_user(validated_token)
+
+    assert e.value.get_codes() == code
@@ -0,0 +1,35 @@
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from openwiden.users import models, selectors
+from openwiden.users.management.commands.benchmark_websockets import USERNAME_PREFIX
+
+
+@pytest.mark.functional
+@pytest.mark.django_db(transaction=True)
+def test_run():
+    stdout = StringIO()
+
+    with mock.patch.object(selectors, "_get_user_is_active", wraps=selectors._get_user_is_active) as load_is_active:
+        call_command(
+            "benchmark_websockets",
+            connections=2,
+            max_connections=4,
+            users=2,
+            messages=4,
+            idle_seconds=0.1,
+            latency_limit=10 ** 4,
+            stdout=stdout,
+        )
+
+    output = stdout.getvalue()
+    assert "connections=2 " in output
+    assert "connections=4 " in output
+    assert "Max sustainable connections per worker: 4" in output
+    # Active status of the users is cached by the first connection of every user, as with Redis
+    assert load_is_active.call_count == 2
+    # Benchmark users are deleted
+    assert not models.User.objects.filter(username__startswith=USERNAME_PREFIX).exists()
@@ -1,9 +1,12 @@
 from unittest import mock
+from uuid import uuid4
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from openwiden import exceptions
-from openwiden.users import models, selectors, messages
+from openwiden.users import models, selectors, messages, active_status_cache
 
 pytestmark = pytest.mark.django_db
 
@@ -27,3 +30,30 @@ def test_find_raises_service_exception(patched_objects_get, mock_user):
         selectors.find_vcs_account(mock_user, "test")
 
         assert e.value == messages.VCS_ACCOUNT_DOES_NOT_EXIST.format(vcs="test")
+
+
+def test_is_user_active(user):
+    active_status_cache.invalidate(str(user.id))
+
+    with CaptureQueriesContext(connection) as queries:
+        assert selectors.is_user_active(user_id=user.id) is True
+        assert selectors.is_user_active(user_id=user.id) is True
+
+    assert len(queries) == 1
+
+    # Cache is invalidated on the user save
+    user.is_active = False
+    user.save(update_fields=("is_active",))
+
+    assert selectors.is_user_active(user_id=user.id) is False
+
+
+def test_is_user_active_unknown_user():
+    user_id = uuid4()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert selectors.is_user_active(user_id=user_id) is None
+        assert selectors.is_user_active(user_id=user_id) is None
+
+    assert len(queries) == 1
+    active_status_cache.invalidate(str(user_id))
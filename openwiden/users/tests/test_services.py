@@ -1,10 +1,13 @@
+import time
 from unittest import mock
 
 import pytest
 from authlib.integrations.django_client import DjangoRemoteApp
+from django_redis import get_redis_connection
 
+from openwiden.enums import VersionControlService
 from openwiden.exceptions import ServiceException
-from openwiden.users import services
+from openwiden.users import services, models
 
 pytestmark = pytest.mark.django_db
 
@@ -76,3 +79,77 @@ def test_get_client_raises_error(settings):
 #         assert vcs_account.access_token != fake_token["access_token"]
 #         assert vcs_account.refresh_token != fake_token["refresh_token"]
 #         assert vcs_account.expires_at != fake_token["expires_at"]
+
+
+def test_token_provider_caches_token(create_vcs_account, django_assert_num_queries):
+    vcs_account = create_vcs_account(expires_at=int(time.time()) + 3600)
+    token_provider = services.get_token_provider(vcs_account=vcs_account)
+
+    with django_assert_num_queries(0):
+        assert token_provider.get_token() == vcs_account.to_token()
+        assert token_provider.get_token() == vcs_account.to_token()
+
+    assert services.get_token_provider(vcs_account=vcs_account) is token_provider
+
+
+def test_token_provider_is_invalidated_by_another_process(create_vcs_account, django_assert_num_queries):
+    vcs_account = create_vcs_account(expires_at=int(time.time()) + 3600)
+    token_provider = services.get_token_provider(vcs_account=vcs_account)
+    models.VCSAccount.objects.filter(id=vcs_account.id).update(access_token="new")
+
+    # Another process updates only the token version
+    get_redis_connection().incr(services.get_token_version_key(vcs_account_id=vcs_account.id))
+
+    with django_assert_num_queries(1):
+        assert token_provider.get_token()["access_token"] == "new"
+        assert token_provider.get_token()["access_token"] == "new"
+
+    # Caller's instance is not changed by the provider
+    assert vcs_account.access_token != "new"
+
+
+@pytest.mark.parametrize(
+    "expires_in, invalidate",
+    [pytest.param(10, False, id="token is near expiration"), pytest.param(3600, True, id="token is invalidated")],
+)
+def test_token_provider_rereads_token(create_vcs_account, django_assert_num_queries, expires_in: int, invalidate: bool):
+    vcs_account = create_vcs_account(expires_at=int(time.time()) + expires_in)
+    token_provider = services.get_token_provider(vcs_account=vcs_account)
+    models.VCSAccount.objects.filter(id=vcs_account.id).update(access_token="new")
+
+    if invalidate:
+        services.invalidate_token_provider(vcs_account_id=vcs_account.id)
+
+    with django_assert_num_queries(1):
+        assert token_provider.get_token()["access_token"] == "new"
+
+
+@pytest.mark.parametrize(
+    "expires_in, is_refreshed",
+    [pytest.param(10, True, id="token is near expiration"), pytest.param(3600, False, id="token is not expiring")],
+)
+@mock.patch("requests.sessions.Session.request")
+def test_token_provider_active_token(mock_request, create_vcs_account, expires_in: int, is_refreshed: bool):
+    vcs_account = create_vcs_account(vcs=VersionControlService.GITLAB, expires_at=int(time.time()) + expires_in)
+    mock_request.return_value.json.return_value = dict(
+        access_token="new", refresh_token="new refresh", token_type="Bearer", expires_in=7200
+    )
+
+    token = services.get_token_provider(vcs_account=vcs_account).get_active_token()
+
+    assert mock_request.called is is_refreshed
+    vcs_account.refresh_from_db()
+    assert token == vcs_account.to_token()
+    assert (token["access_token"] == "new") is is_refreshed
+
+
+def test_client_sessions_share_http_adapter():
+    client = services.get_client(vcs=VersionControlService.GITHUB)
+
+    with client._get_oauth_client() as first_session:
+        adapter = first_session.get_adapter("https://api.github.com/")
+
+    with client._get_oauth_client() as second_session:
+        assert second_session.get_adapter("https://api.github.com/") is adapter
+
+    assert adapter is services.get_http_adapter(vcs=VersionControlService.GITHUB)
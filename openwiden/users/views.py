@@ -4,13 +4,14 @@ from drf_yasg.utils import no_body, swagger_auto_schema
 
 from rest_framework import views, viewsets, mixins, status
 from rest_framework.authentication import SessionAuthentication
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.request import Request
 from rest_framework.response import Response
 
 from rest_framework_simplejwt.views import TokenRefreshView as JWTRefreshView
 
 from openwiden import enums
+from openwiden.vcs_clients import rate_limit
 from . import exceptions, models, permissions, serializers, services
 
 
@@ -115,3 +116,20 @@ class UserMeView(views.APIView):
 
 
 user_me_view = UserMeView.as_view()
+
+
+@method_decorator(
+    name="get", decorator=swagger_auto_schema(operation_summary="Get current VCS API rate limit budgets"),
+)
+class VCSRateLimitsView(views.APIView):
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request: Request) -> Response:
+        """
+        Returns rate limit budgets of the VCS accounts tokens, that were used recently.
+        """
+        data = [budget.to_dict() for budget in rate_limit.get_budgets()]
+        return Response(data, status=status.HTTP_200_OK)
+
+
+vcs_rate_limits_view = VCSRateLimitsView.as_view()
@@ -1,4 +1,6 @@
 from .github.client import GitHubClient
 from .gitlab.client import GitlabClient
+from .async_client import AsyncGitHubClient, AsyncGitlabClient
+from .exceptions import RateLimitExceeded
 
-__all__ = ("GitHubClient", "GitlabClient")
+__all__ = ("GitHubClient", "GitlabClient", "AsyncGitHubClient", "AsyncGitlabClient", "RateLimitExceeded")
@@ -1,8 +1,12 @@
-from typing import Union, List, Dict
+from abc import ABC, abstractmethod
+from typing import Union, List, Dict, Iterator, Optional, Tuple
 
+from django.conf import settings
 from requests import Response
 
 from openwiden.users import services, models
+from .rate_limit import RateLimitLedger
+from .response_cache import ResponseCache
 
 JsonAbleType = Union[str, int, float, bool, None]
 JsonDictType = Dict[JsonAbleType, Union[JsonAbleType, List[dict]]]
@@ -10,17 +14,38 @@ JsonListType = List[JsonDictType]
 JsonType = Union[JsonListType, JsonDictType]
 
 
-class AbstractVCSClient:
-    def __init__(self, vcs_account: models.VCSAccount) -> None:
+class AbstractVCSClient(ABC):
+    # Maximum page size allowed by the VCS API for list endpoints
+    per_page: int = 100
+    # Prefix of the rate limit headers: Limit, Remaining and Reset
+    rate_limit_headers_prefix: str = None
+
+    def __init__(self, vcs_account: models.VCSAccount, token: dict = None) -> None:
         self.vcs_account = vcs_account
         self._client = services.get_client(vcs=vcs_account.vcs)
+        self._token_provider = services.get_token_provider(vcs_account=vcs_account)
+        # Fixed token is used instead of the token provider, so the client does not read the DB
+        self._token = token
+        self.rate_limit = RateLimitLedger(
+            vcs=vcs_account.vcs, vcs_account_id=vcs_account.id, headers_prefix=self.rate_limit_headers_prefix,
+        )
+        self.response_cache = ResponseCache(scope=f"{vcs_account.vcs}:{vcs_account.id}")
 
     def _get_token(self) -> dict:
-        self.vcs_account.refresh_from_db()
-        return self.vcs_account.to_token()
+        if self._token is not None:
+            return dict(self._token)
+        return self._token_provider.get_token()
+
+    def _request(self, method: str, url: str, rate_limit: RateLimitLedger = None, **kwargs) -> Response:
+        # API resources with a separate budget use their own ledger
+        rate_limit = rate_limit or self.rate_limit
+        rate_limit.acquire()
+        response = self._client.request(method, url, token=self._get_token(), **kwargs)
+        rate_limit.update(response)
+        return response
 
     def _post(self, url: str, data: dict) -> JsonType:
-        response = self._client.post(url, token=self._get_token(), json=data)
+        response = self._request("POST", url, json=data)
 
         # TODO: rewrite exception handler
         if response.status_code not in [201, 200]:
@@ -28,8 +53,11 @@ class AbstractVCSClient:
 
         return response.json()
 
-    def _get(self, url: str, return_response: bool = False) -> Union[JsonType, Response]:
-        response = self._client.get(url, token=self._get_token())
+    def _get(self, url: str, return_response: bool = False, use_cache: bool = False) -> Union[JsonType, Response]:
+        if use_cache and settings.VCS_CLIENTS_RESPONSE_CACHE_ENABLED:
+            return self._get_cached(url)
+
+        response = self._request("GET", url)
 
         if return_response:
             return response
@@ -39,8 +67,49 @@ class AbstractVCSClient:
 
         return response.json()
 
+    def _get_cached(self, url: str) -> JsonType:
+        """
+        Makes conditional request and returns cached body, if it's not modified.
+        """
+        cached_response = self.response_cache.get(url)
+        headers = cached_response.get_conditional_headers() if cached_response else {}
+        response = self._request("GET", url, headers=headers)
+
+        if response.status_code == 304 and cached_response:
+            return cached_response.json()
+        elif response.status_code != 200:
+            raise ValueError(f"request failed: {response.json()}")
+
+        self.response_cache.set(url, response)
+
+        return response.json()
+
+    @abstractmethod
+    def _get_next_page(self, response: Response, url: str, params: dict) -> Optional[Tuple[str, Optional[dict]]]:
+        """
+        Returns url and params of the next page or None if the response is the last page.
+        """
+
+    def _get_paginated(self, url: str, params: dict = None) -> Iterator[JsonDictType]:
+        """
+        Yields items of the list endpoint page by page, so the next page is requested
+        only when all items of the previous one are consumed.
+        """
+        next_page = url, dict(params or {}, per_page=self.per_page)
+
+        while next_page:
+            url, params = next_page
+            response = self._request("GET", url, params=params)
+
+            if response.status_code != 200:
+                raise ValueError(f"request failed: {response.json()}")
+
+            yield from response.json()
+
+            next_page = self._get_next_page(response, url, params)
+
     def _delete(self, url: str) -> None:
-        response = self._client.delete(url=url, token=self._get_token())
+        response = self._request("DELETE", url)
 
         if response.status_code != 204:
             raise ValueError(f"request failed: {response.json()}")
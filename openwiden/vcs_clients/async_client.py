@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from typing import Type, Optional
+
+from django.conf import settings
+
+from openwiden.users import models, services
+from .abstract import AbstractVCSClient
+from .github.client import GitHubClient
+from .gitlab.client import GitlabClient
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.VCS_CLIENTS_ASYNC_MAX_WORKERS, thread_name_prefix="vcs-client",
+            )
+        return _executor
+
+
+class AsyncVCSClient:
+    """
+    Asyncio variant of the VCS client.
+
+    Every public method of the sync client is available as a coroutine function,
+    that runs the request in the thread pool, so independent requests could be awaited concurrently.
+    Responses are parsed with the same models as the sync client does.
+
+    The token is read from the DB (and refreshed, if it's close to the expiration time) on the calling thread,
+    when the client is created, so the pool threads only make HTTP requests and never open DB connections.
+    """
+
+    sync_client_class: Type[AbstractVCSClient] = None
+
+    def __init__(self, vcs_account: models.VCSAccount) -> None:
+        token = services.get_token_provider(vcs_account=vcs_account).get_active_token()
+        self.sync_client = self.sync_client_class(vcs_account, token=token)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        method = getattr(self.sync_client, name)
+
+        if not callable(method):
+            raise AttributeError(name)
+
+        @wraps(method)
+        async def run_in_executor(*args, **kwargs):
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(_get_executor(), partial(method, *args, **kwargs))
+
+        return run_in_executor
+
+
+class AsyncGitHubClient(AsyncVCSClient):
+    sync_client_class = GitHubClient
+
+
+class AsyncGitlabClient(AsyncVCSClient):
+    sync_client_class = GitlabClient
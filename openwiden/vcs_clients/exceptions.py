@@ -0,0 +1,8 @@
+class RateLimitExceeded(Exception):
+    """
+    VCS API rate limit budget is exhausted until the reset time (in seconds since the epoch).
+    """
+
+    def __init__(self, reset_at: int) -> None:
+        self.reset_at = reset_at
+        super().__init__(f"rate limit exceeded until {reset_at}")
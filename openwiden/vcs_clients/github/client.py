@@ -1,7 +1,12 @@
-from typing import List
+from datetime import datetime
+from typing import List, Iterator, Optional, Tuple
 
-from . import models
+from django.conf import settings
+from requests import Response
+
+from . import models, queries
 from ..abstract import AbstractVCSClient
+from ..rate_limit import RateLimitLedger
 from ...enums import OrganizationMembershipType
 
 
@@ -16,6 +21,40 @@ def convert_lines_count_to_percentages(repository_languages: dict) -> dict:
 
 
 class GitHubClient(AbstractVCSClient):
+    rate_limit_headers_prefix = "X-RateLimit-"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # GraphQL API has a separate rate limit budget
+        self.graphql_rate_limit = RateLimitLedger(
+            vcs=f"{self.vcs_account.vcs}-graphql",
+            vcs_account_id=self.vcs_account.id,
+            headers_prefix=self.rate_limit_headers_prefix,
+        )
+
+    def _get_next_page(self, response: Response, url: str, params: dict) -> Optional[Tuple[str, Optional[dict]]]:
+        """
+        Returns the next page url from the response Link header.
+
+        GitHub docs:
+        https://developer.github.com/v3/guides/traversing-with-pagination/
+        """
+        next_url = response.links.get("next", {}).get("url")
+
+        # Next page url already contains all query params
+        return (next_url, None) if next_url else None
+
+    def _graphql(self, query: str, variables: dict) -> dict:
+        response = self._request(
+            "POST", "graphql", rate_limit=self.graphql_rate_limit, json=dict(query=query, variables=variables),
+        )
+        json = response.json()
+
+        if response.status_code != 200 or json.get("errors"):
+            raise ValueError(f"graphql request failed: {json}")
+
+        return json["data"]
+
     def create_webhook(
         self, repository_id: int, url: str, secret: str, events: List[str] = None, active: bool = True,
     ) -> models.Webhook:
@@ -46,25 +85,36 @@ class GitHubClient(AbstractVCSClient):
         url = f"repositories/{repository_id}/hooks/{webhook_id}"
         self._delete(url=url)
 
-    def get_repository_issues(self, repository_id: int, state: str = "open") -> List[models.Issue]:
-        json = self._get(url=f"repositories/{repository_id}/issues?state={state}")
+    def get_repository_issues(
+        self, repository_id: int, state: str = "open", since: datetime = None,
+    ) -> Iterator[models.Issue]:
+        """
+        Returns repository issues.
+        If since is specified, then only issues updated since that time are returned in any state,
+        so closed issues could be synced too.
+        """
+        params = dict(state=state)
+
+        if since:
+            params.update(state="all", since=since.isoformat())
+
+        json = self._get_paginated(url=f"repositories/{repository_id}/issues", params=params)
         # Note: GitHub's REST API v3 considers every pull request an issue,
         # but not every issue is a pull request. For this reason, "Issues"
         # endpoints may return both issues and pull requests in the response.
         # We can identify pull requests by the pull_request key.
-        json = [issue for issue in json if "pull_request" not in issue]
-        return [models.Issue.from_json(issue_data) for issue_data in json]
+        return (models.Issue.from_json(issue_data) for issue_data in json if "pull_request" not in issue_data)
 
     def get_repository_languages(self, repository_id: int) -> dict:
-        json = self._get(url=f"repositories/{repository_id}/languages")
+        json = self._get(url=f"repositories/{repository_id}/languages", use_cache=True)
         return convert_lines_count_to_percentages(json)
 
     def get_repository(self, repository_id: int) -> models.Repository:
-        json = self._get(f"repositories/{repository_id}")
+        json = self._get(f"repositories/{repository_id}", use_cache=True)
         return models.Repository.from_json(json)
 
     def get_organization(self, organization_id: int) -> models.Organization:
-        json = self._get(url=f"organizations/{organization_id}")
+        json = self._get(url=f"organizations/{organization_id}", use_cache=True)
         return models.Organization.from_json(json)
 
     def check_organization_membership(self, organization_id: int) -> OrganizationMembershipType:
@@ -87,6 +137,60 @@ class GitHubClient(AbstractVCSClient):
         else:
             raise ValueError("check organization membership failed, please, try again.")
 
-    def get_user_repositories(self) -> List[models.Repository]:
-        json = self._get(url="user/repos?affiliation=owner,organization_member&visibility=public")
-        return [models.Repository.from_json(data) for data in json if not data["archived"]]
+    def get_user_repositories(self) -> Iterator[models.Repository]:
+        json = self._get_paginated(
+            url="user/repos", params=dict(affiliation="owner,organization_member", visibility="public"),
+        )
+        return (models.Repository.from_json(data) for data in json if not data["archived"])
+
+    def get_user_repositories_details(
+        self, batch_size: int = None, issues_count: int = 0,
+    ) -> Iterator[models.RepositoryDetails]:
+        """
+        Returns user repositories with programming languages, owner organization and
+        the first open issues (if issues count is specified) by the GraphQL API.
+        Up to batch size repositories are fetched per query instead of a few REST requests per repository.
+
+        GitHub docs:
+        https://docs.github.com/en/graphql/reference/objects#repository
+        """
+        variables = dict(
+            first=batch_size or settings.VCS_CLIENTS_GITHUB_GRAPHQL_BATCH_SIZE,
+            after=None,
+            withIssues=issues_count > 0,
+            issuesCount=issues_count,
+        )
+
+        while True:
+            repositories = self._graphql(queries.USER_REPOSITORIES_QUERY, variables)["viewer"]["repositories"]
+
+            for data in repositories["nodes"]:
+                if data["isArchived"]:
+                    continue
+
+                repository_details = models.RepositoryDetails.from_graphql(data)
+                convert_lines_count_to_percentages(repository_details.programming_languages)
+                yield repository_details
+
+            if not repositories["pageInfo"]["hasNextPage"]:
+                break
+
+            variables["after"] = repositories["pageInfo"]["endCursor"]
+
+    def get_repository_details(self, owner: str, name: str, issues_count: int = 0) -> models.RepositoryDetails:
+        """
+        Returns repository with programming languages, owner organization and
+        the first open issues (if issues count is specified) by the single GraphQL query.
+
+        GitHub docs:
+        https://docs.github.com/en/graphql/reference/queries#repository
+        """
+        variables = dict(owner=owner, name=name, withIssues=issues_count > 0, issuesCount=issues_count)
+        data = self._graphql(queries.REPOSITORY_QUERY, variables)["repository"]
+
+        if data is None:
+            raise ValueError(f"repository {owner}/{name} is not found")
+
+        repository_details = models.RepositoryDetails.from_graphql(data)
+        convert_lines_count_to_percentages(repository_details.programming_languages)
+        return repository_details
@@ -1,13 +1,14 @@
 from .owner import Owner, OwnerType
 from .webhook import Webhook
 from .issue import Issue
-from .repository import Repository
+from .repository import Repository, RepositoryDetails
 from .organization import Organization
 
 __all__ = (
     "Webhook",
     "Issue",
     "Repository",
+    "RepositoryDetails",
     "Owner",
     "OwnerType",
     "Organization",
@@ -32,3 +32,18 @@ class Issue:
         json["issue_id"] = json.pop("id")
         json["labels"] = [label["name"] for label in json["labels"]]
         return cls(**json)
+
+    @classmethod
+    def from_graphql(cls, json: dict, repository_id: int = None) -> "Issue":
+        return cls(
+            issue_id=json["databaseId"],
+            title=json["title"],
+            html_url=json["url"],
+            body=json["body"],
+            state=json["state"].lower(),
+            labels=[label["name"] for label in json["labels"]["nodes"]],
+            created_at=json["createdAt"],
+            updated_at=json["updatedAt"],
+            closed_at=json["closedAt"],
+            repository_id=repository_id,
+        )
@@ -20,3 +20,14 @@ class Organization:
     def from_json(cls, json: dict) -> "Organization":
         json["organization_id"] = json.pop("id")
         return Organization(**json)
+
+    @classmethod
+    def from_graphql(cls, json: dict) -> "Organization":
+        return cls(
+            login=json["login"],
+            organization_id=json["databaseId"],
+            html_url=json["url"],
+            avatar_url=json["avatarUrl"],
+            description=json["description"],
+            created_at=json["createdAt"],
+        )
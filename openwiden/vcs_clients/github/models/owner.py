@@ -17,3 +17,7 @@ class Owner:
         json["owner_id"] = json.pop("id")
         json["owner_type"] = json.pop("type")
         return cls(**json)
+
+    @classmethod
+    def from_graphql(cls, json: dict) -> "Owner":
+        return cls(login=json["login"], owner_id=json["databaseId"], owner_type=json["__typename"])
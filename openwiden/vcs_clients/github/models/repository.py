@@ -1,4 +1,8 @@
-from .owner import Owner
+from typing import Dict, List, Optional
+
+from .issue import Issue
+from .organization import Organization
+from .owner import Owner, OwnerType
 
 
 class Repository:
@@ -34,3 +38,56 @@ class Repository:
         json["repository_id"] = json.pop("id")
         json["owner"] = Owner.from_json(json.pop("owner"))
         return Repository(**json)
+
+    @classmethod
+    def from_graphql(cls, json: dict) -> "Repository":
+        return cls(
+            repository_id=json["databaseId"],
+            name=json["name"],
+            description=json["description"],
+            html_url=json["url"],
+            stargazers_count=json["stargazerCount"],
+            open_issues_count=json["openIssues"]["totalCount"],
+            forks_count=json["forkCount"],
+            created_at=json["createdAt"],
+            updated_at=json["updatedAt"],
+            private=json["isPrivate"],
+            owner=Owner.from_graphql(json["owner"]),
+        )
+
+
+class RepositoryDetails:
+    """
+    Repository with the related data fetched by the single GraphQL query.
+    Issues are the first open issues, if they are requested, "has more issues" is set, if there are more of them.
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        programming_languages: Dict[str, int],
+        organization: Optional[Organization],
+        issues: List[Issue],
+        has_more_issues: bool = False,
+    ) -> None:
+        self.repository = repository
+        self.programming_languages = programming_languages
+        self.organization = organization
+        self.issues = issues
+        self.has_more_issues = has_more_issues
+
+    @classmethod
+    def from_graphql(cls, json: dict) -> "RepositoryDetails":
+        repository = Repository.from_graphql(json)
+        owner = json["owner"]
+        issues = json.get("issues", {})
+        return cls(
+            repository=repository,
+            programming_languages={edge["node"]["name"]: edge["size"] for edge in json["languages"]["edges"]},
+            organization=Organization.from_graphql(owner) if owner["__typename"] == OwnerType.ORGANIZATION else None,
+            issues=[
+                Issue.from_graphql(issue, repository_id=repository.repository_id)
+                for issue in issues.get("nodes", [])
+            ],
+            has_more_issues=issues.get("pageInfo", {}).get("hasNextPage", False),
+        )
@@ -0,0 +1,96 @@
+"""
+GitHub GraphQL API queries.
+
+GitHub docs:
+https://docs.github.com/en/graphql
+"""
+
+REPOSITORY_FRAGMENT = """
+fragment RepositoryDetails on Repository {
+  databaseId
+  name
+  description
+  url
+  stargazerCount
+  forkCount
+  createdAt
+  updatedAt
+  isPrivate
+  isArchived
+  openIssues: issues(states: OPEN) {
+    totalCount
+  }
+  owner {
+    __typename
+    login
+    ... on User {
+      databaseId
+    }
+    ... on Organization {
+      databaseId
+      url
+      avatarUrl
+      description
+      createdAt
+    }
+  }
+  languages(first: 100) {
+    edges {
+      size
+      node {
+        name
+      }
+    }
+  }
+  issues(first: $issuesCount, states: OPEN, orderBy: {field: UPDATED_AT, direction: DESC}) @include(if: $withIssues) {
+    pageInfo {
+      hasNextPage
+    }
+    nodes {
+      databaseId
+      title
+      url
+      body
+      state
+      createdAt
+      updatedAt
+      closedAt
+      labels(first: 100) {
+        nodes {
+          name
+        }
+      }
+    }
+  }
+}
+"""
+
+USER_REPOSITORIES_QUERY = """
+query UserRepositories($first: Int!, $after: String, $withIssues: Boolean!, $issuesCount: Int!) {
+  viewer {
+    repositories(
+      first: $first
+      after: $after
+      affiliations: [OWNER, ORGANIZATION_MEMBER]
+      ownerAffiliations: [OWNER, ORGANIZATION_MEMBER]
+      privacy: PUBLIC
+    ) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        ...RepositoryDetails
+      }
+    }
+  }
+}
+""" + REPOSITORY_FRAGMENT
+
+REPOSITORY_QUERY = """
+query Repository($owner: String!, $name: String!, $withIssues: Boolean!, $issuesCount: Int!) {
+  repository(owner: $owner, name: $name) {
+    ...RepositoryDetails
+  }
+}
+""" + REPOSITORY_FRAGMENT
@@ -1,4 +1,7 @@
-from typing import List
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from requests import Response
 
 from .models import Repository, Issue, Webhook, Organization
 from ..abstract import AbstractVCSClient
@@ -6,20 +9,44 @@ from ...enums import OrganizationMembershipType
 
 
 class GitlabClient(AbstractVCSClient):
-    def get_user_repositories(self) -> List[Repository]:
-        json = self._get("projects/?membership=True&archived=False&visibility=public")
-        return [Repository.from_json(data) for data in json]
+    rate_limit_headers_prefix = "RateLimit-"
+
+    def _get_next_page(self, response: Response, url: str, params: dict) -> Optional[Tuple[str, Optional[dict]]]:
+        """
+        Returns the same url with the page number from the X-Next-Page header.
+
+        Gitlab docs:
+        https://docs.gitlab.com/ee/api/README.html#pagination
+        """
+        next_page = response.headers.get("X-Next-Page")
+
+        # Header is empty for the last page
+        return (url, dict(params, page=next_page)) if next_page else None
+
+    def get_user_repositories(self) -> Iterator[Repository]:
+        json = self._get_paginated("projects/", params=dict(membership=True, archived=False, visibility="public"))
+        return (Repository.from_json(data) for data in json)
 
     def get_repository(self, repository_id: int) -> Repository:
         json = self._get(f"projects/{repository_id}")
         return Repository.from_json(json)
 
     def get_repository_programming_languages(self, repository_id: int) -> dict:
-        return self._get(f"projects/{repository_id}/languages")
+        return self._get(f"projects/{repository_id}/languages", use_cache=True)
+
+    def get_repository_issues(self, repository_id: int, updated_after: datetime = None) -> Iterator[Issue]:
+        """
+        Returns repository opened issues.
+        If updated_after is specified, then only issues updated after that time are returned in any state,
+        so closed issues could be synced too.
+        """
+        if updated_after:
+            params = dict(updated_after=updated_after.isoformat())
+        else:
+            params = dict(state="opened")
 
-    def get_repository_issues(self, repository_id: int) -> List[Issue]:
-        json = self._get(f"projects/{repository_id}/issues?state=opened")
-        return [Issue.from_json(data) for data in json]
+        json = self._get_paginated(f"projects/{repository_id}/issues", params=params)
+        return (Issue.from_json(data) for data in json)
 
     def get_organization(self, organization_id: int) -> Organization:
         data = self._get(f"groups/{organization_id}")
@@ -0,0 +1,139 @@
+import time
+from logging import getLogger
+from typing import Optional, List
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from requests import Response
+
+from .exceptions import RateLimitExceeded
+
+log = getLogger(__name__)
+
+KEY_PREFIX = "vcs_rate_limit"
+
+# Reserves one request, unless the budget is unknown yet (returns nil)
+# or the remaining requests reach the reserve (the request is given back and the reset time is returned).
+ACQUIRE_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+  return nil
+end
+
+if redis.call("HINCRBY", KEYS[1], "remaining", -1) < tonumber(ARGV[1]) then
+  redis.call("HINCRBY", KEYS[1], "remaining", 1)
+  return tonumber(redis.call("HGET", KEYS[1], "reset_at"))
+end
+
+return 0
+"""
+
+
+class RateLimitBudget:
+    def __init__(self, vcs: str, vcs_account_id: int, limit: int, remaining: int, reset_at: int) -> None:
+        self.vcs = vcs
+        self.vcs_account_id = vcs_account_id
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+    @classmethod
+    def from_redis(cls, key: str, data: dict) -> "RateLimitBudget":
+        _, vcs, vcs_account_id = key.split(":")
+        return cls(
+            vcs=vcs,
+            vcs_account_id=int(vcs_account_id),
+            limit=int(data[b"limit"]),
+            remaining=int(data[b"remaining"]),
+            reset_at=int(data[b"reset_at"]),
+        )
+
+    def to_dict(self) -> dict:
+        return dict(
+            vcs=self.vcs,
+            vcs_account_id=self.vcs_account_id,
+            limit=self.limit,
+            remaining=self.remaining,
+            reset_at=self.reset_at,
+        )
+
+
+class RateLimitLedger:
+    """
+    Redis backed VCS API rate limit budget of the VCS account token,
+    shared by all workers.
+
+    Budget is updated from the rate limit headers of every response and
+    one request is reserved from the budget before it is sent.
+    """
+
+    def __init__(self, *, vcs: str, vcs_account_id: int, headers_prefix: str) -> None:
+        self.key = f"{KEY_PREFIX}:{vcs}:{vcs_account_id}"
+        self._headers_prefix = headers_prefix
+        self._redis = get_redis_connection()
+        self._acquire_script = self._redis.register_script(ACQUIRE_SCRIPT)
+
+    def get_budget(self) -> Optional[RateLimitBudget]:
+        data = self._redis.hgetall(self.key)
+        return RateLimitBudget.from_redis(self.key, data) if data else None
+
+    def acquire(self) -> None:
+        """
+        Reserves one request from the budget.
+        Waits for the reset if it's soon or raises RateLimitExceeded, so the task could be rescheduled.
+        """
+        try:
+            reset_at = self._acquire_script(keys=[self.key], args=[settings.VCS_CLIENTS_RATE_LIMIT_RESERVE])
+        except RedisError as e:
+            log.error(f"[Rate limit] budget check skipped for {self.key}: {e}")
+            return
+
+        if not reset_at:
+            return
+
+        wait_seconds = reset_at - time.time()
+
+        if wait_seconds <= 0:
+            return
+        elif wait_seconds <= settings.VCS_CLIENTS_RATE_LIMIT_MAX_WAIT:
+            log.info(f"[Rate limit] waiting {wait_seconds:.1f}s for {self.key} budget reset")
+            time.sleep(wait_seconds)
+        else:
+            raise RateLimitExceeded(reset_at=reset_at)
+
+    def update(self, response: Response) -> None:
+        """
+        Saves budget from the response rate limit headers.
+        """
+        try:
+            limit = int(response.headers[f"{self._headers_prefix}Limit"])
+            remaining = int(response.headers[f"{self._headers_prefix}Remaining"])
+            reset_at = int(response.headers[f"{self._headers_prefix}Reset"])
+        except (KeyError, ValueError):
+            return
+
+        try:
+            with self._redis.pipeline() as pipeline:
+                pipeline.hset(self.key, mapping=dict(limit=limit, remaining=remaining, reset_at=reset_at))
+                pipeline.expireat(self.key, reset_at)
+                pipeline.execute()
+        except RedisError as e:
+            log.error(f"[Rate limit] budget update skipped for {self.key}: {e}")
+
+        if response.status_code in (403, 429) and remaining == 0:
+            raise RateLimitExceeded(reset_at=reset_at)
+
+
+def get_budgets() -> List[RateLimitBudget]:
+    """
+    Returns current rate limit budgets of the all VCS accounts.
+    """
+    redis = get_redis_connection()
+    keys = [key.decode() for key in redis.scan_iter(f"{KEY_PREFIX}:*")]
+
+    with redis.pipeline() as pipeline:
+        for key in keys:
+            pipeline.hgetall(key)
+        values = pipeline.execute()
+
+    return [RateLimitBudget.from_redis(key, data) for key, data in zip(keys, values) if data]
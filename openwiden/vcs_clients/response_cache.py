@@ -0,0 +1,150 @@
+import hashlib
+import json
+import time
+from logging import getLogger
+from typing import Optional
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from requests import Response
+
+log = getLogger(__name__)
+
+KEY_PREFIX = "vcs_response_cache"
+
+# Caches the response and evicts least recently used ones in one step.
+# Sizes of the responses, that are already expired by TTL, are removed before the total size is counted.
+SET_SCRIPT = """
+local lru_key, sizes_key, key = KEYS[1], KEYS[2], KEYS[3]
+local data, size, ttl, now, max_size = ARGV[1], tonumber(ARGV[2]), ARGV[3], ARGV[4], tonumber(ARGV[5])
+
+redis.call("SET", key, data, "EX", ttl)
+redis.call("ZADD", lru_key, now, key)
+redis.call("HSET", sizes_key, key, size)
+redis.call("EXPIRE", lru_key, ttl)
+redis.call("EXPIRE", sizes_key, ttl)
+
+local total_size = 0
+local sizes = redis.call("HGETALL", sizes_key)
+
+for i = 1, #sizes, 2 do
+  if redis.call("EXISTS", sizes[i]) == 1 then
+    total_size = total_size + tonumber(sizes[i + 1])
+  else
+    redis.call("HDEL", sizes_key, sizes[i])
+    redis.call("ZREM", lru_key, sizes[i])
+  end
+end
+
+while total_size > max_size do
+  local oldest = redis.call("ZRANGE", lru_key, 0, 0)[1]
+
+  if not oldest then
+    break
+  end
+
+  total_size = total_size - tonumber(redis.call("HGET", sizes_key, oldest) or 0)
+  redis.call("DEL", oldest)
+  redis.call("ZREM", lru_key, oldest)
+  redis.call("HDEL", sizes_key, oldest)
+end
+"""
+
+
+class CachedResponse:
+    def __init__(self, body: str, etag: str = None, last_modified: str = None) -> None:
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedResponse":
+        return cls(
+            body=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    @classmethod
+    def loads(cls, data: bytes) -> "CachedResponse":
+        return cls(**json.loads(data))
+
+    def dumps(self) -> str:
+        return json.dumps(dict(body=self.body, etag=self.etag, last_modified=self.last_modified))
+
+    def get_conditional_headers(self) -> dict:
+        headers = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ResponseCache:
+    """
+    Redis backed cache of the VCS API responses for conditional requests.
+
+    Responses are cached per url and token scope with TTL.
+    Least recently used responses are evicted, when the scope total size exceeds the limit.
+    """
+
+    def __init__(self, *, scope: str) -> None:
+        self._scope_key = f"{KEY_PREFIX}:{scope}"
+        self._lru_key = f"{self._scope_key}:lru"
+        self._sizes_key = f"{self._scope_key}:sizes"
+        self._redis = get_redis_connection()
+        self._set_script = self._redis.register_script(SET_SCRIPT)
+
+    def _get_key(self, url: str) -> str:
+        return f"{self._scope_key}:{hashlib.sha1(url.encode()).hexdigest()}"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        key = self._get_key(url)
+
+        try:
+            data = self._redis.get(key)
+
+            # Response is expired by TTL
+            if data is None:
+                with self._redis.pipeline() as pipeline:
+                    pipeline.zrem(self._lru_key, key)
+                    pipeline.hdel(self._sizes_key, key)
+                    pipeline.execute()
+                return None
+
+            self._redis.zadd(self._lru_key, {key: time.time()})
+        except RedisError as e:
+            log.error(f"[Response cache] get skipped for {url}: {e}")
+            return None
+
+        return CachedResponse.loads(data)
+
+    def set(self, url: str, response: Response) -> None:
+        cached_response = CachedResponse.from_response(response)
+
+        # Nothing to validate the cached response with
+        if not cached_response.etag and not cached_response.last_modified:
+            return
+
+        data = cached_response.dumps()
+        size = len(data)
+
+        if size > settings.VCS_CLIENTS_RESPONSE_CACHE_MAX_SIZE:
+            return
+
+        ttl, max_size = settings.VCS_CLIENTS_RESPONSE_CACHE_TTL, settings.VCS_CLIENTS_RESPONSE_CACHE_MAX_SIZE
+
+        try:
+            self._set_script(
+                keys=[self._lru_key, self._sizes_key, self._get_key(url)],
+                args=[data, size, ttl, time.time(), max_size],
+            )
+        except RedisError as e:
+            log.error(f"[Response cache] set skipped for {url}: {e}")
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.utils.translation import gettext_lazy as _
 
 from openwiden.webhooks import models
 
@@ -8,6 +9,22 @@ class RepositoryWebhookAdmin(admin.ModelAdmin):
     pass
 
 
+@admin.register(models.WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "webhook", "vcs", "event", "received_at", "failed_at")
+    list_filter = ("vcs", "event")
+    actions = ("retry",)
+
+    def retry(self, request, queryset):
+        # Imported on call, services import cycle through the VCS clients is not resolved on admin autodiscover
+        from openwiden.webhooks import services
+
+        retried = services.retry_webhook_events(webhook_events=queryset)
+        self.message_user(request, _("{count} failed webhook events are queued to retry").format(count=retried))
+
+    retry.short_description = _("Retry selected failed webhook events")
+
+
 class RepositoryWebhookInline(admin.StackedInline):
     model = models.RepositoryWebhook
     extra = 0
@@ -1,5 +1,8 @@
 from enum import Enum
 
+# Advisory lock key of the webhook events partitions (the second key is a partition)
+WEBHOOK_EVENTS_LOCK_KEY = 4
+
 
 class IssueEventActions(str, Enum):
     OPENED = "opened"
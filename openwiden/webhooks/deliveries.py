@@ -0,0 +1,46 @@
+from logging import getLogger
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from . import stats
+
+log = getLogger(__name__)
+
+KEY_PREFIX = "webhook_delivery"
+
+
+def _get_key(vcs: str, delivery_id: str) -> str:
+    return f"{KEY_PREFIX}:{vcs}:{delivery_id}"
+
+
+def is_received(*, vcs: str, delivery_id: str) -> bool:
+    """
+    Marks delivery as received and returns True, if it's already marked within the dedup TTL.
+    Deliveries are not deduplicated, if Redis is not available.
+    """
+    try:
+        is_new = get_redis_connection().set(
+            _get_key(vcs, delivery_id), 1, ex=settings.WEBHOOKS_DELIVERY_DEDUP_TTL, nx=True
+        )
+    except RedisError as e:
+        log.error(f"[Webhook deliveries] dedup skipped for {delivery_id}: {e}")
+        return False
+
+    stats.increment("deliveries")
+
+    if not is_new:
+        stats.increment("duplicate_deliveries")
+
+    return not is_new
+
+
+def forget(*, vcs: str, delivery_id: str) -> None:
+    """
+    Unmarks delivery, so it could be processed on retry.
+    """
+    try:
+        get_redis_connection().delete(_get_key(vcs, delivery_id))
+    except RedisError as e:
+        log.error(f"[Webhook deliveries] forget failed for {delivery_id}: {e}")
@@ -0,0 +1,37 @@
+# Generated by Django 3.0.11 on 2026-10-18 20:14
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0008_auto_20200510_1304'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('partition', models.PositiveSmallIntegerField(verbose_name='partition')),
+                ('vcs', models.CharField(choices=[('github', 'GitHub'), ('gitlab', 'Gitlab')], max_length=50, verbose_name='version control service')),
+                ('event', models.CharField(max_length=50, verbose_name='event')),
+                ('payload', django.contrib.postgres.fields.jsonb.JSONField(verbose_name='payload')),
+                ('received_at', models.DateTimeField(auto_now_add=True, verbose_name='received at')),
+                ('failed_at', models.DateTimeField(blank=True, null=True, verbose_name='failed at')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='error')),
+                ('webhook', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='webhooks.RepositoryWebhook', verbose_name='webhook')),
+            ],
+            options={
+                'verbose_name': 'webhook event',
+                'verbose_name_plural': 'webhook events',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='webhookevent',
+            index=models.Index(condition=models.Q(failed_at=None), fields=['partition', 'id'], name='pending_webhook_event_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.0.11 on 2026-10-18 20:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('webhooks', '0009_webhookevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookevent',
+            name='coalesce_key',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='coalesce key'),
+        ),
+        migrations.AddIndex(
+            model_name='webhookevent',
+            index=models.Index(condition=models.Q(('coalesce_key__isnull', False), ('failed_at', None)), fields=['webhook', 'coalesce_key', 'id'], name='coalesce_webhook_event_idx'),
+        ),
+    ]
@@ -1,6 +1,9 @@
+from django.contrib.postgres.fields import JSONField
 from django.db import models
+from django.db.models import Q
 from model_utils.models import UUIDModel
 from django.utils.translation import gettext_lazy as _
+from openwiden import enums
 from openwiden.repositories import models as repo_models
 
 
@@ -25,3 +28,40 @@ class RepositoryWebhook(UUIDModel):
 
     def __str__(self):
         return _("repository webhook for {repo}").format(repo=self.repository.name)
+
+
+class WebhookEvent(models.Model):
+    """
+    Received webhook event waiting to be processed by the task queue.
+
+    Events are processed in order of receiving by partitions of webhooks (repositories),
+    processed events are deleted, while failed are kept with the error.
+    """
+
+    webhook = models.ForeignKey(RepositoryWebhook, models.CASCADE, related_name="events", verbose_name=_("webhook"))
+    partition = models.PositiveSmallIntegerField(_("partition"))
+
+    vcs = models.CharField(_("version control service"), max_length=50, choices=enums.VersionControlService.choices)
+    event = models.CharField(_("event"), max_length=50)
+    payload = JSONField(_("payload"))
+    # Events of the same repository or issue, that could be collapsed into the latest one
+    coalesce_key = models.CharField(_("coalesce key"), max_length=100, blank=True, null=True)
+
+    received_at = models.DateTimeField(_("received at"), auto_now_add=True)
+    failed_at = models.DateTimeField(_("failed at"), blank=True, null=True)
+    error = models.TextField(_("error"), blank=True, null=True)
+
+    class Meta:
+        verbose_name = _("webhook event")
+        verbose_name_plural = _("webhook events")
+        indexes = (
+            models.Index(fields=("partition", "id"), name="pending_webhook_event_idx", condition=Q(failed_at=None)),
+            models.Index(
+                fields=("webhook", "coalesce_key", "id"),
+                name="coalesce_webhook_event_idx",
+                condition=Q(failed_at=None, coalesce_key__isnull=False),
+            ),
+        )
+
+    def __str__(self):
+        return _("{event} event #{id}").format(event=self.event, id=self.id)
@@ -0,0 +1,56 @@
+from logging import getLogger
+from typing import Optional, Callable
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+log = getLogger(__name__)
+
+KEY_PREFIX = "webhook_secret"
+# Cached value of the unknown webhook id
+MISSING = ""
+
+
+def _get_key(webhook_id: str) -> str:
+    return f"{KEY_PREFIX}:{webhook_id}"
+
+
+def get_secret(webhook_id: str, *, load: Callable[[str], Optional[str]]) -> Optional[str]:
+    """
+    Read-through cache of the webhook secrets.
+
+    Secret is loaded from the database on a cache miss and cached with TTL,
+    unknown webhook ids are cached as missing with the shorter TTL.
+    Database is used directly, if Redis is not available.
+    """
+    key = _get_key(webhook_id)
+    redis = get_redis_connection()
+
+    try:
+        cached = redis.get(key)
+    except RedisError as e:
+        log.error(f"[Webhook secrets cache] get skipped for {webhook_id}: {e}")
+        return load(webhook_id)
+
+    if cached is not None:
+        return cached.decode() or None
+
+    secret = load(webhook_id)
+
+    try:
+        if secret is None:
+            redis.set(key, MISSING, ex=settings.WEBHOOKS_SECRET_CACHE_MISSING_TTL)
+        else:
+            redis.set(key, secret, ex=settings.WEBHOOKS_SECRET_CACHE_TTL)
+    except RedisError as e:
+        log.error(f"[Webhook secrets cache] set skipped for {webhook_id}: {e}")
+
+    return secret
+
+
+def invalidate_secret(webhook_id: str) -> None:
+    try:
+        get_redis_connection().delete(_get_key(webhook_id))
+    except RedisError as e:
+        log.error(f"[Webhook secrets cache] invalidation failed for {webhook_id}: {e}")
@@ -1,7 +1,20 @@
+from typing import Optional
+
 from django.db.models import QuerySet
 
-from . import models
+from . import models, secrets_cache
 
 
 def get_webhooks() -> "QuerySet[models.RepositoryWebhook]":
     return models.RepositoryWebhook.objects.all()
+
+
+def _get_webhook_secret(webhook_id: str) -> Optional[str]:
+    return get_webhooks().filter(id=webhook_id).values_list("secret", flat=True).first()
+
+
+def get_webhook_secret(*, id: str) -> Optional[str]:
+    """
+    Returns webhook secret from the cache or None, if webhook does not exist.
+    """
+    return secrets_cache.get_secret(str(id), load=_get_webhook_secret)
@@ -1,23 +1,39 @@
-from uuid import uuid4
+from datetime import timedelta
+from logging import getLogger
+from typing import Optional, Tuple
+from uuid import UUID, uuid4
 
+from django.conf import settings
 from django.contrib.sites.models import Site
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.dispatch import Signal
 from django.urls import reverse
 from django.utils import timezone
+from django_q.models import Schedule
+from django_q.tasks import async_task, schedule
+from github_webhooks.views import GitHubWebhookView as BaseGitHubWebhookView
+from gitlab_webhooks.views import WebhookView as BaseGitlabWebhookView
 
 from openwiden.enums import VersionControlService
-from openwiden.webhooks import models, exceptions
+from openwiden.webhooks import models, exceptions, secrets_cache, constants, stats
 from openwiden.repositories import models as repo_models
 from openwiden.users import models as users_models
 from openwiden import vcs_clients
 
+log = getLogger(__name__)
+
 
 def _create_repository_webhook(*, repository: repo_models.Repository) -> models.RepositoryWebhook:
     if models.RepositoryWebhook.objects.filter(repository=repository).exists():
         raise exceptions.RepositoryWebhookAlreadyExists()
 
-    return models.RepositoryWebhook.objects.create(
+    webhook = models.RepositoryWebhook.objects.create(
         repository=repository, secret=uuid4().hex, is_active=False, issue_events_enabled=True,
     )
+    secrets_cache.invalidate_secret(str(webhook.id))
+
+    return webhook
 
 
 def _create_github_repository_webhook(
@@ -71,6 +87,12 @@ def _create_gitlab_repository_webhook(
     return webhook
 
 
+def _delete_repository_webhook(*, webhook: models.RepositoryWebhook) -> None:
+    webhook_id = str(webhook.id)
+    webhook.delete()
+    secrets_cache.invalidate_secret(webhook_id)
+
+
 def _delete_github_repository_webhook(
     *, repository: repo_models.Repository, vcs_account: users_models.VCSAccount,
 ) -> None:
@@ -78,7 +100,7 @@ def _delete_github_repository_webhook(
     github_client.delete_webhook(
         repository_id=repository.remote_id, webhook_id=repository.webhook.remote_id,
     )
-    repository.webhook.delete()
+    _delete_repository_webhook(webhook=repository.webhook)
 
 
 def _delete_gitlab_repository_webhook(
@@ -88,7 +110,7 @@ def _delete_gitlab_repository_webhook(
     gitlab_client.delete_repository_webhook(
         repository_id=repository.remote_id, webhook_id=repository.webhook.remote_id,
     )
-    repository.webhook.delete()
+    _delete_repository_webhook(webhook=repository.webhook)
 
 
 def create_repository_webhook(
@@ -118,3 +140,223 @@ def delete_repository_webhook(*, repository: repo_models.Repository, vcs_account
             )
         else:
             raise ValueError(f"{vcs_account.vcs} is not supported")
+
+
+def get_webhook_event_partition(*, webhook_id: str) -> int:
+    return UUID(str(webhook_id)).int % settings.WEBHOOKS_ASYNC_PARTITIONS
+
+
+def get_webhook_event_coalesce_key(*, vcs: str, event: str, payload: dict) -> Optional[str]:
+    """
+    Returns key of the repository or issue for events, that are applied by the full state sync,
+    so only the latest of them with the same key is enough to apply.
+    """
+    if vcs == VersionControlService.GITHUB:
+        repository_actions = (constants.GithubRepositoryAction.EDITED, constants.GithubRepositoryAction.RENAMED)
+
+        if event == "star" or (event == "repository" and payload["action"] in repository_actions):
+            return f"repository:{payload['repository']['id']}"
+        elif event == "issues" and payload["action"] in (
+            constants.IssueEventActions.OPENED,
+            constants.IssueEventActions.CLOSED,
+            constants.IssueEventActions.EDITED,
+            constants.IssueEventActions.LABELED,
+            constants.IssueEventActions.UNLABELED,
+        ):
+            return f"issue:{payload['issue']['id']}"
+    elif vcs == VersionControlService.GITLAB:
+        if event == "Issue Hook" and payload["object_attributes"].get("action") in (
+            constants.GitlabIssueAction.OPEN,
+            constants.GitlabIssueAction.CLOSE,
+            constants.GitlabIssueAction.REOPEN,
+            constants.GitlabIssueAction.UPDATE,
+        ):
+            return f"issue:{payload['object_attributes']['id']}"
+
+    return None
+
+
+def enqueue_webhook_event(*, webhook_id: str, vcs: str, event: str, payload: dict) -> models.WebhookEvent:
+    """
+    Saves received webhook event and queues processing of its partition, when the request transaction is committed.
+    """
+    partition = get_webhook_event_partition(webhook_id=webhook_id)
+    webhook_event = models.WebhookEvent.objects.create(
+        webhook_id=webhook_id,
+        partition=partition,
+        vcs=vcs,
+        event=event,
+        payload=payload,
+        coalesce_key=get_webhook_event_coalesce_key(vcs=vcs, event=event, payload=payload),
+    )
+
+    transaction.on_commit(lambda: async_task("openwiden.webhooks.tasks.process_webhook_events", partition=partition))
+
+    return webhook_event
+
+
+def retry_webhook_events(*, webhook_events) -> int:
+    """
+    Clears failure of the webhook events and queues processing of their partitions, when the transaction is committed,
+    so the failed events and the later events of their webhooks, that are waiting for them, are applied again.
+    Returns retried events count.
+    """
+    failed_events = webhook_events.filter(failed_at__isnull=False)
+    partitions = set(failed_events.values_list("partition", flat=True))
+    retried = failed_events.update(failed_at=None, error=None)
+
+    for partition in partitions:
+        transaction.on_commit(
+            lambda partition=partition: async_task(
+                "openwiden.webhooks.tasks.process_webhook_events", partition=partition,
+            )
+        )
+
+    return retried
+
+
+def _get_webhook_event_signal(*, vcs: str, event: str) -> Signal:
+    if vcs == VersionControlService.GITHUB:
+        return BaseGitHubWebhookView.get_signal(event)
+    elif vcs == VersionControlService.GITLAB:
+        return BaseGitlabWebhookView.get_signal(event)
+    else:
+        raise ValueError(f"{vcs} is not supported")
+
+
+def _apply_webhook_event(*, webhook_event: models.WebhookEvent) -> None:
+    """
+    Sends webhook event signal as the webhook view does, so it's handled by the same receivers.
+    """
+    signal = _get_webhook_event_signal(vcs=webhook_event.vcs, event=webhook_event.event)
+    signal.send(sender=models.WebhookEvent, payload=webhook_event.payload)
+
+
+def _try_lock_webhook_events_partition(*, partition: int) -> bool:
+    # Session lock is held across the transactions of the events and released on the disconnect as well
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", [constants.WEBHOOK_EVENTS_LOCK_KEY, partition])
+        return cursor.fetchone()[0]
+
+
+def _unlock_webhook_events_partition(*, partition: int) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_unlock(%s, %s)", [constants.WEBHOOK_EVENTS_LOCK_KEY, partition])
+
+
+def _schedule_webhook_events_processing(*, partition: int, next_run) -> None:
+    name = f"process_webhook_events_{partition}"
+
+    if not Schedule.objects.filter(name=name).exists():
+        schedule(
+            "openwiden.webhooks.tasks.process_webhook_events",
+            partition=partition,
+            name=name,
+            schedule_type=Schedule.ONCE,
+            next_run=next_run,
+        )
+
+
+def process_webhook_events(*, partition: int) -> int:
+    """
+    Applies pending events of the partition in order of receiving and returns processed events count.
+
+    Partition is processed by one worker at a time, the others return immediately.
+    Events queued after the last batch is fetched are checked again after the lock is released,
+    so they are not left behind.
+    """
+    processed = coalesced = last_id = 0
+    pending_events = models.WebhookEvent.objects.filter(partition=partition, failed_at=None)
+
+    while pending_events.filter(id__gt=last_id).exists():
+        if not _try_lock_webhook_events_partition(partition=partition):
+            break
+
+        try:
+            batch_processed, batch_coalesced, last_id = _process_webhook_events_after(
+                partition=partition, after_id=last_id,
+            )
+        finally:
+            _unlock_webhook_events_partition(partition=partition)
+
+        processed += batch_processed
+        coalesced += batch_coalesced
+
+    stats.increment("coalesced_events", coalesced)
+
+    return processed
+
+
+def _process_webhook_events_after(*, partition: int, after_id: int) -> Tuple[int, int, int]:
+    """
+    Applies pending events of the locked partition with id greater than specified in batches,
+    every event is applied and deleted in its own transaction.
+    Returns processed and coalesced events count and id of the last seen event.
+
+    Events superseded by the later event with the same coalesce key are skipped.
+    Events received within the coalesce window are deferred until the window is passed,
+    so the later events of the same object are collapsed as well.
+    The later events of the same webhook wait for the deferred event, the other webhooks events are processed.
+    Events of the webhook received after its failed event are kept pending,
+    until the failed event is retried, so the events of the repository are not applied out of order.
+    """
+    processed = coalesced = 0
+    last_id = after_id
+    coalesce_window = timedelta(seconds=settings.WEBHOOKS_ASYNC_COALESCE_WINDOW)
+    coalesce_until = timezone.now() - coalesce_window
+    next_run = None
+    # Webhooks with the failed or deferred event, their later events wait, so they are not applied out of order
+    waiting_webhooks = set()
+    superseding_events = models.WebhookEvent.objects.filter(
+        webhook_id=OuterRef("webhook_id"), coalesce_key=OuterRef("coalesce_key"), id__gt=OuterRef("id"), failed_at=None,
+    )
+    previous_failed_events = models.WebhookEvent.objects.filter(
+        webhook_id=OuterRef("webhook_id"), id__lt=OuterRef("id"), failed_at__isnull=False,
+    )
+    events = (
+        models.WebhookEvent.objects.filter(partition=partition, failed_at=None)
+        .annotate(is_superseded=Exists(superseding_events), is_blocked=Exists(previous_failed_events))
+        .order_by("id")
+    )
+
+    while True:
+        batch = list(events.filter(id__gt=last_id)[: settings.WEBHOOKS_ASYNC_BATCH_SIZE])
+
+        if not batch:
+            break
+
+        for webhook_event in batch:
+            last_id = webhook_event.id
+
+            if webhook_event.is_blocked or webhook_event.webhook_id in waiting_webhooks:
+                continue
+
+            if webhook_event.is_superseded:
+                webhook_event.delete()
+                coalesced += 1
+                processed += 1
+                continue
+
+            if webhook_event.coalesce_key is not None and webhook_event.received_at > coalesce_until:
+                event_next_run = webhook_event.received_at + coalesce_window
+                next_run = event_next_run if next_run is None else min(next_run, event_next_run)
+                waiting_webhooks.add(webhook_event.webhook_id)
+                continue
+
+            try:
+                with transaction.atomic():
+                    _apply_webhook_event(webhook_event=webhook_event)
+                    webhook_event.delete()
+            except Exception as e:
+                log.exception(f"[Service] webhook event {webhook_event.id} processing failed")
+                webhook_event.failed_at = timezone.now()
+                webhook_event.error = str(e)
+                webhook_event.save(update_fields=("failed_at", "error"))
+                waiting_webhooks.add(webhook_event.webhook_id)
+
+            processed += 1
+
+    if next_run is not None:
+        _schedule_webhook_events_processing(partition=partition, next_run=next_run)
+
+    return processed, coalesced, last_id
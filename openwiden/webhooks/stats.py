@@ -0,0 +1,31 @@
+from logging import getLogger
+from typing import Dict, Union
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+log = getLogger(__name__)
+
+KEY = "webhook_stats"
+
+
+def increment(name: str, amount: int = 1) -> None:
+    """
+    Increments webhooks processing counter, such as coalesced events count.
+    """
+    if not amount:
+        return
+
+    try:
+        get_redis_connection().hincrby(KEY, name, amount)
+    except RedisError as e:
+        log.error(f"[Webhook stats] {name} increment skipped: {e}")
+
+
+def get_stats() -> Dict[str, Union[int, float]]:
+    data = {name.decode(): int(value) for name, value in get_redis_connection().hgetall(KEY).items()}
+
+    if data.get("deliveries"):
+        data["duplicate_deliveries_rate"] = data.get("duplicate_deliveries", 0) / data["deliveries"]
+
+    return data
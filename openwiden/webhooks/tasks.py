@@ -0,0 +1,10 @@
+from logging import getLogger
+
+from . import services
+
+log = getLogger(__name__)
+
+
+def process_webhook_events(partition: int) -> None:
+    processed = services.process_webhook_events(partition=partition)
+    log.info(f"[Task] {processed} webhook events of the partition {partition} are processed")
@@ -0,0 +1,30 @@
+from uuid import uuid4
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from openwiden.webhooks import selectors, secrets_cache
+
+pytestmark = pytest.mark.django_db
+
+
+def test_get_webhook_secret(repo_webhook):
+    secrets_cache.invalidate_secret(str(repo_webhook.id))
+
+    with CaptureQueriesContext(connection) as queries:
+        assert selectors.get_webhook_secret(id=repo_webhook.id) == repo_webhook.secret
+        assert selectors.get_webhook_secret(id=repo_webhook.id) == repo_webhook.secret
+
+    assert len(queries) == 1
+
+
+def test_get_webhook_secret_unknown_id():
+    webhook_id = uuid4()
+
+    with CaptureQueriesContext(connection) as queries:
+        assert selectors.get_webhook_secret(id=webhook_id) is None
+        assert selectors.get_webhook_secret(id=webhook_id) is None
+
+    assert len(queries) == 1
+    secrets_cache.invalidate_secret(str(webhook_id))
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from openwiden.enums import VersionControlService
+from openwiden.webhooks import models, services, stats
+from .test_star_event import STAR
+
+
+@pytest.mark.functional
+@pytest.mark.django_db
+@mock.patch("github_webhooks.utils.compare_signatures")
+def test_run(mock_compare_signatures, create_repository, create_repo_webhook, create_api_client, settings):
+    settings.WEBHOOKS_ASYNC_ENABLED = True
+    settings.WEBHOOKS_ASYNC_COALESCE_WINDOW = 0
+    mock_compare_signatures.return_value = True
+    api_client = create_api_client()
+    repository = create_repository(
+        vcs=VersionControlService.GITHUB, remote_id=STAR["repository"]["id"], stars_count=0
+    )
+    repository_webhook = create_repo_webhook(repository=repository, secret=12345)
+    url = reverse("v1:webhooks:github", kwargs={"id": str(repository_webhook.id)})
+
+    for stars_count in (1, 2):
+        response = api_client.post(
+            url,
+            data=dict(STAR, repository=dict(STAR["repository"], stargazers_count=stars_count)),
+            format="json",
+            **{"HTTP_X_GITHUB_EVENT": "star", "HTTP_X_HUB_SIGNATURE": "sha1=12345"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    # Events are saved without processing
+    repository.refresh_from_db()
+    assert repository.stars_count == 0
+    webhook_events = models.WebhookEvent.objects.filter(webhook=repository_webhook)
+    assert webhook_events.count() == 2
+
+    # Star events are coalesced, so only the latest is applied
+    partition = services.get_webhook_event_partition(webhook_id=repository_webhook.id)
+    coalesced_events = stats.get_stats().get("coalesced_events", 0)
+    with mock.patch.object(services, "_apply_webhook_event", wraps=services._apply_webhook_event) as apply_event:
+        assert services.process_webhook_events(partition=partition) == 2
+
+    assert apply_event.call_count == 1
+    assert stats.get_stats()["coalesced_events"] == coalesced_events + 1
+    repository.refresh_from_db()
+    assert repository.stars_count == 2
+    assert not webhook_events.exists()
+
+
+@pytest.mark.django_db
+@mock.patch.object(services, "schedule")
+def test_processing_is_deferred_within_coalesce_window(patched_schedule, create_repo_webhook, settings):
+    settings.WEBHOOKS_ASYNC_COALESCE_WINDOW = 60
+    repository_webhook = create_repo_webhook()
+    webhook_event = services.enqueue_webhook_event(
+        webhook_id=repository_webhook.id, vcs=VersionControlService.GITHUB, event="star", payload=STAR,
+    )
+
+    assert services.process_webhook_events(partition=webhook_event.partition) == 0
+    assert models.WebhookEvent.objects.filter(id=webhook_event.id).exists()
+    assert patched_schedule.call_args[1]["next_run"] > webhook_event.received_at
+
+
+@pytest.mark.django_db
+def test_failed_event_is_kept(create_repo_webhook):
+    repository_webhook = create_repo_webhook()
+    webhook_event = services.enqueue_webhook_event(
+        webhook_id=repository_webhook.id, vcs=VersionControlService.GITHUB, event="ping", payload={},
+    )
+
+    with mock.patch("github_webhooks.signals.ping.send", side_effect=KeyError("repository")):
+        assert services.process_webhook_events(partition=webhook_event.partition) == 1
+
+    webhook_event.refresh_from_db()
+    assert webhook_event.failed_at is not None
+    assert webhook_event.error == "'repository'"
+    # Failed events are not processed again
+    assert services.process_webhook_events(partition=webhook_event.partition) == 0
+
+
+@pytest.mark.django_db
+def test_later_events_of_failed_webhook_are_kept_pending(create_repo_webhook, settings):
+    settings.WEBHOOKS_ASYNC_PARTITIONS = 1
+    failed_webhook, other_webhook = create_repo_webhook(), create_repo_webhook()
+    failed_event, later_event, other_event = [
+        services.enqueue_webhook_event(
+            webhook_id=webhook.id, vcs=VersionControlService.GITHUB, event="ping", payload={},
+        )
+        for webhook in (failed_webhook, failed_webhook, other_webhook)
+    ]
+
+    with mock.patch("github_webhooks.signals.ping.send", side_effect=[KeyError("repository"), None]) as send:
+        assert services.process_webhook_events(partition=0) == 2
+
+    # Event of the other webhook is applied, the later event of the failed webhook waits
+    assert send.call_count == 2
+    assert list(models.WebhookEvent.objects.values_list("id", flat=True).order_by("id")) == [
+        failed_event.id,
+        later_event.id,
+    ]
+    assert services.process_webhook_events(partition=0) == 0
+
+
+@pytest.mark.django_db
+@mock.patch.object(services, "async_task")
+def test_blocked_events_are_resumed_after_retry(patched_async_task, create_repo_webhook, settings):
+    settings.WEBHOOKS_ASYNC_PARTITIONS = 1
+    repository_webhook = create_repo_webhook()
+    for _ in range(2):
+        services.enqueue_webhook_event(
+            webhook_id=repository_webhook.id, vcs=VersionControlService.GITHUB, event="ping", payload={},
+        )
+
+    with mock.patch("github_webhooks.signals.ping.send", side_effect=KeyError("repository")):
+        assert services.process_webhook_events(partition=0) == 1
+
+    patched_async_task.reset_mock()
+    with mock.patch("django.db.transaction.on_commit", side_effect=lambda func: func()):
+        assert services.retry_webhook_events(webhook_events=models.WebhookEvent.objects.all()) == 1
+
+    patched_async_task.assert_called_once_with("openwiden.webhooks.tasks.process_webhook_events", partition=0)
+
+    # Failed event and the later event waiting for it are applied in order
+    with mock.patch("github_webhooks.signals.ping.send") as send:
+        assert services.process_webhook_events(partition=0) == 2
+
+    assert send.call_count == 2
+    assert not models.WebhookEvent.objects.exists()
+
+@pytest.mark.django_db
+@mock.patch.object(services, "schedule")
+def test_only_events_within_coalesce_window_are_deferred(patched_schedule, create_repo_webhook, settings):
+    settings.WEBHOOKS_ASYNC_COALESCE_WINDOW = 60
+    settings.WEBHOOKS_ASYNC_PARTITIONS = 1
+    starred_webhook, other_webhook = create_repo_webhook(), create_repo_webhook()
+    star_event = services.enqueue_webhook_event(
+        webhook_id=starred_webhook.id, vcs=VersionControlService.GITHUB, event="star", payload=STAR,
+    )
+    starred_ping_event, other_ping_event = [
+        services.enqueue_webhook_event(
+            webhook_id=webhook.id, vcs=VersionControlService.GITHUB, event="ping", payload={},
+        )
+        for webhook in (starred_webhook, other_webhook)
+    ]
+
+    with mock.patch("github_webhooks.signals.ping.send") as send:
+        assert services.process_webhook_events(partition=0) == 1
+
+    # Event of the other webhook is not waiting for the window,
+    # the later event of the starred webhook waits for the deferred event, so they are applied in order
+    assert send.call_count == 1
+    assert list(models.WebhookEvent.objects.values_list("id", flat=True).order_by("id")) == [
+        star_event.id,
+        starred_ping_event.id,
+    ]
+    assert patched_schedule.call_args[1]["next_run"] == star_event.received_at + timedelta(seconds=60)
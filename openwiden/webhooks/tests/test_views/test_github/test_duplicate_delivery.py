@@ -0,0 +1,41 @@
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from openwiden.enums import VersionControlService
+from openwiden.webhooks import stats
+from .test_star_event import STAR
+
+
+@pytest.mark.functional
+@pytest.mark.django_db
+@mock.patch("github_webhooks.utils.compare_signatures")
+def test_run(mock_compare_signatures, create_repository, create_repo_webhook, create_api_client):
+    mock_compare_signatures.return_value = True
+    api_client = create_api_client()
+    repository = create_repository(vcs=VersionControlService.GITHUB, remote_id=STAR["repository"]["id"])
+    repository_webhook = create_repo_webhook(repository=repository, secret=12345)
+    url = reverse("v1:webhooks:github", kwargs={"id": str(repository_webhook.id)})
+    headers = {
+        "HTTP_X_GITHUB_EVENT": "star",
+        "HTTP_X_HUB_SIGNATURE": "sha1=12345",
+        "HTTP_X_GITHUB_DELIVERY": str(uuid4()),
+    }
+    duplicate_deliveries = stats.get_stats().get("duplicate_deliveries", 0)
+
+    for stars_count in (1, 2):
+        response = api_client.post(
+            url,
+            data=dict(STAR, repository=dict(STAR["repository"], stargazers_count=stars_count)),
+            format="json",
+            **headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    # Redelivery is not processed
+    repository.refresh_from_db()
+    assert repository.stars_count == 1
+    assert stats.get_stats()["duplicate_deliveries"] == duplicate_deliveries + 1
@@ -7,4 +7,5 @@ app_name = "openwiden.webhooks"
 urlpatterns = [
     path("github/<uuid:id>/receive/", views.GithubWebhookView.as_view(), name="github"),
     path("gitlab/<uuid:id>/receive/", views.GitlabWebhookView.as_view(), name="gitlab"),
+    path("stats/", views.webhook_stats_view, name="stats"),
 ]
@@ -1,16 +1,110 @@
-from rest_framework.generics import get_object_or_404
+from typing import Union, Optional, Tuple
 
-from . import selectors
+from django.conf import settings
+from django.dispatch import Signal
+from django.http import Http404
+from rest_framework import views, permissions
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from openwiden.enums import VersionControlService
+from . import selectors, services, stats, deliveries
 
 from github_webhooks.views import GitHubWebhookView as BaseGitHubWebhookView
 from gitlab_webhooks.views import WebhookView as BaseGitlabWebhookView
 
 
-class GithubWebhookView(BaseGitHubWebhookView):
-    def get_secret(self) -> str:
-        return get_object_or_404(selectors.get_webhooks(), id=self.kwargs["id"]).secret
+def get_webhook_secret(webhook_id: str) -> str:
+    secret = selectors.get_webhook_secret(id=webhook_id)
+
+    if secret is None:
+        raise Http404
+
+    return secret
+
+
+class EnqueueWebhookEvent:
+    """
+    Signal replacement, that saves the verified event to be processed by the task queue.
+    """
+
+    def __init__(self, *, webhook_id: str, vcs: str, event: str) -> None:
+        self.webhook_id = webhook_id
+        self.vcs = vcs
+        self.event = event
+
+    def send(self, sender, payload: dict) -> None:
+        services.enqueue_webhook_event(webhook_id=self.webhook_id, vcs=self.vcs, event=self.event, payload=payload)
+
+
+class DeduplicatedWebhookEvent:
+    """
+    Signal wrapper, that skips deliveries received before.
+    """
+
+    def __init__(self, signal: Union[Signal, EnqueueWebhookEvent], *, vcs: str, delivery_id: str) -> None:
+        self.signal = signal
+        self.vcs = vcs
+        self.delivery_id = delivery_id
+
+    def send(self, sender, payload: dict) -> None:
+        if deliveries.is_received(vcs=self.vcs, delivery_id=self.delivery_id):
+            return
+
+        try:
+            self.signal.send(sender, payload=payload)
+        except Exception:
+            # Failed delivery should be processed on retry
+            deliveries.forget(vcs=self.vcs, delivery_id=self.delivery_id)
+            raise
+
 
+class WebhookViewMixin:
+    vcs: str
+    # Request META keys of the unique delivery id, the first present is used
+    delivery_id_headers: Tuple[str, ...] = ()
 
-class GitlabWebhookView(BaseGitlabWebhookView):
     def get_secret(self) -> str:
-        return get_object_or_404(selectors.get_webhooks(), id=self.kwargs["id"]).secret
+        return get_webhook_secret(self.kwargs["id"])
+
+    def get_delivery_id(self) -> Optional[str]:
+        for header in self.delivery_id_headers:
+            if self.request.META.get(header):
+                return self.request.META[header]
+        return None
+
+    def get_signal(self, event: str) -> Union[Signal, EnqueueWebhookEvent, DeduplicatedWebhookEvent]:
+        if settings.WEBHOOKS_ASYNC_ENABLED:
+            signal = EnqueueWebhookEvent(webhook_id=self.kwargs["id"], vcs=self.vcs, event=event)
+        else:
+            signal = super().get_signal(event)
+
+        delivery_id = self.get_delivery_id()
+
+        if delivery_id is None:
+            return signal
+
+        return DeduplicatedWebhookEvent(signal, vcs=self.vcs, delivery_id=delivery_id)
+
+
+class GithubWebhookView(WebhookViewMixin, BaseGitHubWebhookView):
+    vcs = VersionControlService.GITHUB
+    delivery_id_headers = ("HTTP_X_GITHUB_DELIVERY",)
+
+
+class GitlabWebhookView(WebhookViewMixin, BaseGitlabWebhookView):
+    vcs = VersionControlService.GITLAB
+    delivery_id_headers = ("HTTP_X_GITLAB_EVENT_UUID", "HTTP_IDEMPOTENCY_KEY")
+
+
+class WebhookStatsView(views.APIView):
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request: Request) -> Response:
+        """
+        Returns webhook events processing counters.
+        """
+        return Response(stats.get_stats())
+
+
+webhook_stats_view = WebhookStatsView.as_view()